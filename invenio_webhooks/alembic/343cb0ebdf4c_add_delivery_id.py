@@ -0,0 +1,34 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Add delivery identifier of events."""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "343cb0ebdf4c"
+down_revision = "6fb8c6f0ad1d"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.add_column(
+        "webhooks_events",
+        sa.Column("delivery_id", sa.String(length=255), nullable=True),
+    )
+    op.create_unique_constraint(
+        op.f("uq_webhooks_events_receiver_id"),
+        "webhooks_events",
+        ["receiver_id", "delivery_id"],
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_constraint(
+        op.f("uq_webhooks_events_receiver_id"), "webhooks_events", type_="unique"
+    )
+    op.drop_column("webhooks_events", "delivery_id")
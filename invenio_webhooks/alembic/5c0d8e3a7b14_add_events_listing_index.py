@@ -0,0 +1,27 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Add index for listing events."""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5c0d8e3a7b14"
+down_revision = "343cb0ebdf4c"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_index(
+        "ix_webhooks_events_listing",
+        "webhooks_events",
+        ["receiver_id", "user_id", "created", "id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index("ix_webhooks_events_listing", table_name="webhooks_events")
@@ -0,0 +1,37 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Add task state tracking columns."""
+
+import sqlalchemy as sa
+from alembic import op
+from invenio_db import db
+
+# revision identifiers, used by Alembic.
+revision = "6fb8c6f0ad1d"
+down_revision = "857d7bc9f20e"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.add_column(
+        "webhooks_events",
+        sa.Column("task_state", sa.String(length=16), nullable=True),
+    )
+    op.add_column(
+        "webhooks_events",
+        sa.Column("task_started", db.UTCDateTime(), nullable=True),
+    )
+    op.add_column(
+        "webhooks_events",
+        sa.Column("task_finished", db.UTCDateTime(), nullable=True),
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_column("webhooks_events", "task_finished")
+    op.drop_column("webhooks_events", "task_started")
+    op.drop_column("webhooks_events", "task_state")
@@ -0,0 +1,65 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Store payloads as bytes to allow their compression."""
+
+import zlib
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = "857d7bc9f20e"
+down_revision = "201faeb649c7"
+branch_labels = ()
+depends_on = None
+
+
+def _binary_type():
+    """Return the binary type of the payload column."""
+    return sa.LargeBinary().with_variant(mysql.LONGBLOB(), "mysql")
+
+
+def upgrade():
+    """Upgrade database.
+
+    Existing payloads are stored as their UTF-8 encoded JSON document.
+    """
+    op.alter_column(
+        "webhooks_events",
+        "payload",
+        type_=_binary_type(),
+        existing_type=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using="convert_to(payload::text, 'UTF8')",
+    )
+
+
+def downgrade():
+    """Downgrade database.
+
+    Compressed payloads are decompressed before converting them to JSON.
+    """
+    bind = op.get_bind()
+    table = sa.table(
+        "webhooks_events",
+        sa.column("id", sa.String),
+        sa.column("payload", sa.LargeBinary),
+    )
+    rows = bind.execute(sa.select(table.c.id, table.c.payload)).all()
+    for row in rows:
+        if row.payload is not None and bytes(row.payload[:1]) == b"x":
+            bind.execute(
+                table.update()
+                .where(table.c.id == row.id)
+                .values(payload=zlib.decompress(row.payload))
+            )
+    op.alter_column(
+        "webhooks_events",
+        "payload",
+        type_=sa.JSON(),
+        existing_type=_binary_type(),
+        existing_nullable=True,
+        postgresql_using="convert_from(payload, 'UTF8')::json",
+    )
@@ -0,0 +1,59 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Move unique delivery identifiers to their own table."""
+
+import sqlalchemy as sa
+from alembic import op
+from invenio_db import db
+from sqlalchemy_utils import UUIDType
+
+# revision identifiers, used by Alembic.
+revision = "9a41c6e2d7f3"
+down_revision = "5c0d8e3a7b14"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_table(
+        "webhooks_event_deliveries",
+        sa.Column("receiver_id", sa.String(length=255), nullable=False),
+        sa.Column("delivery_id", sa.String(length=255), nullable=False),
+        sa.Column("event_id", UUIDType(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("created", db.UTCDateTime(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "receiver_id", "delivery_id", name=op.f("pk_webhooks_event_deliveries")
+        ),
+    )
+    op.create_index(
+        op.f("ix_webhooks_event_deliveries_created"),
+        "webhooks_event_deliveries",
+        ["created"],
+        unique=False,
+    )
+    op.execute(
+        "INSERT INTO webhooks_event_deliveries "
+        "(receiver_id, delivery_id, event_id, user_id, created) "
+        "SELECT receiver_id, delivery_id, id, user_id, created "
+        "FROM webhooks_events WHERE delivery_id IS NOT NULL"
+    )
+    op.drop_constraint(
+        op.f("uq_webhooks_events_receiver_id"), "webhooks_events", type_="unique"
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.create_unique_constraint(
+        op.f("uq_webhooks_events_receiver_id"),
+        "webhooks_events",
+        ["receiver_id", "delivery_id"],
+    )
+    op.drop_index(
+        op.f("ix_webhooks_event_deliveries_created"),
+        table_name="webhooks_event_deliveries",
+    )
+    op.drop_table("webhooks_event_deliveries")
@@ -0,0 +1,345 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Maintenance API for stored webhook events."""
+
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+
+from flask import current_app
+from invenio_db import db
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import load_only
+
+from .models import CeleryReceiver, Event, EventDelivery, process_event, process_events
+from .proxies import current_webhooks
+
+
+def get_retention_cutoffs(now=None):
+    """Return the creation date before which events expire, per receiver.
+
+    Retention periods are read from ``WEBHOOKS_EVENTS_RETENTION``, with
+    ``WEBHOOKS_EVENTS_RETENTION_DEFAULT`` for other receivers. Receivers
+    without a retention period are not included.
+    """
+    now = now or datetime.now(tz=timezone.utc)
+    retention = current_app.config["WEBHOOKS_EVENTS_RETENTION"]
+    default = current_app.config["WEBHOOKS_EVENTS_RETENTION_DEFAULT"]
+    receiver_ids = {
+        receiver_id for (receiver_id,) in db.session.query(Event.receiver_id).distinct()
+    }
+    cutoffs = {}
+    for receiver_id in receiver_ids | set(retention):
+        period = retention.get(receiver_id, default)
+        if period is not None:
+            cutoffs[receiver_id] = now - period
+    return cutoffs
+
+
+def purge_events(before, receiver_id=None, batch_size=None, sleep=None):
+    """Delete events created before a date in bounded batches.
+
+    Events are deleted with their deliveries in primary key order,
+    ``batch_size`` rows per transaction, sleeping ``sleep`` seconds between
+    batches so that the table is not locked for long and replicas can keep
+    up.
+
+    :param before: Delete events created before this date.
+    :param receiver_id: Only delete events of this receiver.
+    :param batch_size: Number of events per batch. Defaults to
+        ``WEBHOOKS_PURGE_BATCH_SIZE``.
+    :param sleep: Pause in seconds between batches. Defaults to
+        ``WEBHOOKS_PURGE_BATCH_SLEEP``.
+    :returns: Generator yielding the number of events deleted per batch.
+    """
+    if batch_size is None:
+        batch_size = current_app.config["WEBHOOKS_PURGE_BATCH_SIZE"]
+    if sleep is None:
+        sleep = current_app.config["WEBHOOKS_PURGE_BATCH_SLEEP"]
+
+    query = db.session.query(Event.id).filter(Event.created < before)
+    if receiver_id is not None:
+        query = query.filter(Event.receiver_id == receiver_id)
+
+    last_id = None
+    while True:
+        batch_query = query if last_id is None else query.filter(Event.id > last_id)
+        ids = [row.id for row in batch_query.order_by(Event.id).limit(batch_size)]
+        if not ids:
+            break
+        EventDelivery.query.filter(EventDelivery.event_id.in_(ids)).delete(
+            synchronize_session=False
+        )
+        Event.query.filter(Event.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+        last_id = ids[-1]
+        yield len(ids)
+        if len(ids) < batch_size:
+            break
+        if sleep:
+            time.sleep(sleep)
+
+
+def get_events_query(
+    receiver_id=None,
+    since=None,
+    until=None,
+    response_codes=None,
+    include_deleted=False,
+):
+    """Return a query selecting the ids of events, oldest first.
+
+    Response codes of events whose task state is tracked, see
+    :attr:`~invenio_webhooks.models.CeleryReceiver.task_state_tracking`, are
+    read from their task state, e.g. ``500`` selects failed tasks. Events
+    of Celery receivers which do not track task states keep the ``202``
+    response code of their creation whatever the outcome of their task, so
+    they cannot be selected by outcome.
+
+    :param receiver_id: Only select events of this receiver.
+    :param since: Only select events created at or after this date.
+    :param until: Only select events created before this date.
+    :param response_codes: Only select events with one of these response
+        codes.
+    :param include_deleted: Select deleted events, with the ``410``
+        response code, even if it is not one of ``response_codes``. Deleted
+        events of receivers tracking task states are revoked, and
+        :func:`~invenio_webhooks.models.process_events` skips them.
+    """
+    query = select(Event.id).order_by(Event.created, Event.id)
+    if receiver_id is not None:
+        query = query.where(Event.receiver_id == receiver_id)
+    if since is not None:
+        query = query.where(Event.created >= since)
+    if until is not None:
+        query = query.where(Event.created < until)
+    if response_codes:
+        if include_deleted:
+            response_codes = [*response_codes, 410]
+        task_states = [
+            state
+            for state, code in CeleryReceiver.CELERY_STATES_TO_HTTP.items()
+            if code in response_codes
+        ]
+        query = query.where(
+            or_(
+                and_(
+                    Event.task_state.is_(None),
+                    Event.response_code.in_(response_codes),
+                ),
+                Event.task_state.in_(task_states),
+            )
+        )
+    elif not include_deleted:
+        query = query.where(
+            or_(Event.response_code.is_(None), Event.response_code != 410)
+        )
+    return query
+
+
+def iter_event_ids(query, chunk_size):
+    """Yield the ids selected by a query in chunks.
+
+    Ids are read through a server-side cursor on a dedicated connection, so
+    that commits of the session while processing the chunks do not close
+    it. Databases without server-side cursors, e.g. SQLite, read all ids at
+    once, as an open cursor would block the commits.
+    """
+    with db.engine.connect() as connection:
+        if connection.dialect.supports_server_side_cursors:
+            result = connection.execution_options(yield_per=chunk_size).execute(query)
+            for ids in result.scalars().partitions():
+                yield [str(event_id) for event_id in ids]
+        else:
+            ids = [str(event_id) for event_id in connection.execute(query).scalars()]
+            for start in range(0, len(ids), chunk_size):
+                yield ids[start : start + chunk_size]
+
+
+def _get_reprocess_options(receiver_id, queue):
+    """Return the ``apply_async`` options of reprocessing tasks."""
+    receiver = current_webhooks.receivers.get(receiver_id) if receiver_id else None
+    options = {}
+    if hasattr(receiver, "get_apply_options"):
+        options.update(receiver.get_apply_options())
+    if queue is not None:
+        options["queue"] = queue
+    return options
+
+
+def _split_chunk(event_ids):
+    """Split a chunk into the events needing their own task and the others.
+
+    Celery receivers which do not track task states report the status of an
+    event from the result of the task with the id of the event. Their events
+    are processed again by a :func:`process_event` task with that id, once
+    the previous result is discarded, see
+    :meth:`~invenio_webhooks.models.CeleryReceiver.forget_status`.
+
+    :returns: The list of ``(event id, receiver id)`` tuples of the events
+        needing their own task, and the list of the other event ids.
+    """
+    events = {
+        str(event.id): event
+        for event in Event.query.filter(Event.id.in_(event_ids)).options(
+            load_only(Event.id, Event.receiver_id)
+        )
+    }
+    own, shared = [], []
+    for event_id in event_ids:
+        event = events.get(event_id)
+        receiver = event and current_webhooks.receivers.get(event.receiver_id)
+        if isinstance(receiver, CeleryReceiver) and not receiver.tracks_task_state:
+            receiver.forget_status(event)
+            own.append((event_id, event.receiver_id))
+        else:
+            shared.append(event_id)
+    return own, shared
+
+
+def _send_chunks(chunks, receiver_id, concurrency, queue):
+    """Send chunks of events to Celery, throttled by their unfinished tasks.
+
+    Tasks are counted from their results, since messages prefetched or not
+    yet acknowledged by workers are not counted in the depth of the queue.
+    """
+    interval = current_app.config["WEBHOOKS_REPROCESS_POLL_INTERVAL"]
+    options = _get_reprocess_options(receiver_id, queue)
+    unfinished = []
+    for event_ids in chunks:
+        while True:
+            unfinished = [
+                results
+                for results in unfinished
+                if not all(result.ready() for result in results)
+            ]
+            if len(unfinished) < concurrency:
+                break
+            time.sleep(interval)
+
+        own, shared = _split_chunk(event_ids)
+        results = [
+            process_event.apply_async(
+                task_id=event_id,
+                args=[event_id],
+                kwargs={"receiver_id": event_receiver_id},
+                **_get_reprocess_options(event_receiver_id, queue),
+            )
+            for event_id, event_receiver_id in own
+        ]
+        if shared:
+            results.append(
+                process_events.apply_async(
+                    args=[shared], kwargs={"receiver_id": receiver_id}, **options
+                )
+            )
+        unfinished.append(results)
+        yield len(event_ids), 0
+
+
+_worker_app = None
+
+
+def _init_worker(app):
+    """Initialize a process of the local pool."""
+    global _worker_app
+    _worker_app = app
+    with app.app_context():
+        # Connections inherited from the parent must not be shared.
+        db.engine.dispose(close=False)
+
+
+def _process_chunk(event_ids, receiver_id):
+    """Process a chunk of events in a process of the local pool.
+
+    Results of events processed by their own task are stored in the result
+    backend, where their status is read.
+
+    :returns: The number of events and the number of failed events.
+    """
+    with _worker_app.app_context():
+        own, shared = _split_chunk(event_ids)
+        failed = []
+        for event_id, event_receiver_id in own:
+            result = process_event.apply(
+                task_id=event_id,
+                args=[event_id],
+                kwargs={"receiver_id": event_receiver_id},
+                throw=False,
+            )
+            result.backend.store_result(
+                event_id, result.result, result.state, traceback=result.traceback
+            )
+            if result.failed():
+                failed.append((event_id, result.result))
+        if shared:
+            result = process_events.apply(
+                args=[shared], kwargs={"receiver_id": receiver_id}, throw=False
+            )
+            if result.failed():
+                failed.extend((event_id, result.result) for event_id in shared)
+        for event_id, error in failed:
+            _worker_app.logger.error(
+                "Reprocessing of event %s failed.", event_id, exc_info=error
+            )
+        return len(event_ids), len(failed)
+
+
+def _process_chunks_locally(chunks, receiver_id, concurrency):
+    """Process chunks of events in a local process pool."""
+    with ProcessPoolExecutor(
+        max_workers=concurrency,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_worker,
+        initargs=(current_app._get_current_object(),),
+    ) as executor:
+        pending = set()
+        for event_ids in chunks:
+            if len(pending) >= 2 * concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(executor.submit(_process_chunk, event_ids, receiver_id))
+        for future in pending:
+            yield future.result()
+
+
+def reprocess_events(
+    query, receiver_id=None, chunk_size=None, concurrency=None, queue=None, local=False
+):
+    """Process stored events again, e.g. after fixing a receiver.
+
+    Chunks of events are processed by the :func:`process_events` task. They
+    are either sent to Celery, waiting while the tasks of ``concurrency``
+    chunks are not finished so that live events are not starved, or
+    processed in a local pool of ``concurrency`` processes. Waiting for the
+    tasks requires a result backend.
+
+    Events of Celery receivers which do not track task states are processed
+    by their own task instead, see :func:`_split_chunk`.
+
+    :param query: Query selecting event ids, see :func:`get_events_query`.
+    :param receiver_id: Receiver of the events, used to route the tasks.
+    :param chunk_size: Number of events per task. Defaults to
+        ``WEBHOOKS_REPROCESS_CHUNK_SIZE``.
+    :param concurrency: Maximum number of unfinished chunks sent to Celery,
+        or of processes.
+        Defaults to ``WEBHOOKS_REPROCESS_CONCURRENCY``.
+    :param queue: Celery queue of the tasks. Defaults to the queue of the
+        receiver.
+    :param local: Process the events in a local process pool, which
+        requires the ``fork`` start method of POSIX systems.
+    :returns: Generator yielding the number of events and the number of
+        failed events per chunk. Failures of chunks sent to Celery are not
+        known and reported as ``0``.
+    """
+    if chunk_size is None:
+        chunk_size = current_app.config["WEBHOOKS_REPROCESS_CHUNK_SIZE"]
+    if concurrency is None:
+        concurrency = current_app.config["WEBHOOKS_REPROCESS_CONCURRENCY"]
+    chunks = iter_event_ids(query, chunk_size)
+    if local:
+        return _process_chunks_locally(chunks, receiver_id, concurrency)
+    return _send_chunks(chunks, receiver_id, concurrency, queue)
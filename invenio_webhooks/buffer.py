@@ -0,0 +1,132 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Group-commit write-behind buffer for webhook events."""
+
+import threading
+import time
+
+from invenio_db import db
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import make_transient_to_detached
+
+
+class _Batch:
+    """Rows waiting to be inserted together."""
+
+    def __init__(self, deadline):
+        """Initialize an open batch."""
+        self.deadline = deadline
+        self.rows = []
+        self.done = threading.Event()
+        self.error = None
+        self.row_errors = {}
+
+
+class EventBuffer:
+    """Per-process buffer inserting events with one multi-row ``INSERT``.
+
+    Each call to :meth:`add` blocks until the event has been committed. A
+    batch is flushed as soon as it holds ``max_size`` events or when
+    ``max_wait`` seconds have passed since its first event, whichever comes
+    first. The flush is performed by the request thread which fills the
+    batch or which first notices that the deadline has expired.
+    """
+
+    def __init__(self, max_size=50, max_wait=0.01):
+        """Initialize the buffer.
+
+        :param max_size: Maximum number of events per ``INSERT``.
+        :param max_wait: Maximum time in seconds an event waits for a flush.
+        """
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._batch = None
+
+    @staticmethod
+    def _row(obj):
+        """Return the column values of an object, applying column defaults."""
+        row = {}
+        for attr in obj.__mapper__.column_attrs:
+            column = attr.columns[0]
+            value = getattr(obj, attr.key)
+            if value is None and column.default is not None:
+                default = column.default
+                value = default.arg(None) if default.is_callable else default.arg
+                setattr(obj, attr.key, value)
+            row[column.key] = value
+        return row
+
+    def add(self, event):
+        """Insert an event and wait until it has been committed."""
+        delivery = event.delivery
+        if delivery is not None:
+            delivery.event_id = event.id
+        row = (
+            self._row(event),
+            self._row(delivery) if delivery is not None else None,
+        )
+        with self._lock:
+            batch = self._batch
+            if batch is None:
+                batch = self._batch = _Batch(time.monotonic() + self.max_wait)
+            index = len(batch.rows)
+            batch.rows.append(row)
+            full = len(batch.rows) >= self.max_size
+            if full:
+                self._batch = None
+
+        if not full:
+            batch.done.wait(max(batch.deadline - time.monotonic(), 0))
+            with self._lock:
+                full = self._batch is batch
+                if full:
+                    self._batch = None
+        if full:
+            self._flush(batch)
+        else:
+            batch.done.wait()
+
+        error = batch.row_errors.get(index, batch.error)
+        if error is not None:
+            raise error
+        make_transient_to_detached(event)
+        if delivery is not None:
+            make_transient_to_detached(delivery)
+        db.session.add(event)
+        return event
+
+    @staticmethod
+    def _insert(rows):
+        """Insert event and delivery rows in a single transaction."""
+        from .models import Event, EventDelivery
+
+        deliveries = [delivery for _, delivery in rows if delivery is not None]
+        with db.engine.begin() as connection:
+            if deliveries:
+                connection.execute(EventDelivery.__table__.insert(), deliveries)
+            connection.execute(Event.__table__.insert(), [row for row, _ in rows])
+
+    def _flush(self, batch):
+        """Insert all rows of a batch.
+
+        If the batch violates a constraint, e.g. because of a redelivered
+        event, its rows are inserted one by one so that only the offending
+        events fail.
+        """
+        try:
+            self._insert(batch.rows)
+        except IntegrityError as e:
+            if len(batch.rows) == 1:
+                batch.error = e
+                return
+            for index, row in enumerate(batch.rows):
+                try:
+                    self._insert([row])
+                except Exception as e:
+                    batch.row_errors[index] = e
+        except Exception as e:
+            batch.error = e
+        finally:
+            batch.done.set()
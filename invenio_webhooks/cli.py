@@ -0,0 +1,320 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Command line interface for webhook events."""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from invenio_db import db
+from sqlalchemy import func, select
+
+from .api import (
+    get_events_query,
+    get_retention_cutoffs,
+    purge_events,
+    reprocess_events,
+)
+from .loadtest import (
+    ClientTarget,
+    URLTarget,
+    build_requests,
+    load_events,
+    load_ndjson,
+    run_loadtest,
+)
+from .partitions import (
+    create_partitions,
+    drop_partitions,
+    get_partition_cutoff,
+    is_partitioned,
+    partition_events_table,
+    unpartition_events_table,
+)
+from .proxies import current_webhooks
+
+
+@click.group()
+def webhooks():
+    """Webhooks commands."""
+
+
+@webhooks.command("purge")
+@click.option("--receiver", "receiver_id", help="Only purge events of a receiver.")
+@click.option(
+    "--older-than",
+    type=int,
+    help="Retention period in days. Defaults to WEBHOOKS_EVENTS_RETENTION.",
+)
+@click.option("--batch-size", type=int, help="Number of events per batch.")
+@click.option("--sleep", type=float, help="Pause in seconds between batches.")
+@with_appcontext
+def purge(receiver_id, older_than, batch_size, sleep):
+    """Delete events older than their retention period."""
+    if older_than is not None:
+        cutoffs = {
+            receiver_id: datetime.now(tz=timezone.utc) - timedelta(days=older_than)
+        }
+    else:
+        cutoffs = get_retention_cutoffs()
+        if receiver_id is not None:
+            cutoffs = {
+                key: value for key, value in cutoffs.items() if key == receiver_id
+            }
+        if not cutoffs:
+            raise click.ClickException(
+                "No retention period is configured, see WEBHOOKS_EVENTS_RETENTION "
+                "or use --older-than."
+            )
+
+    for cutoff_receiver_id, before in cutoffs.items():
+        start = time.perf_counter()
+        deleted = 0
+        for count in purge_events(
+            before,
+            receiver_id=cutoff_receiver_id,
+            batch_size=batch_size,
+            sleep=sleep,
+        ):
+            deleted += count
+            click.echo(f"Deleted {deleted} events...", err=True)
+        elapsed = time.perf_counter() - start
+        click.secho(
+            f"Deleted {deleted} events of {cutoff_receiver_id or 'all receivers'} "
+            f"created before {before.isoformat()} in {elapsed:.1f}s "
+            f"({deleted / elapsed if elapsed else 0:.0f} rows/s).",
+            fg="green",
+        )
+
+
+@webhooks.command("partitions")
+@click.option(
+    "--months-ahead",
+    type=int,
+    help="Number of months to create partitions for. "
+    "Defaults to WEBHOOKS_EVENTS_PARTITIONS_AHEAD.",
+)
+@click.option(
+    "--older-than",
+    type=int,
+    help="Drop partitions of events older than this number of days. "
+    "Defaults to the longest retention period.",
+)
+@click.option(
+    "--unpartition",
+    is_flag=True,
+    help="Convert a partitioned events table back into a single table.",
+)
+@with_appcontext
+def partitions(months_ahead, older_than, unpartition):
+    """Create future partitions and drop expired partitions of events.
+
+    With WEBHOOKS_EVENTS_PARTITIONING enabled, an events table which is not
+    partitioned yet is converted first. The conversion copies all events
+    and locks the table while it runs.
+    """
+    connection = db.session.connection()
+    if unpartition:
+        if unpartition_events_table(connection):
+            db.session.commit()
+            click.secho("Converted the events table into a single table.", fg="green")
+        else:
+            click.secho("The events table is not partitioned.", fg="yellow")
+        return
+
+    if not is_partitioned(connection):
+        if not current_app.config["WEBHOOKS_EVENTS_PARTITIONING"]:
+            click.secho("The events table is not partitioned.", fg="yellow")
+            return
+        if not partition_events_table(connection, months_ahead=months_ahead):
+            click.secho("The database does not support partitioning.", fg="yellow")
+            return
+        db.session.commit()
+        click.echo("Converted the events table into a partitioned table.")
+
+    created = create_partitions(months_ahead=months_ahead)
+    if older_than is not None:
+        before = datetime.now(tz=timezone.utc) - timedelta(days=older_than)
+    else:
+        before = get_partition_cutoff()
+    dropped = drop_partitions(before) if before is not None else []
+    db.session.commit()
+
+    for name in created:
+        click.echo(f"Created partition {name}.")
+    for name in dropped:
+        click.echo(f"Dropped partition {name}.")
+    click.secho(
+        f"Created {len(created)} and dropped {len(dropped)} partitions.", fg="green"
+    )
+
+
+@webhooks.command("reprocess")
+@click.option("--receiver", "receiver_id", help="Only reprocess events of a receiver.")
+@click.option(
+    "--since", type=click.DateTime(), help="Only events created at or after (UTC)."
+)
+@click.option(
+    "--until", type=click.DateTime(), help="Only events created before (UTC)."
+)
+@click.option(
+    "--response-code",
+    "response_codes",
+    type=int,
+    multiple=True,
+    help="Only events with this response code, read from the task state of "
+    "receivers tracking it. Can be repeated.",
+)
+@click.option(
+    "--include-deleted",
+    is_flag=True,
+    help="Also reprocess deleted events (410). Deleted events of receivers "
+    "tracking task states stay revoked and are skipped.",
+)
+@click.option(
+    "--chunk-size", type=click.IntRange(min=1), help="Number of events per task."
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    help="Maximum number of unfinished chunks, or of local processes.",
+)
+@click.option("--queue", help="Celery queue. Defaults to the queue of the receiver.")
+@click.option("--local", is_flag=True, help="Process events in a local process pool.")
+@with_appcontext
+def reprocess(
+    receiver_id,
+    since,
+    until,
+    response_codes,
+    include_deleted,
+    chunk_size,
+    concurrency,
+    queue,
+    local,
+):
+    """Process stored events again."""
+    query = get_events_query(
+        receiver_id=receiver_id,
+        since=since and since.replace(tzinfo=timezone.utc),
+        until=until and until.replace(tzinfo=timezone.utc),
+        response_codes=response_codes,
+        include_deleted=include_deleted,
+    )
+    total = db.session.scalar(
+        select(func.count()).select_from(query.order_by(None).subquery())
+    )
+    start = time.perf_counter()
+    processed = failed = 0
+    for count, failures in reprocess_events(
+        query,
+        receiver_id=receiver_id,
+        chunk_size=chunk_size,
+        concurrency=concurrency,
+        queue=queue,
+        local=local,
+    ):
+        processed += count
+        failed += failures
+        click.echo(
+            f"{'Processed' if local else 'Sent'} {processed}/{total} events...",
+            err=True,
+        )
+    elapsed = time.perf_counter() - start
+    click.secho(
+        f"{'Processed' if local else 'Sent'} {processed} events in {elapsed:.1f}s"
+        + (f", {failed} failed." if failed else "."),
+        fg="red" if failed else "green",
+    )
+
+
+@webhooks.command("loadtest")
+@click.argument("receiver_id")
+@click.option(
+    "--corpus",
+    type=click.File("r"),
+    help="NDJSON file with one payload per line. "
+    "Defaults to the stored events of the receiver.",
+)
+@click.option(
+    "--requests",
+    "count",
+    type=click.IntRange(min=1),
+    help="Number of requests. Defaults to the number of payloads.",
+)
+@click.option(
+    "--rate",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Target number of requests per second.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of concurrent requests.",
+)
+@click.option(
+    "--url",
+    help="Base URL of a running application, e.g. https://127.0.0.1:5000/api. "
+    "Defaults to the application in process, which stores the events in its "
+    "database and runs the receiver on them.",
+)
+@click.option(
+    "--token",
+    envvar="WEBHOOKS_LOADTEST_TOKEN",
+    required=True,
+    help="OAuth access token with the webhooks:event scope.",
+)
+@with_appcontext
+def loadtest(receiver_id, corpus, count, rate, concurrency, url, token):
+    """Replay recorded payloads against a receiver.
+
+    Events are really created: without --url, they are stored in the
+    database of the application and processed by the receiver, including
+    its side effects. Use a disposable database or a test receiver.
+    """
+    receiver = current_webhooks.receivers.get(receiver_id)
+    if receiver is None:
+        raise click.BadParameter(
+            f"Receiver {receiver_id} does not exist.", param_hint="RECEIVER_ID"
+        )
+    payloads = load_ndjson(corpus) if corpus else load_events(receiver_id, count)
+    if not payloads:
+        raise click.ClickException("No payloads to replay.")
+    requests = build_requests(receiver, payloads, count)
+    if url:
+        target = URLTarget(url, receiver_id, token)
+    else:
+        target = ClientTarget(current_app._get_current_object(), receiver_id, token)
+
+    click.echo(
+        f"Sending {len(requests)} requests to {url or 'the application'} "
+        f"with {concurrency} threads...",
+        err=True,
+    )
+    result = run_loadtest(target, requests, rate=rate, concurrency=concurrency)
+
+    click.secho(
+        f"Sent {result.count} requests in {result.elapsed:.1f}s "
+        f"({result.throughput:.1f} requests/s).",
+        fg="green",
+    )
+    for status, status_count in sorted(result.statuses.items(), key=str):
+        click.echo(f"  {status or 'error'}: {status_count}")
+    click.echo(
+        "Latency (ms): "
+        + ", ".join(
+            f"p{percent}={result.percentile(percent) * 1000:.1f}"
+            for percent in (50, 90, 99)
+        )
+        + f", max={max(result.latencies) * 1000:.1f}"
+    )
+    histogram = result.histogram()
+    largest = max(bucket_count for _, bucket_count in histogram)
+    for bound, bucket_count in histogram:
+        bar = "#" * round(40 * bucket_count / largest)
+        click.echo(f"  <= {bound * 1000:8.0f} ms {bucket_count:7d} {bar}")
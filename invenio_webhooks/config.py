@@ -17,3 +17,258 @@ Ultrahook for testing on development machines:
 """
 
 WEBHOOKS_SECRET_KEY = "secret_key"
+"""Secret key used to sign and verify payloads.
+
+A list of keys can be given during key rotation: payloads signed with any of
+them are accepted, and the first key is used to sign new payloads.
+"""
+
+WEBHOOKS_STREAMING_INGESTION = False
+"""Read the request body in a single streaming pass.
+
+When enabled, the body is read from ``request.stream`` in chunks of
+``WEBHOOKS_STREAM_CHUNK_SIZE`` bytes. The signature HMAC and the size limit
+are updated while reading, and the same buffer is handed to the JSON or form
+decoder without keeping a second copy in ``request.data``.
+"""
+
+WEBHOOKS_STREAM_CHUNK_SIZE = 64 * 1024
+"""Chunk size in bytes used when streaming the request body."""
+
+WEBHOOKS_MAX_PAYLOAD_SIZE = None
+"""Maximum accepted payload size in bytes (``None`` for no limit).
+
+Only enforced when ``WEBHOOKS_STREAMING_INGESTION`` is enabled. Larger
+requests are rejected with ``413 Request Entity Too Large``.
+"""
+
+WEBHOOKS_EVENT_BUFFER = False
+"""Insert new events through a per-process group-commit buffer.
+
+When enabled, events are written with one multi-row ``INSERT`` and a single
+commit every ``WEBHOOKS_EVENT_BUFFER_SIZE`` events or after
+``WEBHOOKS_EVENT_BUFFER_MAX_WAIT`` seconds, whichever comes first. Requests are
+only acknowledged once their event has been committed.
+"""
+
+WEBHOOKS_EVENT_BUFFER_SIZE = 50
+"""Maximum number of events inserted by one flush of the event buffer."""
+
+WEBHOOKS_EVENT_BUFFER_MAX_WAIT = 0.01
+"""Maximum time in seconds an event waits in the buffer before a flush."""
+
+WEBHOOKS_PAYLOAD_COMPRESSION_THRESHOLD = None
+"""Compress payloads whose JSON encoding is at least this many bytes.
+
+Payloads are stored as bytes in the ``payload`` column, compressed with zlib
+above the threshold, and decompressed transparently when the deferred
+``Event.payload`` column is loaded. Large values are kept out of line by the
+database, e.g. in the TOAST table on PostgreSQL. ``None`` disables
+compression.
+"""
+
+WEBHOOKS_PAYLOAD_COMPRESSION_LEVEL = 6
+"""Zlib compression level used for large payloads."""
+
+WEBHOOKS_JSON_CODEC = "json"
+"""JSON codec used for payload parsing, payload columns and responses.
+
+Either ``json``, ``orjson``, ``msgspec`` or the import path of a codec
+implementing ``dumps`` and ``loads`` (see
+:class:`invenio_webhooks.serializers.JSONCodec`). Built-in codecs whose
+library is not installed fall back to ``json``.
+
+On PostgreSQL the native ``JSON`` columns are serialized by the database
+driver, which can be configured through the ``json_serializer`` and
+``json_deserializer`` options of ``SQLALCHEMY_ENGINE_OPTIONS``.
+"""
+
+WEBHOOKS_PRELOAD_RECEIVERS = True
+"""Receivers to import when the application starts.
+
+``True`` imports all receivers declared in the ``invenio_webhooks.receivers``
+entry point group, so that unknown signature schemes fail at startup. Set to
+a list of receiver ids to import only those, the others are imported the
+first time they are accessed and an unknown signature scheme then fails
+their first request.
+"""
+
+WEBHOOKS_STATUS_CACHE = None
+"""Cache of Celery task statuses reported by ``CeleryReceiver.status``.
+
+``None`` disables the cache, ``"memory"`` uses a bounded in-process cache,
+which each web process fills on its own, and any other value is the import
+path of a cache shared between processes which implements ``get``,
+``get_many``, ``set`` and ``delete`` like Flask-Caching, e.g.
+``"invenio_cache:current_cache"``.
+"""
+
+WEBHOOKS_STATUS_CACHE_SIZE = 10000
+"""Maximum number of statuses kept by the in-process status cache."""
+
+WEBHOOKS_STATUS_CACHE_TTL = 1
+"""Time in seconds to cache the status of a pending or running task.
+
+``0`` disables caching of these statuses, whichever cache is configured.
+"""
+
+WEBHOOKS_STATUS_CACHE_TERMINAL_TTL = 3600
+"""Time in seconds to cache the status of a finished task (``0`` to disable)."""
+
+WEBHOOKS_TASK_STATE_TRACKING = False
+"""Write Celery task states of ``CeleryReceiver`` events to the event row.
+
+When enabled, ``process_event`` records when the task starts, retries,
+succeeds or fails, and the event status is read from the row instead of the
+Celery result backend. Receivers can override it with
+``CeleryReceiver.task_state_tracking``.
+"""
+
+WEBHOOKS_DELIVERY_CACHE_SIZE = 10000
+"""Number of recent delivery ids remembered per process.
+
+Redeliveries of a recently stored delivery are rejected from this cache
+without a database query, see ``Receiver.delivery_header``.
+"""
+
+WEBHOOKS_EVENTS_RETENTION = {}
+"""Retention period of events per receiver id, as ``timedelta``.
+
+Events older than their retention period are deleted by the
+``invenio webhooks purge`` command and the
+``invenio_webhooks.tasks.purge_expired_events`` task.
+"""
+
+WEBHOOKS_EVENTS_RETENTION_DEFAULT = None
+"""Retention period of events of other receivers (``None`` keeps them)."""
+
+WEBHOOKS_PURGE_BATCH_SIZE = 1000
+"""Number of events deleted per transaction when purging events."""
+
+WEBHOOKS_PURGE_BATCH_SLEEP = 0.1
+"""Pause in seconds between two batches when purging events."""
+
+WEBHOOKS_REPROCESS_CHUNK_SIZE = 100
+"""Number of events per task when reprocessing stored events."""
+
+WEBHOOKS_REPROCESS_CONCURRENCY = 4
+"""Maximum number of unfinished reprocessing chunks, or of local processes.
+
+Reprocessing waits while the tasks of this many chunks sent to Celery are
+not finished, so that live events are not starved.
+"""
+
+WEBHOOKS_REPROCESS_POLL_INTERVAL = 1
+"""Seconds between two checks of the unfinished tasks while reprocessing."""
+
+WEBHOOKS_EVENTS_PARTITIONING = False
+"""Partition the events table by month on PostgreSQL.
+
+The table is converted by the next run of ``invenio webhooks partitions``.
+See :mod:`invenio_webhooks.partitions`.
+"""
+
+WEBHOOKS_EVENTS_PARTITIONS_AHEAD = 3
+"""Number of monthly partitions created ahead of the current month."""
+
+WEBHOOKS_EVENTS_PAGE_SIZE = 25
+"""Default number of events per page when listing events."""
+
+WEBHOOKS_EVENTS_MAX_PAGE_SIZE = 100
+"""Maximum number of events per page when listing events."""
+
+WEBHOOKS_EVENTS_STREAM_BATCH_SIZE = 1000
+"""Number of rows fetched at a time when streaming events as NDJSON."""
+
+WEBHOOKS_STATUS_BULK_MAX_IDS = 1000
+"""Maximum number of events whose status is requested at once."""
+
+WEBHOOKS_STATUS_BROKER = None
+"""Broker publishing task state transitions of events to waiting clients.
+
+``None`` disables waiting for status changes, ``"local"`` uses an in-process
+broker which only reaches clients of the process running the tasks,
+``"redis"`` uses Redis publish/subscribe on ``WEBHOOKS_STATUS_BROKER_URL``,
+and any other value is the import path of a broker, see
+:mod:`invenio_webhooks.pubsub`.
+"""
+
+WEBHOOKS_STATUS_BROKER_URL = "redis://localhost:6379/0"
+"""Redis URL of the ``"redis"`` status broker."""
+
+WEBHOOKS_STATUS_MAX_WAIT = 60
+"""Maximum time in seconds a client waits for status changes of an event."""
+
+WEBHOOKS_STATUS_STREAM_KEEPALIVE = 15
+"""Interval in seconds of keep-alive comments in event status streams."""
+
+WEBHOOKS_RATE_LIMITS = {}
+"""Token bucket limits of new events per receiver id.
+
+Limits are ``(rate, burst)`` tuples: ``rate`` tokens per second are added
+to a bucket holding at most ``burst`` tokens, and each event takes one.
+Requests over the limit are answered with 429 and a ``Retry-After`` header.
+"""
+
+WEBHOOKS_RATE_LIMIT_DEFAULT = None
+"""Token bucket limit of new events of other receivers (``None`` for none)."""
+
+WEBHOOKS_USER_RATE_LIMIT = None
+"""Token bucket limit of new events per user, as ``(rate, burst)``."""
+
+WEBHOOKS_RATE_LIMIT_STORAGE = "memory"
+"""Storage of the token buckets.
+
+``"memory"`` keeps buckets in each process, ``"redis"`` shares them between
+processes in Redis at ``WEBHOOKS_RATE_LIMIT_STORAGE_URL``, and any other
+value is the import path of a limiter, see :mod:`invenio_webhooks.ratelimit`.
+"""
+
+WEBHOOKS_RATE_LIMIT_STORAGE_URL = "redis://localhost:6379/0"
+"""Redis URL of the ``"redis"`` rate limit storage."""
+
+WEBHOOKS_MAX_QUEUE_DEPTH = None
+"""Maximum number of messages in the Celery queue to accept new events.
+
+Events of Celery receivers are answered with 503 and a ``Retry-After``
+header while the queue is deeper. ``None`` disables the check.
+"""
+
+WEBHOOKS_QUEUE_DEPTH_CACHE_TTL = 1
+"""Time in seconds the queue depth is cached by each process (``0`` to disable)."""
+
+WEBHOOKS_QUEUE_RETRY_AFTER = 30
+"""Seconds after which clients should retry events rejected by queue depth."""
+
+WEBHOOKS_CELERY_TASK_OPTIONS = {}
+"""Celery options of processing tasks per receiver id.
+
+Dictionaries with ``queue``, ``priority`` and ``rate_limit`` keys, which
+override the ``celery_*`` attributes of Celery receivers, see
+:mod:`invenio_webhooks.routing`.
+"""
+
+WEBHOOKS_CELERY_MAX_PRIORITY = 10
+"""Maximum message priority of the queues of receivers declaring a priority.
+
+Used as the ``x-max-priority`` argument of the queues returned by
+:func:`invenio_webhooks.routing.get_task_queues`.
+"""
+
+WEBHOOKS_METRICS = None
+"""Metrics hook timing the stages of event handling.
+
+``None`` discards all measurements, ``"prometheus"`` exports them with
+``prometheus_client``, and any other value is the import path of a
+:class:`~invenio_webhooks.metrics.Metrics` subclass or instance, see
+:mod:`invenio_webhooks.metrics`.
+"""
+
+WEBHOOKS_SERVER_TIMING = False
+"""Report the duration of the stages of each request in a response header.
+
+Responses of the REST API then carry a ``Server-Timing`` header with the
+time spent in authentication, signature check, payload parsing, database
+commit and dispatch, e.g. to diagnose slow deliveries from the delivery log
+of the sender. It discloses processing times, so enable it for debugging.
+"""
@@ -12,9 +12,53 @@ class ReceiverDoesNotExist(WebhooksError):
     """Raised when receiver does not exist."""
 
 
+class SignatureValidatorDoesNotExist(WebhooksError):
+    """Raised when no validator exists for a signature header."""
+
+
 class InvalidPayload(WebhooksError):
     """Raised when the payload is invalid."""
 
 
 class InvalidSignature(WebhooksError):
     """Raised when the signature does not match."""
+
+
+class PayloadTooLarge(WebhooksError):
+    """Raised when the payload exceeds the configured size limit."""
+
+
+class InvalidCursor(WebhooksError):
+    """Raised when a pagination cursor can not be decoded."""
+
+
+class DuplicateDelivery(WebhooksError):
+    """Raised when a delivery has already been stored as an event."""
+
+    def __init__(self, receiver_id, event_id):
+        """Initialize exception with the original event."""
+        super().__init__(receiver_id, event_id)
+        self.receiver_id = receiver_id
+        self.event_id = event_id
+
+
+class DeliveryConflict(WebhooksError):
+    """Raised when a delivery has already been stored for another user."""
+
+
+class RateLimitExceeded(WebhooksError):
+    """Raised when a rate limit of a receiver or user is exceeded."""
+
+    def __init__(self, retry_after):
+        """Initialize exception with the seconds until a retry is admitted."""
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+class QueueBacklogExceeded(WebhooksError):
+    """Raised when the task queue holds too many pending events."""
+
+    def __init__(self, retry_after):
+        """Initialize exception with the seconds until a retry is advised."""
+        super().__init__(retry_after)
+        self.retry_after = retry_after
@@ -4,35 +4,249 @@
 
 """Invenio module for processing webhook events."""
 
+import re
+import threading
+from collections.abc import MutableMapping
+
 from invenio_base.utils import entry_points
+from werkzeug.utils import cached_property, import_string
+
+from . import config, signatures
+from .buffer import EventBuffer
+from .errors import ReceiverDoesNotExist, SignatureValidatorDoesNotExist
+from .metrics import (
+    Metrics,
+    PrometheusMetrics,
+    ServerTimingMetrics,
+    start_request_timer,
+)
+from .pubsub import LocalBroker, RedisBroker
+from .ratelimit import RedisTokenBucketLimiter, TokenBucketLimiter
+from .serializers import load_codec
+from .utils import TTLCache
+
+
+class LazyReceivers(MutableMapping):
+    """Mapping of receiver ids to receivers loaded on first access.
+
+    Receivers declared through entry points are only recorded by name. The
+    entry point is imported and the receiver instantiated the first time it
+    is looked up, so membership tests do not import anything.
+    """
+
+    def __init__(self, factory):
+        """Initialize mapping.
+
+        :param factory: Callable creating a receiver instance from a receiver
+            id and class.
+        """
+        self._factory = factory
+        self._receivers = {}
+        self._entry_points = {}
+        self._lock = threading.Lock()
+
+    def add_entry_point(self, ep):
+        """Record a receiver entry point without loading it."""
+        self._entry_points[ep.name] = ep
+
+    def __getitem__(self, receiver_id):
+        """Return a receiver, loading it from its entry point if needed."""
+        try:
+            return self._receivers[receiver_id]
+        except KeyError:
+            with self._lock:
+                if receiver_id not in self._receivers:
+                    ep = self._entry_points[receiver_id]
+                    self._receivers[receiver_id] = self._factory(receiver_id, ep.load())
+                    del self._entry_points[receiver_id]
+            return self._receivers[receiver_id]
+
+    def __setitem__(self, receiver_id, receiver):
+        """Set a receiver instance."""
+        self._entry_points.pop(receiver_id, None)
+        self._receivers[receiver_id] = receiver
 
-from . import config
+    def __delitem__(self, receiver_id):
+        """Remove a loaded or not yet loaded receiver."""
+        if self._receivers.pop(receiver_id, None) is None:
+            del self._entry_points[receiver_id]
+
+    def loaded(self):
+        """Return the receivers already loaded, without loading the others."""
+        return dict(self._receivers)
+
+    def __contains__(self, receiver_id):
+        """Check if a receiver exists without loading it."""
+        return receiver_id in self._receivers or receiver_id in self._entry_points
+
+    def __iter__(self):
+        """Iterate over receiver ids."""
+        yield from list(self._receivers)
+        yield from list(self._entry_points)
+
+    def __len__(self):
+        """Return the number of receivers."""
+        return len(self._receivers) + len(self._entry_points)
 
 
 class _WebhooksState:
     """Webhooks state storing registered receivers."""
 
-    def __init__(self, app, entry_point_group=None):
+    def __init__(self, app, entry_point_group=None, signatures_entry_point_group=None):
         """Initialize state."""
         self.app = app
-        self.receivers = {}
+        self.receivers = LazyReceivers(self._create_receiver)
+        self.signature_validators = {}
 
+        if signatures_entry_point_group:
+            self.load_signatures_entry_point_group(signatures_entry_point_group)
         if entry_point_group:
             self.load_entry_point_group(entry_point_group)
+            self.preload(app.config["WEBHOOKS_PRELOAD_RECEIVERS"])
 
     def register(self, receiver_id, receiver):
-        """Register a receiver."""
+        """Register a receiver.
+
+        The signature validator of the receiver is resolved once here, so
+        that unknown signature schemes fail when the receiver is registered.
+        """
         assert receiver_id not in self.receivers
-        self.receivers[receiver_id] = receiver(receiver_id)
+        self.receivers[receiver_id] = self._create_receiver(receiver_id, receiver)
+
+    def _create_receiver(self, receiver_id, receiver):
+        """Instantiate a receiver and resolve its signature validator."""
+        instance = receiver(receiver_id)
+        if instance.signature:
+            instance.signature_validator = self.get_signature_validator(
+                instance.signature
+            )
+        return instance
+
+    def register_signature_validator(self, header, validator):
+        """Register a signature validator for a signature header."""
+        self.signature_validators[header.lower()] = validator
+
+    def get_signature_validator(self, header):
+        """Return the validator of a signature header.
+
+        Validators registered through the entry point group take precedence
+        over the ``check_<header>`` functions of
+        :mod:`invenio_webhooks.signatures`.
+        """
+        validator = self.signature_validators.get(header.lower())
+        if validator is None:
+            name = "check_" + re.sub(r"[-]", "_", header).lower()
+            validator = getattr(signatures, name, None)
+        if validator is None:
+            raise SignatureValidatorDoesNotExist(header)
+        return validator
 
     def unregister(self, receiver_id):
         """Unregister a receiver by its id."""
         del self.receivers[receiver_id]
 
     def load_entry_point_group(self, entry_point_group):
-        """Load actions from an entry point group."""
+        """Load actions from an entry point group.
+
+        Receivers are only imported on first access, see
+        :class:`LazyReceivers`.
+        """
         for ep in entry_points(group=entry_point_group):
-            self.register(ep.name, ep.load())
+            assert ep.name not in self.receivers
+            self.receivers.add_entry_point(ep)
+
+    def preload(self, receiver_ids):
+        """Load receivers ahead of their first access.
+
+        :param receiver_ids: List of receiver ids, or ``True`` for all.
+        """
+        if receiver_ids is True:
+            receiver_ids = list(self.receivers)
+        for receiver_id in receiver_ids:
+            if receiver_id not in self.receivers:
+                raise ReceiverDoesNotExist(receiver_id)
+            self.receivers[receiver_id]
+
+    def load_signatures_entry_point_group(self, entry_point_group):
+        """Load signature validators from an entry point group.
+
+        The entry point name is the signature header, e.g.
+        ``x-gitlab-token = mypackage.signatures:check_gitlab_token``.
+        """
+        for ep in entry_points(group=entry_point_group):
+            self.register_signature_validator(ep.name, ep.load())
+
+    @cached_property
+    def event_buffer(self):
+        """Return the group-commit buffer for new events."""
+        return EventBuffer(
+            max_size=self.app.config["WEBHOOKS_EVENT_BUFFER_SIZE"],
+            max_wait=self.app.config["WEBHOOKS_EVENT_BUFFER_MAX_WAIT"],
+        )
+
+    @cached_property
+    def json_codec(self):
+        """Return the JSON codec configured by ``WEBHOOKS_JSON_CODEC``."""
+        return load_codec(self.app.config["WEBHOOKS_JSON_CODEC"])
+
+    @cached_property
+    def delivery_cache(self):
+        """Return the cache of recently stored delivery ids."""
+        return TTLCache(maxsize=self.app.config["WEBHOOKS_DELIVERY_CACHE_SIZE"])
+
+    @cached_property
+    def status_cache(self):
+        """Return the task status cache configured by ``WEBHOOKS_STATUS_CACHE``."""
+        cache = self.app.config["WEBHOOKS_STATUS_CACHE"]
+        if cache == "memory":
+            return TTLCache(maxsize=self.app.config["WEBHOOKS_STATUS_CACHE_SIZE"])
+        return import_string(cache) if isinstance(cache, str) else cache
+
+    @cached_property
+    def status_broker(self):
+        """Return the broker configured by ``WEBHOOKS_STATUS_BROKER``."""
+        broker = self.app.config["WEBHOOKS_STATUS_BROKER"]
+        if broker == "local":
+            return LocalBroker()
+        if broker == "redis":
+            return RedisBroker(self.app.config["WEBHOOKS_STATUS_BROKER_URL"])
+        return import_string(broker) if isinstance(broker, str) else broker
+
+    @cached_property
+    def rate_limiter(self):
+        """Return the limiter configured by ``WEBHOOKS_RATE_LIMIT_STORAGE``."""
+        storage = self.app.config["WEBHOOKS_RATE_LIMIT_STORAGE"]
+        if storage == "memory":
+            return TokenBucketLimiter()
+        if storage == "redis":
+            return RedisTokenBucketLimiter(
+                self.app.config["WEBHOOKS_RATE_LIMIT_STORAGE_URL"]
+            )
+        return import_string(storage) if isinstance(storage, str) else storage
+
+    @cached_property
+    def metrics(self):
+        """Return the metrics hook configured by ``WEBHOOKS_METRICS``.
+
+        With ``WEBHOOKS_SERVER_TIMING``, it also records the stages of the
+        current request.
+        """
+        metrics = self.app.config["WEBHOOKS_METRICS"]
+        if metrics is None:
+            metrics = Metrics()
+        elif metrics == "prometheus":
+            metrics = PrometheusMetrics()
+        else:
+            metrics = import_string(metrics) if isinstance(metrics, str) else metrics
+            metrics = metrics() if isinstance(metrics, type) else metrics
+        if self.app.config["WEBHOOKS_SERVER_TIMING"]:
+            metrics = ServerTimingMetrics(metrics)
+        return metrics
+
+    @cached_property
+    def queue_depth_cache(self):
+        """Return the cache of Celery queue depths."""
+        return TTLCache(maxsize=64)
 
 
 class InvenioWebhooks:
@@ -43,11 +257,26 @@ class InvenioWebhooks:
         if app:
             self.init_app(app, **kwargs)
 
-    def init_app(self, app, entry_point_group="invenio_webhooks.receivers"):
-        """Flask application initialization."""
+    def init_app(
+        self,
+        app,
+        entry_point_group="invenio_webhooks.receivers",
+        signatures_entry_point_group="invenio_webhooks.signatures",
+    ):
+        """Flask application initialization.
+
+        Receivers of the entry point group are imported at startup, or only
+        on first access if not listed in ``WEBHOOKS_PRELOAD_RECEIVERS``.
+        """
         self.init_config(app)
-        state = _WebhooksState(app, entry_point_group=entry_point_group)
+        state = _WebhooksState(
+            app,
+            entry_point_group=entry_point_group,
+            signatures_entry_point_group=signatures_entry_point_group,
+        )
         self._state = app.extensions["invenio-webhooks"] = state
+        # Run first, so that the timing includes the OAuth token verification.
+        app.before_request_funcs.setdefault(None, []).insert(0, start_request_timer)
 
     def init_config(self, app):
         """Initialize configuration."""
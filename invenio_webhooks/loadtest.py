@@ -0,0 +1,248 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Load generator replaying recorded payloads against a receiver.
+
+Payloads are read from NDJSON, one payload per line, or from the stored
+events of the receiver. Each request is signed like the sender would, see
+:func:`get_request_headers`, and sent either to the application in process
+through its test client, see :class:`ClientTarget`, or to a running
+application, see :class:`URLTarget`.
+
+Requests are sent by ``concurrency`` threads at an optional target rate.
+With a rate, the latency of a request runs from its scheduled time, so that
+requests delayed by a saturated server are not left out of the latencies.
+"""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+
+from flask import url_for
+from sqlalchemy.orm import undefer_group
+
+from .models import Event
+from .serializers import current_codec
+from .signatures import get_hmac
+
+
+def load_ndjson(lines):
+    """Return the payloads of NDJSON lines, skipping blank lines."""
+    return [json.loads(line) for line in lines if line.strip()]
+
+
+def load_events(receiver_id, limit=None):
+    """Return the payloads of the stored events of a receiver, oldest first.
+
+    :param limit: Maximum number of payloads.
+    """
+    query = (
+        Event.query.filter_by(receiver_id=receiver_id)
+        .options(undefer_group("payload"))
+        .order_by(Event.created)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return [event.payload for event in query if event.payload is not None]
+
+
+def get_request_headers(receiver, body):
+    """Return the headers of a request delivering a body to a receiver.
+
+    The body is signed with the signing key of ``WEBHOOKS_SECRET_KEY`` if
+    the receiver checks signatures, and each request gets a new delivery id
+    if the receiver deduplicates deliveries.
+    """
+    headers = {"Content-Type": "application/json"}
+    if receiver.signature:
+        digest = getattr(receiver.get_signature_validator(), "digest", "sha1")
+        headers[receiver.signature] = f"{digest}={get_hmac(body, digest)}"
+    if receiver.delivery_header:
+        headers[receiver.delivery_header] = str(uuid.uuid4())
+    return headers
+
+
+def build_requests(receiver, payloads, count=None):
+    """Return the bodies and headers of requests replaying payloads.
+
+    :param count: Number of requests. Payloads are replayed in a loop until
+        it is reached. Defaults to the number of payloads.
+    """
+    codec = current_codec()
+    bodies = [codec.dumps(payload).encode("utf-8") for payload in payloads]
+    count = len(bodies) if count is None else count
+    return [
+        (body, get_request_headers(receiver, body))
+        for body in islice(cycle(bodies), count)
+    ]
+
+
+class ClientTarget:
+    """Target posting events to the application in process.
+
+    Requests go through the views of the application: events are stored in
+    its database and processed by the receiver, like in production. Each
+    thread uses its own test client.
+    """
+
+    def __init__(self, app, receiver_id, access_token):
+        """Initialize target.
+
+        :param access_token: OAuth token with the ``webhooks:event`` scope.
+        """
+        self.app = app
+        self.access_token = access_token
+        with app.test_request_context():
+            self.url = url_for("invenio_webhooks.event_list", receiver_id=receiver_id)
+        self._local = threading.local()
+
+    def post(self, body, headers):
+        """Send a request and return its status code."""
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.post(
+            self.url,
+            data=body,
+            headers={**headers, "Authorization": f"Bearer {self.access_token}"},
+        )
+        return response.status_code
+
+
+class URLTarget:
+    """Target posting events to a running application."""
+
+    def __init__(self, base_url, receiver_id, access_token, timeout=30):
+        """Initialize target.
+
+        :param base_url: URL under which the webhooks blueprint is mounted,
+            e.g. ``https://127.0.0.1:5000/api``.
+        :param access_token: OAuth token with the ``webhooks:event`` scope.
+        :param timeout: Timeout of each request in seconds.
+        """
+        self.url = f"{base_url.rstrip('/')}/hooks/receivers/{receiver_id}/events/"
+        self.access_token = access_token
+        self.timeout = timeout
+
+    def post(self, body, headers):
+        """Send a request and return its status code.
+
+        Returns ``None`` if the request failed without a response.
+        """
+        request = urllib.request.Request(
+            self.url,
+            data=body,
+            headers={**headers, "Authorization": f"Bearer {self.access_token}"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+        except OSError:
+            return None
+
+
+class LoadTestResult:
+    """Status codes and latencies of the requests of a load test."""
+
+    def __init__(self):
+        """Initialize result."""
+        self.latencies = []
+        self.statuses = Counter()
+        self.elapsed = 0
+        self._lock = threading.Lock()
+
+    def add(self, status, latency):
+        """Record a request."""
+        with self._lock:
+            self.latencies.append(latency)
+            self.statuses[status] += 1
+
+    @property
+    def count(self):
+        """Return the number of requests."""
+        return len(self.latencies)
+
+    @property
+    def throughput(self):
+        """Return the number of requests per second."""
+        return self.count / self.elapsed if self.elapsed else 0
+
+    def percentile(self, percent):
+        """Return a latency percentile in seconds, by the nearest rank."""
+        if not self.latencies:
+            return 0
+        latencies = sorted(self.latencies)
+        rank = max(1, -(-len(latencies) * percent // 100))
+        return latencies[int(rank) - 1]
+
+    def histogram(self):
+        """Return the number of requests per latency bucket.
+
+        Buckets double from 1 ms up to the largest latency.
+
+        :returns: List of ``(upper bound in seconds, count)`` tuples.
+        """
+        counts = Counter()
+        for latency in self.latencies:
+            bound = 0.001
+            while latency > bound:
+                bound *= 2
+            counts[bound] += 1
+        if not counts:
+            return []
+        buckets = []
+        bound = 0.001
+        while bound <= max(counts):
+            buckets.append((bound, counts[bound]))
+            bound *= 2
+        return buckets
+
+
+def run_loadtest(target, requests, rate=None, concurrency=1):
+    """Send requests to a target and return their results.
+
+    :param target: Target with a ``post(body, headers)`` method returning
+        the status code, e.g. :class:`ClientTarget`.
+    :param requests: List of ``(body, headers)`` tuples, see
+        :func:`build_requests`.
+    :param rate: Target number of requests per second. Unlimited if
+        ``None``.
+    :param concurrency: Number of threads sending requests.
+    :returns: A :class:`LoadTestResult`.
+    """
+    result = LoadTestResult()
+    indexes = iter(range(len(requests)))
+    lock = threading.Lock()
+    start = time.perf_counter()
+
+    def worker():
+        while True:
+            with lock:
+                index = next(indexes, None)
+            if index is None:
+                return
+            if rate:
+                scheduled = start + index / rate
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                scheduled = time.perf_counter()
+            status = target.post(*requests[index])
+            result.add(status, time.perf_counter() - scheduled)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    result.elapsed = time.perf_counter() - start
+    return result
@@ -0,0 +1,191 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Metrics of the ingestion and processing of webhook events.
+
+The metrics hook configured by ``WEBHOOKS_METRICS`` is called with the
+duration of each stage, labelled by receiver id:
+
+``signature``
+    Signature check of the request.
+``extract_payload``
+    Reading and parsing of the request body, including the signature check.
+``insert``
+    Insert and commit of the event row.
+``dispatch``
+    Call of the receiver by :meth:`~invenio_webhooks.models.Event.process`,
+    i.e. the whole processing of synchronous receivers, or sending the task
+    of Celery receivers.
+``queue_wait``
+    Time between sending the processing task of an event and its start,
+    only recorded on the first attempt of tasks sent by the receivers.
+``run``
+    Processing of an event, or of a batch of events, by a Celery task.
+
+It also counts the 4xx and 5xx responses of the REST API per receiver.
+
+With ``WEBHOOKS_SERVER_TIMING`` enabled, the stages of each request are
+also reported in its ``Server-Timing`` response header, together with the
+``auth`` stage: the ``before_request`` hooks of the application, which
+verify the OAuth token, and the authentication decorators of the view.
+Durations of stages run several times, e.g. per event of a batch, are
+summed.
+"""
+
+import threading
+import time
+import weakref
+from contextlib import contextmanager, nullcontext
+
+from flask import current_app, g, has_request_context
+
+_NULL_TIMER = nullcontext()
+
+
+class Metrics:
+    """Metrics hook discarding all measurements.
+
+    Subclasses implement :meth:`observe` and :meth:`count_response`.
+    """
+
+    def observe(self, stage, receiver_id, seconds):
+        """Record the duration of a stage."""
+
+    def count_response(self, receiver_id, status_code):
+        """Record the status code of a 4xx or 5xx response."""
+
+    def timer(self, stage, receiver_id):
+        """Return a context manager recording the duration of a stage."""
+        return _NULL_TIMER
+
+
+class TimingMetrics(Metrics):
+    """Base class of metrics hooks recording stage durations."""
+
+    @contextmanager
+    def timer(self, stage, receiver_id):
+        """Return a context manager recording the duration of a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, receiver_id, time.perf_counter() - start)
+
+
+class PrometheusMetrics(TimingMetrics):
+    """Metrics hook exporting to ``prometheus_client``.
+
+    Exposes a ``webhooks_stage_duration_seconds`` histogram with ``stage``
+    and ``receiver_id`` labels, and a ``webhooks_error_responses_total``
+    counter with ``receiver_id`` and ``status`` (``4xx`` or ``5xx``) labels.
+    Serve them with the usual ``prometheus_client`` exporters, e.g.
+    ``prometheus_client.start_http_server``.
+    """
+
+    def __init__(self, registry=None, buckets=None):
+        """Initialize metrics.
+
+        Collectors are created once per registry and shared by all instances,
+        e.g. of several applications, since a registry rejects duplicated
+        metric names. The buckets of the first instance are used.
+
+        :param registry: Collector registry. Defaults to the global registry.
+        :param buckets: Histogram buckets in seconds.
+        """
+        from prometheus_client import REGISTRY
+
+        self.durations, self.errors = _get_prometheus_collectors(
+            registry or REGISTRY, buckets
+        )
+
+    def observe(self, stage, receiver_id, seconds):
+        """Record the duration of a stage."""
+        self.durations.labels(stage, receiver_id).observe(seconds)
+
+    def count_response(self, receiver_id, status_code):
+        """Record the status code of a 4xx or 5xx response."""
+        self.errors.labels(receiver_id, f"{status_code // 100}xx").inc()
+
+
+_PROMETHEUS_COLLECTORS = weakref.WeakKeyDictionary()
+"""Prometheus collectors of :class:`PrometheusMetrics` per registry."""
+
+_PROMETHEUS_LOCK = threading.Lock()
+
+
+def _get_prometheus_collectors(registry, buckets=None):
+    """Return the duration histogram and error counter of a registry."""
+    from prometheus_client import Counter, Histogram
+
+    with _PROMETHEUS_LOCK:
+        if registry not in _PROMETHEUS_COLLECTORS:
+            kwargs = {"buckets": buckets} if buckets else {}
+            _PROMETHEUS_COLLECTORS[registry] = (
+                Histogram(
+                    "webhooks_stage_duration_seconds",
+                    "Duration of the stages of webhook event handling.",
+                    ["stage", "receiver_id"],
+                    registry=registry,
+                    **kwargs,
+                ),
+                Counter(
+                    "webhooks_error_responses",
+                    "Error responses of the webhooks REST API.",
+                    ["receiver_id", "status"],
+                    registry=registry,
+                ),
+            )
+        return _PROMETHEUS_COLLECTORS[registry]
+
+
+class ServerTimingMetrics(TimingMetrics):
+    """Metrics hook recording the stages of the current request.
+
+    Measurements are forwarded to another metrics hook.
+    """
+
+    def __init__(self, metrics):
+        """Initialize metrics.
+
+        :param metrics: Metrics hook receiving all measurements.
+        """
+        self.metrics = metrics
+
+    def observe(self, stage, receiver_id, seconds):
+        """Record the duration of a stage."""
+        self.metrics.observe(stage, receiver_id, seconds)
+        record_timing(stage, seconds)
+
+    def count_response(self, receiver_id, status_code):
+        """Record the status code of a 4xx or 5xx response."""
+        self.metrics.count_response(receiver_id, status_code)
+
+
+def start_request_timer():
+    """Mark the start of a request timed in its ``Server-Timing`` header."""
+    if current_app.config["WEBHOOKS_SERVER_TIMING"]:
+        g.webhooks_request_start = time.perf_counter()
+
+
+def record_elapsed(stage):
+    """Record the time elapsed since the start of the request as a stage."""
+    start = g.pop("webhooks_request_start", None)
+    if start is not None:
+        record_timing(stage, time.perf_counter() - start)
+
+
+def record_timing(stage, seconds):
+    """Add the duration of a stage to the timings of the current request."""
+    if has_request_context():
+        timings = g.setdefault("webhooks_timings", {})
+        timings[stage] = timings.get(stage, 0) + seconds
+
+
+def add_server_timing(response):
+    """Add the timings of the current request in a ``Server-Timing`` header."""
+    timings = g.get("webhooks_timings")
+    if timings:
+        response.headers["Server-Timing"] = ", ".join(
+            f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in timings.items()
+        )
+    return response
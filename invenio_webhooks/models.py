@@ -4,24 +4,42 @@
 
 """Models for webhook receivers."""
 
-import re
+import time
 import uuid
+import zlib
+from datetime import datetime, timezone
 from typing import ClassVar
+from urllib.parse import parse_qsl
 
+from celery import current_app as current_celery_app
 from celery import shared_task, states
+from celery.backends.base import KeyValueStoreBackend
+from celery.exceptions import Retry
 from celery.result import AsyncResult
+from celery.utils.time import rate
 from flask import current_app, request, url_for
 from invenio_accounts.models import User
 from invenio_db import db
-from sqlalchemy.dialects import postgresql
-from sqlalchemy.orm import validates
+from sqlalchemy import inspect
+from sqlalchemy.dialects import mysql, postgresql
+from sqlalchemy.orm import deferred, undefer_group, validates
 from sqlalchemy.orm.attributes import flag_modified
 from sqlalchemy_utils import JSONType, UUIDType
+from werkzeug.exceptions import BadRequest
 
 from . import signatures
-from ._compat import delete_cached_json_for
-from .errors import InvalidPayload, InvalidSignature, ReceiverDoesNotExist
+from .errors import (
+    DeliveryConflict,
+    DuplicateDelivery,
+    InvalidPayload,
+    InvalidSignature,
+    PayloadTooLarge,
+    ReceiverDoesNotExist,
+)
 from .proxies import current_webhooks
+from .pubsub import status_channel
+from .serializers import current_codec
+from .utils import Batcher
 
 
 #
@@ -38,6 +56,18 @@ class Receiver:
     signature = ""
     """Default signature."""
 
+    signature_validator = None
+    """Validator of the signature header, resolved at registration."""
+
+    delivery_header = None
+    """Header with the provider delivery id, e.g. ``X-GitHub-Delivery``.
+
+    If set, redeliveries of an already stored delivery are not stored and
+    processed again. Once the payload and its signature are validated, the
+    response points to the original event if it belongs to the same user,
+    and is a ``409 Conflict`` otherwise.
+    """
+
     def __init__(self, receiver_id):
         """Initialize a receiver identifier."""
         self.receiver_id = receiver_id
@@ -50,12 +80,21 @@ class Receiver:
         """Implement method accepting the ``Event`` instance."""
         raise NotImplementedError()
 
+    def run_batch(self, events):
+        """Process a list of events, by default by calling ``run`` on each."""
+        for event in events:
+            self.run(event)
+
     def status(self, event):
         """Return a tuple with current processing status code and message.
 
         Return ``None`` if the backend does not support states.
         """
 
+    def statuses(self, events):
+        """Return the statuses of several events, see :meth:`status`."""
+        return [self.status(event) for event in events]
+
     def delete(self, event):
         """Mark event as deleted."""
         assert self.receiver_id == event.receiver_id
@@ -94,42 +133,303 @@ class Receiver:
     #
     # Instance methods (override if needed)
     #
-    def check_signature(self):
-        """Check signature of signed request."""
+    def check_signature(self, message=None):
+        """Check signature of signed request.
+
+        :param message: Request body, or a
+            :class:`~invenio_webhooks.signatures.SignedMessage` already
+            updated with it. Defaults to ``request.data``.
+        """
         if not self.signature:
             return True
         signature_value = request.headers.get(self.signature, None)
         if signature_value:
-            validator = "check_" + re.sub(r"[-]", "_", self.signature).lower()
-            check_signature = getattr(signatures, validator)
-            if check_signature(signature_value, request.data):
+            if message is None:
+                message = request.data
+            if self.get_signature_validator()(signature_value, message):
                 return True
         return False
 
+    def _verify_signature(self, message=None):
+        """Check the signature, timed as the ``signature`` metrics stage.
+
+        :raises InvalidSignature: If the signature does not match.
+        """
+        with current_webhooks.metrics.timer("signature", self.receiver_id):
+            valid = self.check_signature(message)
+        if not valid:
+            raise InvalidSignature("Invalid Signature")
+
+    def get_signature_validator(self):
+        """Return the validator of the receiver signature header."""
+        if self.signature_validator is None:
+            self.signature_validator = current_webhooks.get_signature_validator(
+                self.signature
+            )
+        return self.signature_validator
+
+    def get_delivery_id(self):
+        """Return the provider delivery id of the request, if any."""
+        if self.delivery_header:
+            return request.headers.get(self.delivery_header)
+
+    def read_body(self):
+        """Read the request body in one pass.
+
+        The body is read from ``request.stream`` in chunks while the signature
+        HMAC and the ``WEBHOOKS_MAX_PAYLOAD_SIZE`` limit are updated.
+
+        :returns: A tuple with the body buffer and the signed message to pass
+            to :meth:`check_signature`. It is ``None`` if the receiver does
+            not check signatures, and the body itself if the validator does
+            not declare a digest.
+        """
+        max_size = current_app.config["WEBHOOKS_MAX_PAYLOAD_SIZE"]
+        chunk_size = current_app.config["WEBHOOKS_STREAM_CHUNK_SIZE"]
+        if max_size is not None and (request.content_length or 0) > max_size:
+            raise PayloadTooLarge(request.content_length)
+
+        signed = None
+        if self.signature:
+            validator = self.get_signature_validator()
+            if getattr(validator, "digest", None):
+                signed = signatures.SignedMessage(validator.digest)
+        body = bytearray()
+        while True:
+            chunk = request.stream.read(chunk_size)
+            if not chunk:
+                break
+            body += chunk
+            if max_size is not None and len(body) > max_size:
+                raise PayloadTooLarge(len(body))
+            if signed is not None:
+                signed.update(chunk)
+        if self.signature and signed is None:
+            signed = body
+        return body, signed
+
     def extract_payload(self):
         """Extract payload from request."""
-        if not self.check_signature():
-            raise InvalidSignature("Invalid Signature")
+        if current_app.config["WEBHOOKS_STREAMING_INGESTION"]:
+            return self._extract_streamed_payload()
+        self._verify_signature()
         if request.is_json:
-            # Request.get_json() could be first called with silent=True.
-            delete_cached_json_for(request)
-            return request.get_json(silent=False, cache=False)
+            return self._decode_json(request.get_data())
         elif request.content_type == "application/x-www-form-urlencoded":
             return dict(request.form)
         raise InvalidPayload(request.content_type)
 
+    def _extract_streamed_payload(self):
+        """Extract payload from a body read by :meth:`read_body`."""
+        if not request.is_json and (
+            request.content_type != "application/x-www-form-urlencoded"
+        ):
+            raise InvalidPayload(request.content_type)
+        body, signed = self.read_body()
+        self._verify_signature(signed)
+        if request.is_json:
+            return self._decode_json(body)
+        charset = request.mimetype_params.get("charset", "utf-8")
+        try:
+            text = body.decode(charset)
+        except ValueError as e:
+            raise BadRequest(f"Failed to decode payload: {e}")
+        payload = {}
+        for key, value in parse_qsl(text, keep_blank_values=True):
+            payload.setdefault(key, value)
+        return payload
+
+    @staticmethod
+    def _decode_json(data):
+        """Decode a JSON body with the configured codec."""
+        try:
+            return current_codec().loads(data)
+        except ValueError as e:
+            raise BadRequest(f"Failed to decode JSON object: {e}")
+
+
+def _flag_response_modified(event):
+    """Flag the loaded response columns of an event as modified in place."""
+    loaded = inspect(event).dict
+    for key in ("response", "response_headers"):
+        if key in loaded:
+            flag_modified(event, key)
+
+
+def _observe_queue_wait(task, receiver_ids, sent_at):
+    """Record the time the events of a task waited in the queue.
+
+    The wait runs from ``sent_at``, the time the task was sent, and is only
+    recorded on the first attempt. Tasks sent without it, e.g. to reprocess
+    events, are not recorded.
+    """
+    if sent_at is None or task.request.retries:
+        return
+    seconds = max(time.time() - sent_at, 0)
+    for receiver_id in receiver_ids:
+        current_webhooks.metrics.observe("queue_wait", receiver_id, seconds)
+
+
+def _load_events(event_ids):
+    """Load events with their payload in a single query.
+
+    Events of the session expired by a commit are refreshed by the same
+    query, instead of one query per event.
+    """
+    return (
+        Event.query.filter(Event.id.in_(event_ids))
+        .options(undefer_group("payload"))
+        .all()
+    )
+
+
+def _check_task_rate_limit(task, receivers):
+    """Retry a task later if the rate limit of one of its receivers is exceeded.
+
+    Each event takes a token from the bucket of its receiver. When a bucket
+    is exceeded, the tokens already taken from the others are given back.
+
+    :param receivers: List of ``(receiver, number of events)`` tuples.
+    """
+    limiter = current_webhooks.rate_limiter
+    acquired = []
+    for receiver, count in receivers:
+        get_task_options = getattr(receiver, "get_task_options", None)
+        limit = get_task_options().get("rate_limit") if get_task_options else None
+        if not limit:
+            continue
+        per_second = rate(limit)
+        bucket = (
+            f"task:{receiver.receiver_id}",
+            per_second,
+            max(per_second, 1, count),
+        )
+        retry_after = limiter.acquire(*bucket, tokens=count)
+        if retry_after:
+            for taken, taken_count in acquired:
+                limiter.release(*taken, tokens=taken_count)
+            raise task.retry(countdown=retry_after, max_retries=None)
+        acquired.append((bucket, count))
+
 
 @shared_task(bind=True, ignore_results=True)
-def process_event(self, event_id):
-    """Process event in Celery."""
-    with db.session.begin_nested():
-        event = Event.query.get(event_id)
-        event._celery_task = self  # internal binding to a Celery task
-        event.receiver.run(event)  # call run directly to avoid circular calls
-        flag_modified(event, "response")
-        flag_modified(event, "response_headers")
-        db.session.add(event)
+def process_event(self, event_id, receiver_id=None, sent_at=None):
+    """Process event in Celery.
+
+    If the receiver tracks task states, the state transitions are written to
+    the event row, see :attr:`CeleryReceiver.task_state_tracking`.
+
+    :param receiver_id: Receiver of the event, used to route the task, see
+        :func:`invenio_webhooks.routing.route_task`.
+    :param sent_at: Time the task was sent, as a POSIX timestamp, from which
+        the ``queue_wait`` stage is measured.
+    """
+    event = Event.query.get(event_id)
+    tracked = getattr(event.receiver, "tracks_task_state", False)
+    if tracked and event.task_state == states.REVOKED:
+        return  # deleted before the revocation reached the worker
+    _check_task_rate_limit(self, [(event.receiver, 1)])
+    _observe_queue_wait(self, [event.receiver_id], sent_at)
+    metrics = current_webhooks.metrics
+    if tracked:
+        event.set_task_state(states.STARTED)
+        db.session.commit()
+    event.publish_status(states.STARTED)
+
+    try:
+        with db.session.begin_nested():
+            event._celery_task = self  # internal binding to a Celery task
+            with metrics.timer("run", event.receiver_id):
+                event.receiver.run(event)  # call run directly to avoid circular calls
+            _flag_response_modified(event)
+            db.session.add(event)
+    except Exception as e:
+        state = states.RETRY if isinstance(e, Retry) else states.FAILURE
+        if tracked:
+            event.set_task_state(state)
+            db.session.commit()
+        event.publish_status(state)
+        raise
+
+    if tracked:
+        event.set_task_state(states.SUCCESS)
     db.session.commit()
+    event.publish_status(states.SUCCESS)
+
+
+@shared_task(bind=True, ignore_results=True)
+def process_events(self, event_ids, receiver_id=None, sent_at=None):
+    """Process a batch of events in Celery.
+
+    All events are loaded with their payload in a single query, reloaded
+    the same way after each commit, and handed to ``run_batch`` of their
+    receivers. The events of each receiver are run in their own
+    savepoint and committed separately, so that a failing receiver does not
+    fail the others. The first error is raised once all receivers ran.
+
+    Tracked events which were revoked are skipped, as well as those which
+    succeeded in an earlier attempt when the task is retried. The task is
+    retried later if the rate limit of one of the receivers is exceeded.
+
+    :param receiver_id: Receiver of the events, used to route the task.
+    :param sent_at: Time the task was sent, see :func:`process_event`.
+    """
+    metrics = current_webhooks.metrics
+    skipped = {states.REVOKED}
+    if self.request.retries:
+        skipped.add(states.SUCCESS)
+    batches = {}
+    for event in _load_events(event_ids):
+        tracked = getattr(event.receiver, "tracks_task_state", False)
+        if tracked and event.task_state in skipped:
+            continue
+        batches.setdefault(event.receiver_id, (tracked, []))[1].append(event)
+    _check_task_rate_limit(
+        self, [(batch[0].receiver, len(batch)) for _, batch in batches.values()]
+    )
+    _observe_queue_wait(
+        self,
+        [event.receiver_id for _, batch in batches.values() for event in batch],
+        sent_at,
+    )
+    # Commits expire the events, which are then reloaded together.
+    remaining_ids = [event.id for _, batch in batches.values() for event in batch]
+
+    if any(tracked for tracked, _ in batches.values()):
+        for tracked, batch in batches.values():
+            for event in batch if tracked else ():
+                event.set_task_state(states.STARTED)
+        db.session.commit()
+        _load_events(remaining_ids)
+    for _, batch in batches.values():
+        for event in batch:
+            event.publish_status(states.STARTED)
+
+    error = None
+    for tracked, batch in batches.values():
+        try:
+            with db.session.begin_nested():
+                for event in batch:
+                    event._celery_task = self
+                with metrics.timer("run", batch[0].receiver_id):
+                    batch[0].receiver.run_batch(batch)
+                for event in batch:
+                    _flag_response_modified(event)
+                    db.session.add(event)
+        except Exception as e:
+            error = error or e
+            state = states.RETRY if isinstance(e, Retry) else states.FAILURE
+        else:
+            state = states.SUCCESS
+        for event in batch if tracked else ():
+            event.set_task_state(state)
+        db.session.commit()
+        _load_events(remaining_ids)
+        remaining_ids = remaining_ids[len(batch) :]
+        for event in batch:
+            event.publish_status(state)
+    if error is not None:
+        raise error
 
 
 class CeleryReceiver(Receiver):
@@ -145,6 +445,7 @@ class CeleryReceiver(Receiver):
         states.RETRY: 202,
         states.FAILURE: 500,
         states.SUCCESS: 201,
+        states.REVOKED: 410,
     }
     """Mapping of Celery result states to HTTP codes."""
 
@@ -154,32 +455,268 @@ class CeleryReceiver(Receiver):
     }
     """Celery states in which the task's status is reported."""
 
+    task_state_tracking = None
+    """Track task states in the event row instead of the result backend.
+
+    ``None`` follows ``WEBHOOKS_TASK_STATE_TRACKING``.
+    """
+
+    celery_queue = None
+    """Celery queue of the processing tasks (``None`` for the default queue)."""
+
+    celery_priority = None
+    """Celery priority of the processing tasks."""
+
+    celery_rate_limit = None
+    """Maximum rate of processing tasks, e.g. ``"10/s"``.
+
+    Tasks over the limit are retried later. The limit applies per worker
+    process, or to all workers with the ``"redis"`` rate limit storage, see
+    ``WEBHOOKS_RATE_LIMIT_STORAGE``.
+    """
+
+    def get_task_options(self):
+        """Return the queue, priority and rate limit of processing tasks.
+
+        Class attributes are overridden by ``WEBHOOKS_CELERY_TASK_OPTIONS``.
+        """
+        options = {
+            "queue": self.celery_queue,
+            "priority": self.celery_priority,
+            "rate_limit": self.celery_rate_limit,
+        }
+        options.update(
+            current_app.config["WEBHOOKS_CELERY_TASK_OPTIONS"].get(self.receiver_id, {})
+        )
+        return options
+
+    def get_apply_options(self):
+        """Return the routing options of ``apply_async`` for processing tasks."""
+        options = self.get_task_options()
+        return {
+            key: options[key]
+            for key in ("queue", "priority")
+            if options.get(key) is not None
+        }
+
+    @property
+    def tracks_task_state(self):
+        """Return if task states are written to the event row."""
+        if self.task_state_tracking is None:
+            return current_app.config["WEBHOOKS_TASK_STATE_TRACKING"]
+        return self.task_state_tracking
+
     def __call__(self, event):
-        """Fire a celery task."""
-        process_event.apply_async(task_id=str(event.id), args=[str(event.id)])
+        """Fire a celery task on the queue of the receiver."""
+        process_event.apply_async(
+            task_id=str(event.id),
+            args=[str(event.id)],
+            kwargs={"receiver_id": self.receiver_id, "sent_at": time.time()},
+            **self.get_apply_options(),
+        )
 
     def status(self, event):
-        """Return a tuple with current processing status code and message."""
+        """Return a tuple with current processing status code and message.
+
+        Statuses are cached in ``WEBHOOKS_STATUS_CACHE`` if configured, for
+        ``WEBHOOKS_STATUS_CACHE_TTL`` seconds while the task is pending or
+        running and ``WEBHOOKS_STATUS_CACHE_TERMINAL_TTL`` seconds once it
+        has finished.
+
+        If task states are tracked in the event row, the status is read from
+        the event without querying the result backend.
+        """
+        if self.tracks_task_state:
+            return (
+                self.CELERY_STATES_TO_HTTP.get(event.task_state or states.PENDING),
+                event.response.get("message"),
+            )
+
+        cache = current_webhooks.status_cache
+        if cache is not None:
+            status = cache.get(self._status_cache_key(event))
+            if status is not None:
+                return tuple(status)
+
         result = AsyncResult(str(event.id))
-        return (
-            self.CELERY_STATES_TO_HTTP.get(result.state),
+        return self._cache_status(event, result.state, result.info)
+
+    def statuses(self, events):
+        """Return the statuses of several events.
+
+        Cached statuses are read at once, and the task states which are not
+        cached are fetched with a single read from key-value result
+        backends, e.g. ``MGET`` on Redis.
+        """
+        if self.tracks_task_state:
+            return [self.status(event) for event in events]
+
+        cache = current_webhooks.status_cache
+        statuses = [None] * len(events)
+        if cache is not None:
+            cached = cache.get_many(*(self._status_cache_key(e) for e in events))
+            statuses = [tuple(status) if status else None for status in cached]
+
+        missing = [i for i, status in enumerate(statuses) if status is None]
+        task_states = self._get_task_states([str(events[i].id) for i in missing])
+        for i, (state, info) in zip(missing, task_states):
+            statuses[i] = self._cache_status(events[i], state, info)
+        return statuses
+
+    @staticmethod
+    def _get_task_states(task_ids):
+        """Return the state and info of several tasks.
+
+        Key-value result backends are read with one request, other backends
+        once per task.
+        """
+        backend = current_celery_app.backend
+        if not task_ids:
+            return []
+        if not isinstance(backend, KeyValueStoreBackend):
+            results = [AsyncResult(task_id) for task_id in task_ids]
+            return [(result.state, result.info) for result in results]
+
+        keys = [backend.get_key_for_task(task_id) for task_id in task_ids]
+        values = backend.mget(keys)
+        if hasattr(values, "get"):
+            values = [values.get(key) for key in keys]
+        task_states = []
+        for value in values:
+            if value is None:
+                task_states.append((states.PENDING, None))
+            else:
+                meta = backend.decode_result(value)
+                task_states.append((meta["status"], meta["result"]))
+        return task_states
+
+    def _cache_status(self, event, state, info):
+        """Return the status of an event for a task state, and cache it."""
+        status = (
+            self.CELERY_STATES_TO_HTTP.get(state),
             (
-                result.info.get("message")
-                if result.state in self.CELERY_RESULT_INFO_FOR and result.info
+                info.get("message")
+                if state in self.CELERY_RESULT_INFO_FOR and isinstance(info, dict)
                 else event.response.get("message")
             ),
         )
 
+        cache = current_webhooks.status_cache
+        if state in states.READY_STATES:
+            timeout = current_app.config["WEBHOOKS_STATUS_CACHE_TERMINAL_TTL"]
+        else:
+            timeout = current_app.config["WEBHOOKS_STATUS_CACHE_TTL"]
+        if cache is not None and timeout:
+            cache.set(self._status_cache_key(event), status, timeout=timeout)
+        return status
+
+    @staticmethod
+    def _status_cache_key(event):
+        """Return the status cache key of an event."""
+        return f"webhooks:status:{event.id}"
+
     def delete(self, event):
-        """Abort running task if it exists."""
+        """Abort running task if it exists.
+
+        If task states are tracked, the event is marked as revoked.
+        """
         super().delete(event)
+        if self.tracks_task_state:
+            event.set_task_state(states.REVOKED)
         AsyncResult(event.id).revoke(terminate=True)
+        cache = current_webhooks.status_cache
+        if cache is not None:
+            cache.delete(self._status_cache_key(event))
+
+    def forget_status(self, event):
+        """Discard the task result and the cached status of an event.
+
+        Used before processing the event again with a task of the same id,
+        so that its status does not report the previous task meanwhile.
+        """
+        try:
+            AsyncResult(str(event.id)).forget()
+        except NotImplementedError:
+            # The result backend does not support deleting results.
+            pass
+        cache = current_webhooks.status_cache
+        if cache is not None:
+            cache.delete(self._status_cache_key(event))
+
+
+class BatchingCeleryReceiver(CeleryReceiver):
+    """Asynchronous receiver processing events in micro-batches.
+
+    Event ids are collected in the web process and sent to a single
+    :func:`process_events` task once ``batch_size`` events have been
+    collected or ``batch_window`` seconds have passed. Since several events
+    share one task, task states are always tracked in the event rows.
+
+    Pending batches are kept in the memory of the web process, see
+    :class:`invenio_webhooks.utils.Batcher`. Events of a batch lost when the
+    process is killed remain pending and can be sent again with
+    ``invenio webhooks reprocess``.
+    """
+
+    batch_size = 100
+    """Maximum number of events per task."""
+
+    batch_window = 0.05
+    """Maximum time in seconds an event waits before its batch is sent."""
+
+    task_state_tracking = True
+
+    def __init__(self, receiver_id):
+        """Initialize receiver and its batcher."""
+        super().__init__(receiver_id)
+        self.batcher = Batcher(
+            self.send_batch, max_size=self.batch_size, window=self.batch_window
+        )
+
+    def __call__(self, event):
+        """Add the event to the current batch."""
+        self.batcher.add(str(event.id))
+
+    def send_batch(self, event_ids):
+        """Fire a celery task for a batch of events."""
+        process_events.apply_async(
+            args=[event_ids],
+            kwargs={"receiver_id": self.receiver_id, "sent_at": time.time()},
+            **self.get_apply_options(),
+        )
+
+    def delete(self, event):
+        """Mark the event as revoked.
+
+        The task of the event is shared with other events and is not revoked,
+        :func:`process_events` skips revoked events instead.
+        """
+        Receiver.delete(self, event)
+        event.set_task_state(states.REVOKED)
+
+
+class _JSONType(JSONType):
+    """JSON type serialized with the configured JSON codec."""
+
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        """Serialize value."""
+        if value is not None:
+            value = current_codec().dumps(value)
+        return value
+
+    def process_result_value(self, value, dialect):
+        """Deserialize value."""
+        if value is not None:
+            value = current_codec().loads(value)
+        return value
 
 
 def _json_column(**kwargs):
     """Return JSON column."""
     return db.Column(
-        JSONType().with_variant(
+        _JSONType().with_variant(
             postgresql.JSON(none_as_null=True),
             "postgresql",
         ),
@@ -188,13 +725,63 @@ def _json_column(**kwargs):
     )
 
 
+ZLIB_HEADER = b"x"
+"""First byte of zlib streams, which no JSON document starts with."""
+
+
+class _PayloadType(db.TypeDecorator):
+    """JSON payload stored as bytes, compressed above a threshold.
+
+    Payloads whose JSON encoding is at least
+    ``WEBHOOKS_PAYLOAD_COMPRESSION_THRESHOLD`` bytes are compressed with
+    zlib. Compressed values are recognized by their zlib header when read.
+    """
+
+    impl = db.LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        """Use ``LONGBLOB`` on MySQL, whose ``BLOB`` holds only 64 KiB."""
+        if dialect.name == "mysql":
+            return dialect.type_descriptor(mysql.LONGBLOB())
+        return dialect.type_descriptor(db.LargeBinary())
+
+    def process_bind_param(self, value, dialect):
+        """Serialize and compress value."""
+        if value is None:
+            return None
+        data = current_codec().dumps(value).encode("utf-8")
+        threshold = current_app.config["WEBHOOKS_PAYLOAD_COMPRESSION_THRESHOLD"]
+        if threshold is not None and len(data) >= threshold:
+            data = zlib.compress(
+                data, current_app.config["WEBHOOKS_PAYLOAD_COMPRESSION_LEVEL"]
+            )
+        return data
+
+    def process_result_value(self, value, dialect):
+        """Decompress and deserialize value."""
+        if value is None:
+            return None
+        value = bytes(value)
+        if value[:1] == ZLIB_HEADER:
+            value = zlib.decompress(value)
+        return current_codec().loads(value)
+
+
 class Event(db.Model, db.Timestamp):
     """Incoming webhook event data.
 
     Represents webhook event data which consists of a payload and a user id.
+    The payload, its headers and the response headers are deferred: they are
+    only loaded, and large payloads decompressed, when accessed.
     """
 
     __tablename__ = "webhooks_events"
+    __table_args__ = (
+        db.Index(
+            "ix_webhooks_events_listing", "receiver_id", "user_id", "created", "id"
+        ),
+    )
 
     id = db.Column(
         UUIDType,
@@ -213,20 +800,43 @@ class Event(db.Model, db.Timestamp):
     )
     """User identifier."""
 
-    payload = _json_column()
-    """Store payload in JSON format."""
+    payload = deferred(db.Column(_PayloadType, nullable=True), group="payload")
+    """Store payload as JSON, compressed if large, see :class:`_PayloadType`."""
 
-    payload_headers = _json_column()
+    payload_headers = deferred(_json_column(), group="payload")
     """Store payload headers in JSON format."""
 
     response = _json_column(default=lambda: {"status": 202, "message": "Accepted."})
     """Store response in JSON format."""
 
-    response_headers = _json_column()
+    response_headers = deferred(_json_column())
     """Store response headers in JSON format."""
 
     response_code = db.Column(db.Integer, default=202)
 
+    delivery_id = db.Column(db.String(255), nullable=True)
+    """Provider delivery identifier, unique per receiver, see :attr:`delivery`."""
+
+    delivery = db.relationship(
+        "EventDelivery",
+        primaryjoin="Event.id == foreign(EventDelivery.event_id)",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
+    """Delivery of the event, which enforces unique delivery identifiers."""
+
+    task_state = db.Column(db.String(16), nullable=True)
+    """Celery state of the processing task, if tracked in the event row.
+
+    An event without task state is queued since its creation.
+    """
+
+    task_started = db.Column(db.UTCDateTime, nullable=True)
+    """Time the processing task last started."""
+
+    task_finished = db.Column(db.UTCDateTime, nullable=True)
+    """Time the processing task succeeded or failed."""
+
     @validates("receiver_id")
     def validate_receiver(self, key, value):
         """Validate receiver identifier."""
@@ -236,11 +846,47 @@ class Event(db.Model, db.Timestamp):
 
     @classmethod
     def create(cls, receiver_id, user_id=None):
-        """Create an event instance."""
+        """Create an event instance.
+
+        :raises DuplicateDelivery: If the delivery of the request was
+            recently stored as another event.
+        """
         event = cls(id=uuid.uuid4(), receiver_id=receiver_id, user_id=user_id)
-        event.payload = event.receiver.extract_payload()
+        with current_webhooks.metrics.timer("extract_payload", receiver_id):
+            event.payload = event.receiver.extract_payload()
+        # Only signed requests may learn about the events of a delivery.
+        event.delivery_id = event.receiver.get_delivery_id()
+        if event.delivery_id:
+            original_id = current_webhooks.delivery_cache.get(
+                (receiver_id, user_id, event.delivery_id)
+            )
+            if original_id is not None:
+                raise DuplicateDelivery(receiver_id, original_id)
+            event.delivery = EventDelivery(
+                receiver_id=receiver_id, delivery_id=event.delivery_id, user_id=user_id
+            )
         return event
 
+    @classmethod
+    def get_delivery_event_id(cls, receiver_id, delivery_id, user_id=None):
+        """Return the id of the event stored for a delivery, if any.
+
+        :raises DeliveryConflict: If the delivery was stored for another user.
+        """
+        delivery = db.session.get(EventDelivery, (receiver_id, delivery_id))
+        if delivery is None:
+            return None
+        if delivery.user_id != user_id:
+            raise DeliveryConflict(receiver_id)
+        return delivery.event_id
+
+    def remember_delivery(self):
+        """Remember the delivery of a stored event to reject redeliveries."""
+        if self.delivery_id:
+            current_webhooks.delivery_cache.set(
+                (self.receiver_id, self.user_id, self.delivery_id), self.id
+            )
+
     @property
     def receiver(self):
         """Return registered receiver."""
@@ -258,7 +904,8 @@ class Event(db.Model, db.Timestamp):
     def process(self):
         """Process current event."""
         try:
-            self.receiver(self)
+            with current_webhooks.metrics.timer("dispatch", self.receiver_id):
+                self.receiver(self)
         except Exception:
             current_app.logger.exception("Could not process event.")
             raise
@@ -270,6 +917,97 @@ class Event(db.Model, db.Timestamp):
         status = self.receiver.status(self)
         return status if status else (self.response_code, self.response.get("message"))
 
+    @staticmethod
+    def get_statuses(events):
+        """Return the statuses of several events, by event.
+
+        Statuses are requested from each receiver once for all its events,
+        see :meth:`Receiver.statuses`.
+        """
+        by_receiver = {}
+        for event in events:
+            by_receiver.setdefault(event.receiver_id, []).append(event)
+        statuses = {}
+        for receiver_id, receiver_events in by_receiver.items():
+            receiver = current_webhooks.receivers[receiver_id]
+            for event, status in zip(
+                receiver_events, receiver.statuses(receiver_events)
+            ):
+                statuses[event] = (
+                    status
+                    if status
+                    else (event.response_code, event.response.get("message"))
+                )
+        return statuses
+
+    def set_task_state(self, state):
+        """Set the Celery state of the processing task and its timestamps."""
+        now = datetime.now(tz=timezone.utc)
+        self.task_state = state
+        if state == states.STARTED:
+            self.task_started = now
+            self.task_finished = None
+        elif state in states.READY_STATES:
+            self.task_finished = now
+
+    def publish_status(self, state):
+        """Publish a task state transition to ``WEBHOOKS_STATUS_BROKER``.
+
+        Clients waiting for status changes of the event are notified with
+        the Celery state, the HTTP status code and the response message.
+        """
+        broker = current_webhooks.status_broker
+        if broker is None:
+            return
+        http_states = getattr(
+            self.receiver, "CELERY_STATES_TO_HTTP", CeleryReceiver.CELERY_STATES_TO_HTTP
+        )
+        broker.publish(
+            status_channel(self.id),
+            {
+                "event_id": str(self.id),
+                "state": state,
+                "status": http_states.get(state),
+                "message": self.response.get("message"),
+            },
+        )
+
     def delete(self):
         """Make receiver delete this event."""
         self.receiver.delete(self)
+
+
+class EventDelivery(db.Model):
+    """Delivery identifier of a stored event.
+
+    Deliveries are kept in their own table, which is never partitioned, so
+    that the database rejects a redelivery whenever the original event was
+    stored, see :mod:`invenio_webhooks.partitions`. Rows are deleted with
+    their events.
+    """
+
+    __tablename__ = "webhooks_event_deliveries"
+
+    receiver_id = db.Column(db.String(255), primary_key=True)
+    """Receiver identifier."""
+
+    delivery_id = db.Column(db.String(255), primary_key=True)
+    """Provider delivery identifier."""
+
+    event_id = db.Column(UUIDType, nullable=False)
+    """Identifier of the event stored for the delivery.
+
+    It is not a foreign key, since the primary key of a partitioned events
+    table also contains the creation date.
+    """
+
+    user_id = db.Column(db.Integer, nullable=True)
+    """User who sent the delivery."""
+
+    created = db.Column(
+        db.UTCDateTime,
+        default=lambda: datetime.now(tz=timezone.utc),
+        nullable=False,
+        index=True,
+    )
+    """Time the delivery was stored, used to delete expired deliveries."""
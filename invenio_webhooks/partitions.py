@@ -0,0 +1,290 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Monthly range partitioning of the events table on PostgreSQL.
+
+When ``WEBHOOKS_EVENTS_PARTITIONING`` is enabled, ``invenio webhooks
+partitions`` converts the ``webhooks_events`` table into a table
+range-partitioned by the month of ``created``. Expired months are then
+removed by dropping their partition instead of deleting rows, see
+:func:`drop_partitions`.
+
+PostgreSQL requires the partition key in every unique constraint, so on a
+partitioned table the primary key is ``(id, created)``, while the
+:class:`~invenio_webhooks.models.Event` model still declares ``id`` alone.
+Event ids are random UUIDs, so they stay unique in practice. Delivery ids
+are kept unique by the ``webhooks_event_deliveries`` table, which is not
+partitioned, see :class:`~invenio_webhooks.models.EventDelivery`.
+
+On other databases the table is not partitioned and all functions of this
+module are no-ops.
+"""
+
+import re
+from datetime import datetime, timezone
+
+from flask import current_app
+from invenio_db import db
+from sqlalchemy import text
+
+TABLE = "webhooks_events"
+"""Name of the partitioned table."""
+
+DEFAULT_PARTITION = TABLE + "_default"
+"""Partition receiving events outside of all monthly partitions."""
+
+DELIVERIES_TABLE = "webhooks_event_deliveries"
+"""Name of the table of delivery ids, which is not partitioned."""
+
+_PARTITION_RE = re.compile(r"^" + TABLE + r"_p(\d{4})(\d{2})$")
+
+
+def _naive_utc(dt):
+    """Return a date as naive UTC datetime, as stored in the database."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def month_start(dt):
+    """Return the first day of the month of a date, as naive UTC datetime."""
+    dt = _naive_utc(dt)
+    return datetime(dt.year, dt.month, 1)
+
+
+def add_months(month, months):
+    """Return the first day of the month a number of months after another."""
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    """Return the name of the partition of a month."""
+    return f"{TABLE}_p{month:%Y%m}"
+
+
+def is_supported(connection=None):
+    """Check if the database supports partitioning of the events table."""
+    connection = connection or db.session.connection()
+    return connection.dialect.name == "postgresql"
+
+
+def is_partitioned(connection=None):
+    """Check if the events table is partitioned."""
+    connection = connection or db.session.connection()
+    if not is_supported(connection):
+        return False
+    return (
+        connection.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table "
+                "WHERE partrelid = to_regclass(:table)"
+            ),
+            {"table": TABLE},
+        ).scalar()
+        is not None
+    )
+
+
+def get_partitions(connection=None):
+    """Return the monthly partitions of the events table.
+
+    :returns: Dictionary of the first day of the month by partition name.
+    """
+    connection = connection or db.session.connection()
+    if not is_partitioned(connection):
+        return {}
+    names = connection.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table)"
+        ),
+        {"table": TABLE},
+    ).scalars()
+    partitions = {}
+    for name in names:
+        match = _PARTITION_RE.match(name)
+        if match:
+            partitions[name] = datetime(int(match.group(1)), int(match.group(2)), 1)
+    return partitions
+
+
+def _create_partition(connection, month, table=TABLE):
+    """Create the partition of a month."""
+    connection.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+            f"PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()}') "
+            f"TO ('{add_months(month, 1).isoformat()}')"
+        )
+    )
+
+
+def create_partitions(months_ahead=None, now=None, connection=None):
+    """Create the partitions of the current month and the following months.
+
+    Partitions must exist before events of their month arrive, otherwise the
+    events are stored in the default partition, which then prevents the
+    creation of the partition of their month.
+
+    :param months_ahead: Number of months to create after the current one.
+        Defaults to ``WEBHOOKS_EVENTS_PARTITIONS_AHEAD``.
+    :param now: Current date.
+    :returns: Names of the created partitions.
+    """
+    connection = connection or db.session.connection()
+    if not is_partitioned(connection):
+        return []
+    if months_ahead is None:
+        months_ahead = current_app.config["WEBHOOKS_EVENTS_PARTITIONS_AHEAD"]
+    existing = get_partitions(connection)
+    current = month_start(now or datetime.now(tz=timezone.utc))
+    created = []
+    for months in range(months_ahead + 1):
+        month = add_months(current, months)
+        if partition_name(month) not in existing:
+            _create_partition(connection, month)
+            created.append(partition_name(month))
+    return created
+
+
+def get_partition_cutoff(now=None):
+    """Return the date before which events of all receivers have expired.
+
+    It is the longest retention period of ``WEBHOOKS_EVENTS_RETENTION`` and
+    ``WEBHOOKS_EVENTS_RETENTION_DEFAULT``, or ``None`` if some events are
+    kept forever. Shorter retention periods are enforced by purging rows.
+    """
+    default = current_app.config["WEBHOOKS_EVENTS_RETENTION_DEFAULT"]
+    periods = [default, *current_app.config["WEBHOOKS_EVENTS_RETENTION"].values()]
+    if any(period is None for period in periods):
+        return None
+    return (now or datetime.now(tz=timezone.utc)) - max(periods)
+
+
+def drop_partitions(before, connection=None):
+    """Drop the partitions of the months which ended before a date.
+
+    Dropping a partition takes the same time whatever the number of events
+    it holds. The delivery ids of the dropped months are deleted by a range
+    scan of the index on their creation date, they are small rows without
+    payload.
+
+    :param before: Drop partitions whose events were all created before this
+        date.
+    :returns: Names of the dropped partitions.
+    """
+    connection = connection or db.session.connection()
+    before = _naive_utc(before)
+    dropped = []
+    end = None
+    for name, month in sorted(get_partitions(connection).items()):
+        if add_months(month, 1) > before:
+            continue
+        connection.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+        end = add_months(month, 1)
+    if end is not None:
+        # Deliveries are created right after their event, so the deliveries
+        # of events of the following months are kept.
+        connection.execute(
+            text(f"DELETE FROM {DELIVERIES_TABLE} WHERE created < :end"),
+            {"end": end},
+        )
+    return dropped
+
+
+def _get_constraints(connection, table, types):
+    """Return the name and definition of constraints of a table."""
+    return connection.execute(
+        text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(:table) AND contype::text = ANY(:types) "
+            "ORDER BY conname"
+        ),
+        {"table": table, "types": list(types)},
+    ).all()
+
+
+def _rebuild_table(connection, partitioned, months_ahead=0, now=None):
+    """Copy the events table into a new, (un)partitioned table.
+
+    Secondary indexes and constraints keep their names and definitions.
+    Unique constraints gain or lose the partition key.
+    """
+    new_table = TABLE + "_rebuild"
+    constraints = _get_constraints(connection, TABLE, ["p", "u", "f"])
+    indexes = connection.execute(
+        text(
+            "SELECT indexdef FROM pg_indexes "
+            "WHERE tablename = :table AND indexname NOT IN ("
+            "  SELECT conname FROM pg_constraint "
+            "  WHERE conrelid = to_regclass(:table)"
+            ")"
+        ),
+        {"table": TABLE},
+    ).scalars()
+    indexes = list(indexes)
+
+    connection.execute(
+        text(
+            f"CREATE TABLE {new_table} (LIKE {TABLE} INCLUDING DEFAULTS)"
+            + (" PARTITION BY RANGE (created)" if partitioned else "")
+        )
+    )
+    if partitioned:
+        connection.execute(
+            text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {new_table} DEFAULT")
+        )
+        first = connection.execute(text(f"SELECT min(created) FROM {TABLE}")).scalar()
+        current = month_start(now or datetime.now(tz=timezone.utc))
+        month = month_start(first) if first else current
+        while month <= add_months(current, months_ahead):
+            _create_partition(connection, month, table=new_table)
+            month = add_months(month, 1)
+    connection.execute(text(f"INSERT INTO {new_table} SELECT * FROM {TABLE}"))
+    connection.execute(text(f"DROP TABLE {TABLE}"))
+    connection.execute(text(f"ALTER TABLE {new_table} RENAME TO {TABLE}"))
+
+    for name, definition in constraints:
+        if definition.startswith(("PRIMARY KEY", "UNIQUE")):
+            definition = re.sub(r", created\)$", ")", definition)
+            if partitioned:
+                definition = definition[:-1] + ", created)"
+        connection.execute(
+            text(f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}")
+        )
+    for definition in indexes:
+        connection.execute(text(definition))
+
+
+def partition_events_table(connection, months_ahead=None, now=None):
+    """Convert the events table into a table partitioned by month.
+
+    All events are copied, so the table is locked for the duration of the
+    conversion. Does nothing if the database does not support partitioning
+    or if the table is already partitioned.
+
+    :param months_ahead: Number of months after the current one to create
+        partitions for. Defaults to ``WEBHOOKS_EVENTS_PARTITIONS_AHEAD``.
+    :returns: ``True`` if the table has been converted.
+    """
+    if not is_supported(connection) or is_partitioned(connection):
+        return False
+    if months_ahead is None:
+        months_ahead = current_app.config["WEBHOOKS_EVENTS_PARTITIONS_AHEAD"]
+    _rebuild_table(connection, True, months_ahead=months_ahead, now=now)
+    return True
+
+
+def unpartition_events_table(connection):
+    """Convert a partitioned events table back into a single table.
+
+    :returns: ``True`` if the table has been converted.
+    """
+    if not is_partitioned(connection):
+        return False
+    _rebuild_table(connection, False)
+    return True
@@ -0,0 +1,144 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Publish/subscribe brokers for task state transitions of events.
+
+Brokers implement ``publish(channel, message)`` and ``subscribe(channel)``.
+A subscription returns the next message with ``get(timeout)``, or ``None``
+if no message arrived in time, and is released with ``close()``. Messages
+are dictionaries which can be serialized as JSON.
+"""
+
+import queue
+import threading
+import time
+from collections import defaultdict
+
+from .serializers import current_codec
+
+
+def status_channel(event_id):
+    """Return the channel of the task state transitions of an event."""
+    return f"webhooks:events:{event_id}"
+
+
+class Subscription:
+    """Subscription to the channel of an in-process broker."""
+
+    def __init__(self, broker, channel):
+        """Initialize subscription."""
+        self._broker = broker
+        self.channel = channel
+        self.queue = queue.SimpleQueue()
+
+    def get(self, timeout=None):
+        """Return the next message, or ``None`` after ``timeout`` seconds."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        """Stop receiving messages."""
+        self._broker.unsubscribe(self)
+
+    def __enter__(self):
+        """Return the subscription."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the subscription."""
+        self.close()
+
+
+class LocalBroker:
+    """Broker delivering messages to subscribers of the same process.
+
+    It only reaches clients waiting in the process running the tasks, e.g.
+    with eager or threaded Celery workers. Use :class:`RedisBroker` when
+    web and worker processes are separate.
+    """
+
+    def __init__(self):
+        """Initialize broker."""
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def publish(self, channel, message):
+        """Send a message to all subscribers of a channel."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.queue.put(message)
+
+    def subscribe(self, channel):
+        """Return a new subscription to a channel."""
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a subscription."""
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+
+class RedisSubscription:
+    """Subscription to a Redis channel."""
+
+    def __init__(self, pubsub, channel):
+        """Initialize subscription."""
+        self._pubsub = pubsub
+        self.channel = channel
+        pubsub.subscribe(channel)
+
+    def get(self, timeout=None):
+        """Return the next message, or ``None`` after ``timeout`` seconds."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            message = self._pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=remaining
+            )
+            if message is not None:
+                return current_codec().loads(message["data"])
+
+    def close(self):
+        """Stop receiving messages."""
+        self._pubsub.close()
+
+    def __enter__(self):
+        """Return the subscription."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the subscription."""
+        self.close()
+
+
+class RedisBroker:
+    """Broker based on Redis publish/subscribe."""
+
+    def __init__(self, url):
+        """Initialize broker.
+
+        :param url: Redis URL, e.g. ``redis://localhost:6379/0``.
+        """
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, channel, message):
+        """Send a message to all subscribers of a channel."""
+        self._client.publish(channel, current_codec().dumps(message))
+
+    def subscribe(self, channel):
+        """Return a new subscription to a channel."""
+        return RedisSubscription(self._client.pubsub(), channel)
@@ -0,0 +1,215 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Admission control for incoming webhook events.
+
+Requests are admitted by per-receiver and per-user token buckets, see
+``WEBHOOKS_RATE_LIMITS`` and ``WEBHOOKS_USER_RATE_LIMIT``, and by the depth
+of the Celery queue, see ``WEBHOOKS_MAX_QUEUE_DEPTH``.
+
+Limiters implement ``acquire(key, rate, burst, tokens=1)``, which takes
+tokens from the bucket ``key`` refilled with ``rate`` tokens per second up to
+``burst`` tokens, and returns ``0`` if the tokens were available or the
+number of seconds until they are. ``release(key, rate, burst, tokens=1)``
+gives back tokens taken from a bucket, e.g. when another bucket rejected the
+request.
+"""
+
+import threading
+import time
+
+from celery import current_app as current_celery_app
+from flask import current_app
+
+from .errors import QueueBacklogExceeded, RateLimitExceeded
+from .proxies import current_webhooks
+from .utils import TTLCache
+
+
+class TokenBucketLimiter:
+    """Token buckets held in process.
+
+    Full buckets expire, so that only buckets in use are kept.
+    """
+
+    def __init__(self, maxsize=10000):
+        """Initialize limiter.
+
+        :param maxsize: Maximum number of buckets.
+        """
+        self._buckets = TTLCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def acquire(self, key, rate, burst, tokens=1):
+        """Take tokens, or return the number of seconds until they are available."""
+        count = tokens
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key) or (burst, now)
+            tokens = min(burst, tokens + (now - last) * rate)
+            if tokens >= count:
+                tokens -= count
+                retry_after = 0
+            else:
+                retry_after = (count - tokens) / rate
+            self._buckets.set(key, (tokens, now), timeout=(burst - tokens) / rate)
+        return retry_after
+
+    def release(self, key, rate, burst, tokens=1):
+        """Give back tokens taken by :meth:`acquire`."""
+        count = tokens
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return
+            tokens, last = bucket
+            tokens = min(burst, tokens + (now - last) * rate) + count
+            if tokens >= burst:
+                self._buckets.delete(key)
+            else:
+                self._buckets.set(key, (tokens, now), timeout=(burst - tokens) / rate)
+
+
+class RedisTokenBucketLimiter:
+    """Token buckets shared between processes in Redis."""
+
+    SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local count = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local last = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + (now - last) * rate)
+local retry_after = 0
+if tokens >= count then
+  tokens = tokens - count
+else
+  retry_after = (count - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((burst - tokens) / rate * 1000) + 1000)
+return tostring(retry_after)
+"""
+    """Lua script updating a bucket atomically."""
+
+    RELEASE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local count = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+if not bucket[1] then
+  return 0
+end
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local tokens = tonumber(bucket[1])
+tokens = math.min(burst, tokens + (now - tonumber(bucket[2])) * rate) + count
+if tokens >= burst then
+  redis.call('DEL', KEYS[1])
+  return 0
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((burst - tokens) / rate * 1000) + 1000)
+return 0
+"""
+    """Lua script giving back tokens atomically."""
+
+    def __init__(self, url, prefix="webhooks:ratelimit:"):
+        """Initialize limiter.
+
+        :param url: Redis URL, e.g. ``redis://localhost:6379/0``.
+        :param prefix: Prefix of the bucket keys.
+        """
+        import redis
+
+        self.prefix = prefix
+        client = redis.Redis.from_url(url)
+        self._script = client.register_script(self.SCRIPT)
+        self._release_script = client.register_script(self.RELEASE_SCRIPT)
+
+    def acquire(self, key, rate, burst, tokens=1):
+        """Take tokens, or return the number of seconds until they are available."""
+        return float(self._script(keys=[self.prefix + key], args=[rate, burst, tokens]))
+
+    def release(self, key, rate, burst, tokens=1):
+        """Give back tokens taken by :meth:`acquire`."""
+        self._release_script(keys=[self.prefix + key], args=[rate, burst, tokens])
+
+
+def check_rate_limits(receiver_id, user_id=None):
+    """Take a token from the buckets of a receiver and a user.
+
+    If a bucket is empty, the tokens already taken from the other buckets
+    are given back, so that rejected requests do not count.
+
+    :raises RateLimitExceeded: If a bucket is empty.
+    """
+    config = current_app.config
+    limits = []
+    user_limit = config["WEBHOOKS_USER_RATE_LIMIT"]
+    if user_limit and user_id is not None:
+        limits.append((f"user:{user_id}", user_limit))
+    receiver_limit = config["WEBHOOKS_RATE_LIMITS"].get(
+        receiver_id, config["WEBHOOKS_RATE_LIMIT_DEFAULT"]
+    )
+    if receiver_limit:
+        limits.append((f"receiver:{receiver_id}", receiver_limit))
+
+    limiter = current_webhooks.rate_limiter
+    acquired = []
+    for key, (rate, burst) in limits:
+        retry_after = limiter.acquire(key, rate, burst)
+        if retry_after:
+            for args in acquired:
+                limiter.release(*args)
+            raise RateLimitExceeded(retry_after)
+        acquired.append((key, rate, burst))
+
+
+def get_queue_depth(queue):
+    """Return the number of messages waiting in a Celery queue.
+
+    Returns ``0`` if the broker can not be queried.
+    """
+    try:
+        with current_celery_app.connection_for_read() as connection:
+            return connection.default_channel.queue_declare(
+                queue=queue, passive=True
+            ).message_count
+    except Exception:
+        current_app.logger.warning("Could not read depth of queue %s.", queue)
+        return 0
+
+
+def check_queue_depth(receiver):
+    """Reject new events while the Celery queue of a receiver is backlogged.
+
+    The queue depth is read at most once every
+    ``WEBHOOKS_QUEUE_DEPTH_CACHE_TTL`` seconds.
+
+    :raises QueueBacklogExceeded: If the queue holds more than
+        ``WEBHOOKS_MAX_QUEUE_DEPTH`` messages.
+    """
+    from .models import CeleryReceiver
+
+    max_depth = current_app.config["WEBHOOKS_MAX_QUEUE_DEPTH"]
+    if max_depth is None or not isinstance(receiver, CeleryReceiver):
+        return
+
+    queue = (
+        receiver.get_task_options()["queue"]
+        or current_celery_app.conf.task_default_queue
+    )
+    cache = current_webhooks.queue_depth_cache
+    timeout = current_app.config["WEBHOOKS_QUEUE_DEPTH_CACHE_TTL"]
+    depth = cache.get(queue) if timeout else None
+    if depth is None:
+        depth = get_queue_depth(queue)
+        if timeout:
+            cache.set(queue, depth, timeout=timeout)
+    if depth > max_depth:
+        raise QueueBacklogExceeded(current_app.config["WEBHOOKS_QUEUE_RETRY_AFTER"])
@@ -0,0 +1,95 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Celery routing of event processing tasks per receiver.
+
+Celery receivers declare the queue and priority of their tasks, see
+:meth:`~invenio_webhooks.models.CeleryReceiver.get_task_options`. Tasks
+fired by the receivers are sent accordingly. The router of
+:func:`get_task_routes` applies the same queues to processing tasks sent by
+other code, e.g.:
+
+.. code-block:: python
+
+    from invenio_webhooks.routing import get_task_routes
+
+    CELERY_TASK_ROUTES = get_task_routes()
+
+Workers then consume the queues of :func:`get_task_queues`, e.g. with a
+dedicated worker for latency-sensitive receivers started with
+``celery worker -Q webhooks-github``.
+"""
+
+from flask import current_app
+from kombu import Queue
+
+from .proxies import current_webhooks
+
+ROUTED_TASKS = (
+    "invenio_webhooks.models.process_event",
+    "invenio_webhooks.models.process_events",
+)
+"""Names of the tasks routed by receiver."""
+
+
+def route_task(name, args, kwargs, options, task=None, **kw):
+    """Route a processing task to the queue of its receiver.
+
+    Tasks are routed by their ``receiver_id`` keyword argument. Other tasks
+    and receivers without a queue are left to the following routers.
+    """
+    if name not in ROUTED_TASKS:
+        return None
+    receiver_id = (kwargs or {}).get("receiver_id")
+    if receiver_id is None or receiver_id not in current_webhooks.receivers:
+        return None
+    receiver = current_webhooks.receivers[receiver_id]
+    if not hasattr(receiver, "get_apply_options"):
+        return None
+    return receiver.get_apply_options() or None
+
+
+def get_task_routes(*routes):
+    """Return Celery ``task_routes`` routing processing tasks by receiver.
+
+    :param routes: Routers or route mappings applied to other tasks.
+    """
+    return (route_task, *routes)
+
+
+def get_task_queues(default_queue="celery", max_priority=None):
+    """Return the Celery queues of the receivers, for ``task_queues``.
+
+    Queues are read from ``WEBHOOKS_CELERY_TASK_OPTIONS`` and from the task
+    options of the receivers already loaded. Receivers are not loaded for
+    this, so the queues of receivers which are not preloaded, see
+    ``WEBHOOKS_PRELOAD_RECEIVERS``, must be declared in
+    ``WEBHOOKS_CELERY_TASK_OPTIONS`` to be included. Queues of receivers
+    declaring a priority support message priorities.
+
+    :param default_queue: Name of the default queue, which is included.
+    :param max_priority: Maximum message priority of the queues supporting
+        priorities. Defaults to ``WEBHOOKS_CELERY_MAX_PRIORITY``.
+    """
+    if max_priority is None:
+        max_priority = current_app.config["WEBHOOKS_CELERY_MAX_PRIORITY"]
+    options = [
+        receiver.get_task_options()
+        for receiver in current_webhooks.receivers.loaded().values()
+        if hasattr(receiver, "get_task_options")
+    ]
+    options.extend(current_app.config["WEBHOOKS_CELERY_TASK_OPTIONS"].values())
+
+    priorities = {default_queue: False}
+    for task_options in options:
+        queue = task_options.get("queue") or default_queue
+        priorities[queue] = (
+            priorities.get(queue, False) or task_options.get("priority") is not None
+        )
+    return [
+        Queue(
+            name,
+            queue_arguments={"x-max-priority": max_priority} if priority else None,
+        )
+        for name, priority in priorities.items()
+    ]
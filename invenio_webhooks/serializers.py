@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Pluggable JSON codecs for payloads, columns and responses."""
+
+import json
+
+from flask import current_app, has_app_context
+from werkzeug.utils import import_string
+
+
+class JSONCodec:
+    """JSON codec based on the standard library ``json`` module.
+
+    Codecs implement ``dumps`` returning a string and ``loads`` accepting a
+    string or a bytes-like object. Decoding errors are raised as
+    :class:`ValueError`.
+    """
+
+    name = "json"
+
+    def dumps(self, obj):
+        """Serialize an object to a JSON string."""
+        return json.dumps(obj, separators=(",", ":"))
+
+    def loads(self, data):
+        """Deserialize a JSON document."""
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec based on ``orjson``."""
+
+    name = "orjson"
+
+    def __init__(self):
+        """Initialize codec."""
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, obj):
+        """Serialize an object to a JSON string."""
+        return self._orjson.dumps(obj).decode("utf-8")
+
+    def loads(self, data):
+        """Deserialize a JSON document."""
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """JSON codec based on ``msgspec``."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        """Initialize codec."""
+        import msgspec
+
+        self._msgspec = msgspec
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj):
+        """Serialize an object to a JSON string."""
+        return self._encoder.encode(obj).decode("utf-8")
+
+    def loads(self, data):
+        """Deserialize a JSON document."""
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+
+CODECS = {
+    "json": JSONCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+"""Built-in codecs by name."""
+
+default_codec = JSONCodec()
+"""Codec used when no application is available."""
+
+
+def load_codec(codec):
+    """Return a codec instance.
+
+    :param codec: Name of a built-in codec, import path of a codec class or
+        instance, or a codec instance. Built-in codecs whose library is not
+        installed fall back to the standard library codec.
+    """
+    if codec is None:
+        return default_codec
+    if isinstance(codec, str):
+        if codec not in CODECS:
+            codec = import_string(codec)
+        else:
+            try:
+                return CODECS[codec]()
+            except ImportError:
+                current_app.logger.warning(
+                    "JSON codec %r is not installed, falling back to json.", codec
+                )
+                return default_codec
+    return codec() if isinstance(codec, type) else codec
+
+
+def sort_keys(obj):
+    """Return a copy of an object with the keys of all mappings sorted.
+
+    Codecs keep the insertion order of keys, this gives their output the key
+    order of :func:`flask.jsonify`.
+    """
+    if isinstance(obj, dict):
+        return {key: sort_keys(obj[key]) for key in sorted(obj)}
+    if isinstance(obj, (list, tuple)):
+        return [sort_keys(value) for value in obj]
+    return obj
+
+
+def current_codec():
+    """Return the JSON codec of the current application."""
+    state = has_app_context() and current_app.extensions.get("invenio-webhooks")
+    return state.json_codec if state else default_codec
@@ -1,37 +1,155 @@
 # SPDX-FileCopyrightText: 2014, 2015 CERN.
 # SPDX-License-Identifier: MIT
 
-"""Calculate signatures for payloads."""
+"""Calculate signatures for payloads.
+
+The keyed HMAC state of every secret key is computed once and copied for
+each message. Several keys can be active at the same time to allow key
+rotation, see ``WEBHOOKS_SECRET_KEY``.
+"""
 
 import hmac
-from hashlib import sha1
+from functools import lru_cache
+from hashlib import sha1, sha256
 
 from flask import current_app
 
+DIGESTS = {
+    "sha1": sha1,
+    "sha256": sha256,
+}
+"""Supported HMAC digests."""
+
+
+@lru_cache(maxsize=64)
+def _keyed_hmac(key, digest):
+    """Return the keyed HMAC state for a key and digest."""
+    return hmac.new(key, None, DIGESTS[digest])
+
+
+@lru_cache(maxsize=8)
+def _encode_keys(keys):
+    """Return secret keys encoded as bytes."""
+    return tuple(key.encode("utf-8") if hasattr(key, "encode") else key for key in keys)
+
+
+def get_secret_keys():
+    """Return the active secret keys, starting with the signing key."""
+    keys = current_app.config["WEBHOOKS_SECRET_KEY"]
+    if isinstance(keys, (str, bytes)):
+        keys = (keys,)
+    return _encode_keys(tuple(keys))
+
+
+def new_hmac(digest="sha1", key=None):
+    """Return a new HMAC object keyed with a secret key.
 
-def get_hmac(message):
+    :param digest: Name of the digest, see :data:`DIGESTS`.
+    :param key: Secret key as bytes. Defaults to the signing key.
+    """
+    if key is None:
+        key = get_secret_keys()[0]
+    return _keyed_hmac(key, digest).copy()
+
+
+def get_hmac(message, digest="sha1"):
     """Calculate HMAC value of message using ``WEBHOOKS_SECRET_KEY``.
 
     :param message: String to calculate HMAC for.
+    :param digest: Name of the digest, see :data:`DIGESTS`.
+    """
+    hmac_obj = new_hmac(digest)
+    hmac_obj.update(message.encode("utf-8") if hasattr(message, "encode") else message)
+    return hmac_obj.hexdigest()
+
+
+class SignedMessage:
+    """Message whose HMAC values are updated incrementally for all keys."""
+
+    def __init__(self, digest="sha1"):
+        """Initialize the HMAC objects of all active keys."""
+        self.digest = digest
+        self._hmacs = [new_hmac(digest, key) for key in get_secret_keys()]
+
+    def update(self, data):
+        """Update the HMAC values with a chunk of the message."""
+        for hmac_obj in self._hmacs:
+            hmac_obj.update(data)
+
+    def hexdigests(self):
+        """Return the HMAC values of all active keys."""
+        return [hmac_obj.hexdigest() for hmac_obj in self._hmacs]
+
+
+def _hexdigests(message, digest):
+    """Return the HMAC values of a message for all active keys."""
+    if isinstance(message, SignedMessage):
+        assert message.digest == digest
+        return message.hexdigests()
+    if hasattr(message, "encode"):
+        message = message.encode("utf-8")
+    hexdigests = []
+    for key in get_secret_keys():
+        hmac_obj = _keyed_hmac(key, digest).copy()
+        hmac_obj.update(message)
+        hexdigests.append(hmac_obj.hexdigest())
+    return hexdigests
+
+
+def check_hmac_signature(signature, message, digest):
+    """Check a hex encoded HMAC signature against all active keys.
+
+    The signature may be prefixed with the digest name, e.g. ``sha256=``,
+    in which case the name must match ``digest``. Values are compared in
+    constant time.
+
+    :param signature: HMAC signature extracted from request.
+    :param message: Request message, or a :class:`SignedMessage` which has
+        already been updated with the request message.
+    :param digest: Name of the digest, see :data:`DIGESTS`.
+    """
+    prefix, separator, value = signature.rpartition("=")
+    if separator and prefix != digest:
+        return False
+    value = value.encode("utf-8")
+    valid = False
+    # Compare against every key so that timing does not reveal which matched.
+    for hmac_value in _hexdigests(message, digest):
+        valid |= hmac.compare_digest(value, hmac_value.encode("ascii"))
+    return valid
+
+
+def hmac_validator(digest):
+    """Declare the HMAC digest of a signature validator.
+
+    Receivers reading the request body as a stream use it to update the
+    HMAC values while reading, see :class:`SignedMessage`.
     """
-    key = current_app.config["WEBHOOKS_SECRET_KEY"]
-    hmac_value = hmac.new(
-        key.encode("utf-8") if hasattr(key, "encode") else key,
-        message.encode("utf-8") if hasattr(message, "encode") else message,
-        sha1,
-    ).hexdigest()
-    return hmac_value
 
+    def decorator(f):
+        f.digest = digest
+        return f
+
+    return decorator
 
+
+@hmac_validator("sha1")
 def check_x_hub_signature(signature, message):
     """Check X-Hub-Signature used by GitHub to sign requests.
 
     :param signature: HMAC signature extracted from request.
-    :param message: Request message.
+    :param message: Request message, or a :class:`SignedMessage` which has
+        already been updated with the request message.
+    """
+    return check_hmac_signature(signature, message, "sha1")
+
+
+@hmac_validator("sha256")
+def check_x_hub_signature_256(signature, message):
+    """Check X-Hub-Signature-256 used by GitHub to sign requests.
+
+    :param signature: HMAC signature extracted from request.
+    :param message: Request message, or a :class:`SignedMessage` which has
+        already been updated with the request message.
     """
-    hmac_value = get_hmac(message)
-    return bool(
-        hmac_value == signature
-        or signature.find("=") > -1
-        and hmac_value == signature[signature.find("=") + 1 :]
-    )
+    return check_hmac_signature(signature, message, "sha256")
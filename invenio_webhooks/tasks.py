@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Celery tasks for maintenance of webhook events."""
+
+from celery import shared_task
+from flask import current_app
+from invenio_db import db
+
+from .api import get_retention_cutoffs, purge_events
+from .partitions import (
+    create_partitions,
+    drop_partitions,
+    get_partition_cutoff,
+    is_partitioned,
+)
+
+
+@shared_task(ignore_result=True)
+def purge_expired_events():
+    """Delete events older than the retention period of their receiver.
+
+    Schedule it with Celery beat, e.g.:
+
+    .. code-block:: python
+
+        CELERY_BEAT_SCHEDULE = {
+            "webhooks-purge": {
+                "task": "invenio_webhooks.tasks.purge_expired_events",
+                "schedule": timedelta(hours=1),
+            },
+        }
+    """
+    for receiver_id, before in get_retention_cutoffs().items():
+        deleted = sum(purge_events(before, receiver_id=receiver_id))
+        if deleted:
+            current_app.logger.info(
+                "Purged %d expired events of receiver %s.", deleted, receiver_id
+            )
+
+
+@shared_task(ignore_result=True)
+def maintain_partitions():
+    """Create future partitions and drop expired partitions of events.
+
+    Does nothing unless the events table is partitioned, see
+    :mod:`invenio_webhooks.partitions`. Schedule it daily with Celery beat.
+    """
+    if not is_partitioned():
+        return
+    create_partitions()
+    before = get_partition_cutoff()
+    dropped = drop_partitions(before) if before is not None else []
+    db.session.commit()
+    if dropped:
+        current_app.logger.info("Dropped partitions %s.", ", ".join(dropped))
@@ -0,0 +1,137 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Utility functions and classes."""
+
+import atexit
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+
+class TTLCache:
+    """Bounded in-process cache with per-entry expiration.
+
+    It implements the ``get``, ``get_many``, ``set`` and ``delete`` methods
+    of Flask-Caching, so that a shared cache can be used instead. Entries are
+    only visible to the process which set them.
+    """
+
+    def __init__(self, maxsize=10000):
+        """Initialize cache.
+
+        :param maxsize: Maximum number of entries. The least recently used
+            entries are evicted first.
+        """
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return a cached value, or ``None`` if it is missing or expired."""
+        with self._lock:
+            try:
+                expires, value = self._data[key]
+            except KeyError:
+                return None
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def get_many(self, *keys):
+        """Return a list of cached values, ``None`` for missing ones."""
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, timeout=None):
+        """Cache a value for ``timeout`` seconds.
+
+        Like Flask-Caching, ``None`` and ``0`` mean no expiration.
+        """
+        expires = time.monotonic() + timeout if timeout else None
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return True
+
+    def delete(self, key):
+        """Remove a value from the cache."""
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+
+class Batcher:
+    """Collect items and hand them over in batches.
+
+    A batch is sent as soon as it holds ``max_size`` items, or ``window``
+    seconds after its first item was added. The timed flush runs in a
+    background thread inside the application context of the first item.
+
+    Items are only held in memory: the pending batch is sent when the
+    interpreter exits normally, but up to ``window`` seconds of items are
+    lost if the process is killed.
+    """
+
+    def __init__(self, send, max_size=100, window=0.05):
+        """Initialize batcher.
+
+        :param send: Callable receiving the list of items of a batch.
+        :param max_size: Maximum number of items per batch.
+        :param window: Maximum time in seconds an item waits for its batch.
+        """
+        self.send = send
+        self.max_size = max_size
+        self.window = window
+        self._items = []
+        self._timer = None
+        self._app = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def add(self, item):
+        """Add an item to the current batch."""
+        with self._lock:
+            self._items.append(item)
+            if len(self._items) < self.max_size and self.window > 0:
+                if self._timer is None:
+                    self._app = current_app._get_current_object()
+                    self._timer = threading.Timer(
+                        self.window, self._flush_in_context, args=(self._app,)
+                    )
+                    self._timer.start()
+                return
+            items = self._take()
+        self.send(items)
+
+    def flush(self):
+        """Send the current batch immediately."""
+        with self._lock:
+            items = self._take()
+        if items:
+            self.send(items)
+
+    def close(self):
+        """Send the pending batch, e.g. when the process exits."""
+        with self._lock:
+            app, items = self._app, self._take()
+        if items:
+            with app.app_context():
+                self.send(items)
+
+    def _flush_in_context(self, app):
+        """Send the current batch from the timer thread."""
+        with app.app_context():
+            self.flush()
+
+    def _take(self):
+        """Return and reset the current batch."""
+        items, self._items = self._items, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return items
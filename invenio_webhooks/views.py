@@ -3,18 +3,52 @@
 
 """Invenio module for processing webhook events."""
 
+import math
+import time
+import uuid
+import zlib
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
 from functools import wraps
 
-from flask import Blueprint, abort, jsonify, request, url_for
+from celery import states
+from flask import (
+    Blueprint,
+    abort,
+    current_app,
+    jsonify,
+    request,
+    stream_with_context,
+    url_for,
+)
 from flask.views import MethodView
 from flask_login import current_user
 from invenio_db import db
 from invenio_i18n import _
 from invenio_oauth2server import require_api_auth, require_oauth_scopes
 from invenio_oauth2server.models import Scope
-
-from .errors import InvalidPayload, ReceiverDoesNotExist, WebhooksError
+from sqlalchemy import select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
+from werkzeug.http import is_resource_modified
+
+from .errors import (
+    DeliveryConflict,
+    DuplicateDelivery,
+    InvalidCursor,
+    InvalidPayload,
+    PayloadTooLarge,
+    QueueBacklogExceeded,
+    RateLimitExceeded,
+    ReceiverDoesNotExist,
+    WebhooksError,
+)
+from .metrics import add_server_timing, record_elapsed
 from .models import Event
+from .proxies import current_webhooks
+from .pubsub import status_channel
+from .ratelimit import check_queue_depth, check_rate_limits
+from .serializers import current_codec, sort_keys
 
 blueprint = Blueprint("invenio_webhooks", __name__)
 
@@ -41,10 +75,105 @@ def add_link_header(response, links):
         )
 
 
-def make_response(event):
-    """Make a response from webhook event."""
-    code, message = event.status
-    response = jsonify(**event.response)
+def get_user_id():
+    """Return the id of the user authenticated by token or session."""
+    try:
+        return request.oauth.access_token.user_id
+    except AttributeError:
+        return current_user.get_id()
+
+
+def encode_cursor(created, event_id):
+    """Return the pagination cursor of an event."""
+    value = f"{created.isoformat()}|{event_id.hex}".encode("ascii")
+    return urlsafe_b64encode(value).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return the creation date and id encoded in a pagination cursor.
+
+    :raises InvalidCursor: If the cursor is malformed.
+    """
+    try:
+        value = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created, event_id = value.decode("ascii").split("|")
+        return datetime.fromisoformat(created), uuid.UUID(event_id)
+    except ValueError as e:
+        raise InvalidCursor(cursor) from e
+
+
+LISTING_COLUMNS = (
+    Event.id,
+    Event.receiver_id,
+    Event.delivery_id,
+    Event.created,
+    Event.updated,
+    Event.response_code,
+    Event.task_state,
+)
+"""Columns of events returned when listing events."""
+
+
+def serialize_event_row(row, list_url):
+    """Serialize a row of :data:`LISTING_COLUMNS`.
+
+    :param list_url: URL of the event list, prefix of the event URLs.
+    """
+    return {
+        "id": str(row.id),
+        "receiver_id": row.receiver_id,
+        "delivery_id": row.delivery_id,
+        "created": row.created.isoformat(),
+        "updated": row.updated.isoformat(),
+        "response_code": row.response_code,
+        "task_state": row.task_state,
+        "links": {"self": list_url + str(row.id)},
+    }
+
+
+STATUS_COLUMNS = (
+    Event.id,
+    Event.receiver_id,
+    Event.user_id,
+    Event.updated,
+    Event.response,
+    Event.response_code,
+    Event.task_state,
+)
+"""Columns of events needed to render their status."""
+
+
+def get_etag(event, status):
+    """Return the entity tag of an event response.
+
+    It changes whenever the event is updated or its status changes.
+    """
+    code, message = status
+    checksum = zlib.crc32((message or "").encode("utf-8"))
+    return f"{int(event.updated.timestamp() * 1e6):x}-{code}-{checksum:x}"
+
+
+def get_status_channel(event_id):
+    """Return the status channel of an event id given in a URL."""
+    try:
+        event_id = uuid.UUID(event_id)
+    except ValueError:
+        pass
+    return status_channel(event_id)
+
+
+def make_response(event, status=None):
+    """Make a response from webhook event.
+
+    :param status: Status of the event, if already known.
+    """
+    code, message = status or event.status
+    body = event.response
+    if getattr(current_app.json, "sort_keys", True):
+        body = sort_keys(body)
+    response = current_app.response_class(
+        f"{current_codec().dumps(body)}\n", mimetype="application/json"
+    )
     response.headers["X-Hub-Event"] = event.receiver_id
     response.headers["X-Hub-Delivery"] = event.id
     if message:
@@ -63,14 +192,34 @@ def make_response(event):
     return response, code
 
 
+@blueprint.after_request
+def count_response(response):
+    """Count the responses of receivers in the metrics hook.
+
+    With ``WEBHOOKS_SERVER_TIMING``, the stages of the request are also
+    reported in its ``Server-Timing`` header.
+    """
+    receiver_id = (request.view_args or {}).get("receiver_id")
+    if response.status_code >= 400 and receiver_id is not None:
+        if receiver_id not in current_webhooks.receivers:
+            receiver_id = "unknown"
+        current_webhooks.metrics.count_response(receiver_id, response.status_code)
+    return add_server_timing(response)
+
+
 #
 # Default decorators
 #
 def error_handler(f):
-    """Return a json payload and appropriate status code on expection."""
+    """Return a json payload and appropriate status code on expection.
+
+    With ``WEBHOOKS_SERVER_TIMING``, the time spent before the view, e.g. in
+    the OAuth token verification, is recorded as the ``auth`` stage.
+    """
 
     @wraps(f)
     def inner(*args, **kwargs):
+        record_elapsed("auth")
         try:
             return f(*args, **kwargs)
         except ReceiverDoesNotExist:
@@ -84,6 +233,36 @@ def error_handler(f):
                 ),
                 415,
             )
+        except DuplicateDelivery as e:
+            response = jsonify(status=200, message="Duplicate delivery.")
+            response.headers["X-Hub-Event"] = e.receiver_id
+            response.headers["X-Hub-Delivery"] = e.event_id
+            add_link_header(
+                response,
+                {
+                    "self": url_for(
+                        ".event_item",
+                        receiver_id=e.receiver_id,
+                        event_id=e.event_id,
+                        _external=True,
+                    )
+                },
+            )
+            return response, 200
+        except DeliveryConflict:
+            return jsonify(status=409, description="Delivery already exists."), 409
+        except PayloadTooLarge:
+            return jsonify(status=413, description="Payload too large."), 413
+        except InvalidCursor:
+            return jsonify(status=400, description="Invalid cursor."), 400
+        except RateLimitExceeded as e:
+            response = jsonify(status=429, description="Too many requests.")
+            response.headers["Retry-After"] = str(math.ceil(e.retry_after))
+            return response, 429
+        except QueueBacklogExceeded as e:
+            response = jsonify(status=503, description="Service overloaded.")
+            response.headers["Retry-After"] = str(math.ceil(e.retry_after))
+            return response, 503
         except WebhooksError:
             return jsonify(status=500, description="Internal server error"), 500
 
@@ -96,19 +275,127 @@ def error_handler(f):
 class ReceiverEventListResource(MethodView):
     """Receiver event hook."""
 
+    @require_api_auth()
+    @require_oauth_scopes("webhooks:event")
+    @error_handler
+    def get(self, receiver_id=None):
+        """List events of the user, newest first.
+
+        Pages of ``size`` events are selected with the ``after`` cursor of
+        the ``next`` link. With ``format=ndjson``, or when
+        ``application/x-ndjson`` is preferred, all events are streamed
+        instead, one JSON document per line.
+        """
+        if receiver_id not in current_webhooks.receivers:
+            raise ReceiverDoesNotExist(receiver_id)
+
+        query = (
+            select(*LISTING_COLUMNS)
+            .where(
+                Event.receiver_id == receiver_id,
+                Event.user_id == int(get_user_id()),
+            )
+            .order_by(Event.created.desc(), Event.id.desc())
+        )
+        after = request.args.get("after")
+        if after:
+            query = query.where(tuple_(Event.created, Event.id) < decode_cursor(after))
+        list_url = url_for(".event_list", receiver_id=receiver_id, _external=True)
+
+        if request.args.get("format") == "ndjson" or (
+            request.accept_mimetypes.best_match(
+                ["application/json", "application/x-ndjson"]
+            )
+            == "application/x-ndjson"
+        ):
+            return self._stream(query, list_url)
+
+        size = request.args.get(
+            "size", current_app.config["WEBHOOKS_EVENTS_PAGE_SIZE"], type=int
+        )
+        size = min(max(size, 1), current_app.config["WEBHOOKS_EVENTS_MAX_PAGE_SIZE"])
+        rows = db.session.execute(query.limit(size + 1)).all()
+
+        response = current_app.response_class(
+            current_codec().dumps(
+                {"hits": [serialize_event_row(row, list_url) for row in rows[:size]]}
+            ),
+            mimetype="application/json",
+        )
+        links = {
+            "self": url_for(
+                ".event_list",
+                receiver_id=receiver_id,
+                size=size,
+                after=after,
+                _external=True,
+            )
+        }
+        if len(rows) > size:
+            last = rows[size - 1]
+            links["next"] = url_for(
+                ".event_list",
+                receiver_id=receiver_id,
+                size=size,
+                after=encode_cursor(last.created, last.id),
+                _external=True,
+            )
+        add_link_header(response, links)
+        return response
+
+    @staticmethod
+    def _stream(query, list_url):
+        """Stream events as NDJSON through a server-side cursor."""
+        batch_size = current_app.config["WEBHOOKS_EVENTS_STREAM_BATCH_SIZE"]
+        codec = current_codec()
+
+        def generate():
+            result = db.session.execute(query.execution_options(yield_per=batch_size))
+            for rows in result.partitions():
+                yield "".join(
+                    codec.dumps(serialize_event_row(row, list_url)) + "\n"
+                    for row in rows
+                )
+
+        return current_app.response_class(
+            stream_with_context(generate()), mimetype="application/x-ndjson"
+        )
+
     @require_api_auth()
     @require_oauth_scopes("webhooks:event")
     @error_handler
     def post(self, receiver_id=None):
-        """Handle POST request."""
-        try:
-            user_id = request.oauth.access_token.user_id
-        except AttributeError:
-            user_id = current_user.get_id()
+        """Handle POST request.
+
+        Events over a rate limit or while the Celery queue is backlogged are
+        rejected before the request body is read, see
+        :mod:`invenio_webhooks.ratelimit`.
+        """
+        user_id = int(get_user_id())
+        receiver = current_webhooks.receivers.get(receiver_id)
+        if receiver is None:
+            raise ReceiverDoesNotExist(receiver_id)
+        check_rate_limits(receiver_id, user_id)
+        check_queue_depth(receiver)
 
         event = Event.create(receiver_id=receiver_id, user_id=user_id)
-        db.session.add(event)
-        db.session.commit()
+        try:
+            with current_webhooks.metrics.timer("insert", receiver_id):
+                if current_app.config["WEBHOOKS_EVENT_BUFFER"]:
+                    current_webhooks.event_buffer.add(event)
+                else:
+                    db.session.add(event)
+                    db.session.commit()
+        except IntegrityError:
+            # Concurrent redelivery which was not in the delivery cache yet.
+            db.session.rollback()
+            original_id = event.delivery_id and Event.get_delivery_event_id(
+                receiver_id, event.delivery_id, user_id
+            )
+            if not original_id:
+                raise
+            raise DuplicateDelivery(receiver_id, original_id)
+        event.remember_delivery()
 
         try:
             event.process()
@@ -128,18 +415,18 @@ class ReceiverEventResource(MethodView):
     """Event resource."""
 
     @staticmethod
-    def _get_event(receiver_id, event_id):
-        """Find event and check access rights."""
-        event = Event.query.filter_by(
-            receiver_id=receiver_id, id=event_id
-        ).first_or_404()
-
-        try:
-            user_id = request.oauth.access_token.user_id
-        except AttributeError:
-            user_id = current_user.get_id()
+    def _get_event(receiver_id, event_id, *options):
+        """Find event and check access rights.
+
+        :param options: Loader options of the query.
+        """
+        event = (
+            Event.query.options(*options)
+            .filter_by(receiver_id=receiver_id, id=event_id)
+            .first_or_404()
+        )
 
-        if event.user_id != int(user_id):
+        if event.user_id != int(get_user_id()):
             abort(401)
 
         return event
@@ -148,26 +435,203 @@ class ReceiverEventResource(MethodView):
     @require_oauth_scopes("webhooks:event")
     @error_handler
     def get(self, receiver_id=None, event_id=None):
-        """Handle GET request."""
-        event = self._get_event(receiver_id, event_id)
-        return make_response(event)
+        """Handle GET request.
+
+        Only the columns needed for the status are loaded. Responses carry
+        an ``ETag`` header, and requests with a matching ``If-None-Match``
+        header are answered with 304. ``If-Modified-Since`` is ignored: the
+        status of an event can change without updating the event, e.g. when
+        its task fails, and HTTP dates only have a resolution of a second.
+
+        With ``wait=<seconds>``, a conditional request for an unchanged
+        event is held until its status changes or the time has passed, see
+        ``WEBHOOKS_STATUS_BROKER``.
+        """
+        broker = current_webhooks.status_broker
+        wait = min(
+            request.args.get("wait", 0, type=float),
+            current_app.config["WEBHOOKS_STATUS_MAX_WAIT"],
+        )
+        # Subscribe before reading the event so that no transition is missed.
+        subscription = (
+            broker.subscribe(get_status_channel(event_id))
+            if broker is not None and wait > 0
+            else None
+        )
+        try:
+            event = self._get_event(receiver_id, event_id, load_only(*STATUS_COLUMNS))
+            status = event.status
+            etag = get_etag(event, status)
+            modified = is_resource_modified(request.environ, etag=etag)
+            deadline = time.monotonic() + wait
+            while not modified and subscription is not None:
+                # Do not hold a database connection while waiting.
+                db.session.rollback()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or subscription.get(timeout=remaining) is None:
+                    break
+                event = self._get_event(
+                    receiver_id, event_id, load_only(*STATUS_COLUMNS)
+                )
+                status = event.status
+                etag = get_etag(event, status)
+                modified = is_resource_modified(request.environ, etag=etag)
+        finally:
+            if subscription is not None:
+                subscription.close()
+
+        if not modified:
+            response = current_app.response_class(status=304)
+            code = 304
+        else:
+            response, code = make_response(event, status)
+        response.set_etag(etag)
+        return response, code
 
     @require_api_auth()
     @require_oauth_scopes("webhooks:event")
     @error_handler
     def delete(self, receiver_id=None, event_id=None):
         """Handle DELETE request."""
-        event = self._get_event(receiver_id, event_id)
+        event = self._get_event(receiver_id, event_id, load_only(*STATUS_COLUMNS))
         event.delete()
         db.session.commit()
         return make_response(event)
 
 
+def format_sse(message, event="status"):
+    """Format a message as a Server-Sent Event."""
+    return f"event: {event}\ndata: {current_codec().dumps(message)}\n\n"
+
+
+class ReceiverEventStreamResource(MethodView):
+    """Stream of status changes of an event."""
+
+    @require_api_auth()
+    @require_oauth_scopes("webhooks:event")
+    @error_handler
+    def get(self, receiver_id=None, event_id=None):
+        """Stream the status of an event as Server-Sent Events.
+
+        The current status is sent first, followed by every task state
+        transition until the task is finished or ``WEBHOOKS_STATUS_MAX_WAIT``
+        seconds have passed.
+        """
+        broker = current_webhooks.status_broker
+        subscription = (
+            broker.subscribe(get_status_channel(event_id))
+            if broker is not None
+            else None
+        )
+        try:
+            event = ReceiverEventResource._get_event(
+                receiver_id, event_id, load_only(*STATUS_COLUMNS)
+            )
+            code, message = event.status
+        except Exception:
+            if subscription is not None:
+                subscription.close()
+            raise
+        current = {"event_id": str(event.id), "status": code, "message": message}
+        # Do not hold a database connection while streaming.
+        db.session.rollback()
+
+        max_wait = current_app.config["WEBHOOKS_STATUS_MAX_WAIT"]
+        keepalive = current_app.config["WEBHOOKS_STATUS_STREAM_KEEPALIVE"]
+
+        def generate():
+            try:
+                yield format_sse(current)
+                if subscription is None or code != 202:
+                    return
+                deadline = time.monotonic() + max_wait
+                while (remaining := deadline - time.monotonic()) > 0:
+                    message = subscription.get(timeout=min(keepalive, remaining))
+                    if message is None:
+                        yield ": keepalive\n\n"
+                        continue
+                    yield format_sse(message)
+                    if message["state"] in states.READY_STATES:
+                        return
+            finally:
+                if subscription is not None:
+                    subscription.close()
+
+        response = current_app.response_class(generate(), mimetype="text/event-stream")
+        response.headers["Cache-Control"] = "no-cache"
+        response.headers["X-Accel-Buffering"] = "no"
+        return response
+
+
+class ReceiverEventStatusResource(MethodView):
+    """Statuses of several events."""
+
+    @require_api_auth()
+    @require_oauth_scopes("webhooks:event")
+    @error_handler
+    def post(self, receiver_id=None):
+        """Return the statuses of the events listed in ``ids``.
+
+        Events are loaded with one query and their statuses are requested
+        at once, see :meth:`~invenio_webhooks.models.Event.get_statuses`.
+        Unknown events and events of other users have status 404.
+        """
+        if receiver_id not in current_webhooks.receivers:
+            raise ReceiverDoesNotExist(receiver_id)
+
+        data = request.get_json(silent=True)
+        ids = data.get("ids") if isinstance(data, dict) else None
+        max_ids = current_app.config["WEBHOOKS_STATUS_BULK_MAX_IDS"]
+        try:
+            if not isinstance(ids, list) or len(ids) > max_ids:
+                raise ValueError(ids)
+            ids = list(dict.fromkeys(uuid.UUID(str(event_id)) for event_id in ids))
+        except ValueError:
+            return (
+                jsonify(
+                    status=400,
+                    description=f"Expected a list of at most {max_ids} event ids.",
+                ),
+                400,
+            )
+
+        events = (
+            Event.query.options(load_only(*STATUS_COLUMNS))
+            .filter(
+                Event.receiver_id == receiver_id,
+                Event.user_id == int(get_user_id()),
+                Event.id.in_(ids),
+            )
+            .all()
+        )
+        statuses = {
+            event.id: status for event, status in Event.get_statuses(events).items()
+        }
+
+        list_url = url_for(".event_list", receiver_id=receiver_id, _external=True)
+        hits = []
+        for event_id in ids:
+            code, message = statuses.get(event_id, (404, "Event not found."))
+            hits.append(
+                {
+                    "id": str(event_id),
+                    "status": code,
+                    "message": message,
+                    "links": {"self": list_url + str(event_id)},
+                }
+            )
+        return current_app.response_class(
+            current_codec().dumps({"hits": hits}), mimetype="application/json"
+        )
+
+
 #
 # Register API resources
 #
 event_list = ReceiverEventListResource.as_view("event_list")
 event_item = ReceiverEventResource.as_view("event_item")
+event_statuses = ReceiverEventStatusResource.as_view("event_statuses")
+event_stream = ReceiverEventStreamResource.as_view("event_stream")
 
 blueprint.add_url_rule(
     "/hooks/receivers/<string:receiver_id>/events/",
@@ -177,3 +641,11 @@ blueprint.add_url_rule(
     "/hooks/receivers/<string:receiver_id>/events/<string:event_id>",
     view_func=event_item,
 )
+blueprint.add_url_rule(
+    "/hooks/receivers/<string:receiver_id>/statuses",
+    view_func=event_statuses,
+)
+blueprint.add_url_rule(
+    "/hooks/receivers/<string:receiver_id>/events/<string:event_id>/stream",
+    view_func=event_stream,
+)
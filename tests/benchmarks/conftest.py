@@ -0,0 +1,59 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Benchmark fixtures.
+
+Benchmarks run on the SQLite database and eager Celery of the test suite.
+They are disabled by default, i.e. run once as regular tests. Save a
+baseline, e.g. on the main branch, and compare a change against it with:
+
+.. code-block:: console
+
+    $ pytest tests/benchmarks --benchmark-enable --benchmark-save=baseline
+    $ pytest tests/benchmarks --benchmark-enable --benchmark-compare
+
+Add ``--benchmark-compare-fail=mean:10%`` to fail on regressions. Baselines
+are stored per machine in ``.benchmarks``.
+"""
+
+import uuid
+
+import pytest
+from invenio_db import db
+
+from invenio_webhooks.models import CeleryReceiver, Event
+
+
+@pytest.fixture
+def celery_receiver(app):
+    """Register a Celery receiver doing nothing."""
+
+    class BenchmarkCeleryReceiver(CeleryReceiver):
+        def run(self, event):
+            pass
+
+    app.extensions["invenio-webhooks"].register(
+        "benchmark-celery-receiver", BenchmarkCeleryReceiver
+    )
+    return BenchmarkCeleryReceiver
+
+
+@pytest.fixture
+def create_events(app, tester_id):
+    """Return a function creating events of a receiver."""
+
+    def create_events(receiver_id, count, payload=None):
+        events = [
+            Event(
+                id=uuid.uuid4(),
+                receiver_id=receiver_id,
+                user_id=tester_id,
+                payload=payload or {"index": i},
+            )
+            for i in range(count)
+        ]
+        db.session.add_all(events)
+        db.session.commit()
+        return [str(event.id) for event in events]
+
+    return create_events
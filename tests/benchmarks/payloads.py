@@ -0,0 +1,23 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Payloads of benchmarks."""
+
+import json
+from urllib.parse import urlencode
+
+PAYLOAD_SIZES = [1024, 64 * 1024, 1024 * 1024]
+"""Approximate sizes in bytes of benchmarked payloads."""
+
+
+def make_payload(size):
+    """Return a JSON-like payload of approximately ``size`` bytes."""
+    commit = {"id": "0" * 40, "message": "x" * 200, "added": ["path/to/file.py"]}
+    count = max(1, size // len(json.dumps(commit)))
+    return {"ref": "refs/heads/main", "commits": [commit] * count}
+
+
+def make_form_body(size):
+    """Return an urlencoded body of approximately ``size`` bytes."""
+    count = max(1, size // 64)
+    return urlencode({f"field{i}": "x" * 50 for i in range(count)})
@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Ingestion benchmarks."""
+
+import json
+
+import pytest
+from flask import url_for
+from invenio_db import db
+
+from invenio_webhooks.models import Event
+from invenio_webhooks.proxies import current_webhooks
+from invenio_webhooks.views import make_response
+
+from .payloads import PAYLOAD_SIZES, make_form_body, make_payload
+
+
+@pytest.mark.parametrize("size", PAYLOAD_SIZES)
+def test_extract_json_payload(app, receiver, benchmark, size):
+    """Benchmark extraction of JSON payloads."""
+    benchmark.group = "extract_payload"
+    body = json.dumps(make_payload(size))
+
+    def extract():
+        with app.test_request_context(
+            method="POST", data=body, content_type="application/json"
+        ):
+            return current_webhooks.receivers["test-receiver"].extract_payload()
+
+    assert benchmark(extract)["ref"] == "refs/heads/main"
+
+
+@pytest.mark.parametrize("size", PAYLOAD_SIZES)
+def test_extract_form_payload(app, receiver, benchmark, size):
+    """Benchmark extraction of urlencoded payloads."""
+    benchmark.group = "extract_payload"
+    body = make_form_body(size)
+
+    def extract():
+        with app.test_request_context(
+            method="POST",
+            data=body,
+            content_type="application/x-www-form-urlencoded",
+        ):
+            return current_webhooks.receivers["test-receiver"].extract_payload()
+
+    assert benchmark(extract)["field0"]
+
+
+@pytest.mark.parametrize("size", PAYLOAD_SIZES)
+def test_post_event(app, receiver, access_token, benchmark, size):
+    """Benchmark the round-trip of event deliveries."""
+    benchmark.group = "post"
+    body = json.dumps(make_payload(size))
+
+    with app.test_request_context(), app.test_client() as client:
+        url = url_for(
+            "invenio_webhooks.event_list",
+            receiver_id="test-receiver",
+            access_token=access_token,
+        )
+
+        def post():
+            return client.post(url, data=body, content_type="application/json")
+
+        assert benchmark(post).status_code == 202
+
+
+def test_make_response(app, receiver, create_events, benchmark):
+    """Benchmark serialization of event responses."""
+    benchmark.group = "response"
+    with app.test_request_context("/hooks/receivers/test-receiver/events/"):
+        (event_id,) = create_events("test-receiver", 1)
+        event = db.session.get(Event, event_id)
+        event.response = {"status": 202, "message": "Accepted."}
+        event.response_code = 202
+        status = event.status
+
+        response, code = benchmark(make_response, event, status)
+        assert code == 202
@@ -0,0 +1,34 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Processing benchmarks."""
+
+import pytest
+
+from invenio_webhooks.models import process_event, process_events
+
+
+def test_process_event(app, celery_receiver, create_events, benchmark):
+    """Benchmark processing of single events by eager Celery tasks."""
+    benchmark.group = "process"
+    with app.app_context():
+        (event_id,) = create_events("benchmark-celery-receiver", 1)
+        benchmark(
+            process_event.apply,
+            args=[event_id],
+            kwargs={"receiver_id": "benchmark-celery-receiver"},
+        )
+
+
+@pytest.mark.parametrize("count", [10, 100])
+def test_process_events(app, celery_receiver, create_events, benchmark, count):
+    """Benchmark processing of batches of events by eager Celery tasks."""
+    benchmark.group = "process"
+    benchmark.extra_info["events"] = count
+    with app.app_context():
+        event_ids = create_events("benchmark-celery-receiver", count)
+        benchmark(
+            process_events.apply,
+            args=[event_ids],
+            kwargs={"receiver_id": "benchmark-celery-receiver"},
+        )
@@ -0,0 +1,34 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Signature benchmarks."""
+
+import pytest
+
+from invenio_webhooks.signatures import (
+    check_x_hub_signature,
+    check_x_hub_signature_256,
+    get_hmac,
+)
+
+from .payloads import PAYLOAD_SIZES
+
+
+@pytest.mark.parametrize("size", PAYLOAD_SIZES)
+def test_check_x_hub_signature(app, benchmark, size):
+    """Benchmark SHA-1 signature checks."""
+    benchmark.group = "signature"
+    message = b"x" * size
+    with app.app_context():
+        signature = "sha1=" + get_hmac(message)
+        assert benchmark(check_x_hub_signature, signature, message)
+
+
+@pytest.mark.parametrize("size", PAYLOAD_SIZES)
+def test_check_x_hub_signature_256(app, benchmark, size):
+    """Benchmark SHA-256 signature checks."""
+    benchmark.group = "signature"
+    message = b"x" * size
+    with app.app_context():
+        signature = "sha256=" + get_hmac(message, digest="sha256")
+        assert benchmark(check_x_hub_signature_256, signature, message)
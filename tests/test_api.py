@@ -2,13 +2,22 @@
 # SPDX-License-Identifier: MIT
 
 import json
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qsl, urlsplit
 
+from celery import current_app as current_celery_app
 from flask import url_for
 from flask_login import current_user
 from flask_security import url_for_security
+from invenio_db import db
+from invenio_oauth2server.models import Token
 
-from invenio_webhooks.models import Receiver
+from invenio_webhooks.models import CeleryReceiver, Event, EventDelivery, Receiver
 from invenio_webhooks.proxies import current_webhooks
+from invenio_webhooks.pubsub import status_channel
+from invenio_webhooks.signatures import get_hmac
 
 
 def make_request(
@@ -60,10 +69,8 @@ def make_request(
 def test_405_methods(app, tester_id, access_token):
     with app.test_request_context(), app.test_client() as client:
         methods = [
-            client.get,
             client.put,
             client.delete,
-            client.head,
             client.options,
             client.patch,
         ]
@@ -135,6 +142,321 @@ def test_webhook_post(app, tester_id, access_token, receiver):
             )
 
 
+def test_webhook_post_too_large(app, tester_id, access_token, receiver):
+    app.config.update(
+        WEBHOOKS_STREAMING_INGESTION=True,
+        WEBHOOKS_MAX_PAYLOAD_SIZE=16,
+    )
+    with app.test_request_context(), app.test_client() as client:
+        make_request(
+            access_token,
+            client.post,
+            "invenio_webhooks.event_list",
+            urlargs={"receiver_id": "test-receiver"},
+            data={"somekey": "somevalue" * 10},
+            code=413,
+        )
+        make_request(
+            access_token,
+            client.post,
+            "invenio_webhooks.event_list",
+            urlargs={"receiver_id": "test-receiver"},
+            data={"k": "v"},
+            code=202,
+        )
+
+
+def test_webhook_post_buffered(app, tester_id, access_token, receiver):
+    app.config["WEBHOOKS_EVENT_BUFFER"] = True
+    with app.test_request_context(), app.test_client() as client:
+        response = make_request(
+            access_token,
+            client.post,
+            "invenio_webhooks.event_list",
+            urlargs={"receiver_id": "test-receiver"},
+            data={"somekey": "somevalue"},
+            code=202,
+        )
+        make_request(
+            access_token,
+            client.get,
+            "invenio_webhooks.event_item",
+            urlargs={
+                "receiver_id": response.headers["X-Hub-Event"],
+                "event_id": response.headers["X-Hub-Delivery"],
+            },
+            code=202,
+        )
+
+
+def test_webhook_post_redelivery(app, tester_id, access_token, receiver):
+    class TestReceiverDelivery(receiver):
+        delivery_header = "X-GitHub-Delivery"
+
+    with app.test_request_context():
+        current_webhooks.register("test-receiver-delivery", TestReceiverDelivery)
+        receiver = current_webhooks.receivers["test-receiver-delivery"]
+        with app.test_client() as client:
+
+            def post(delivery_id):
+                return make_request(
+                    access_token,
+                    client.post,
+                    "invenio_webhooks.event_list",
+                    urlargs={"receiver_id": "test-receiver-delivery"},
+                    data={"somekey": "somevalue"},
+                    headers=[
+                        ("content-type", "application/json"),
+                        ("X-GitHub-Delivery", delivery_id),
+                    ],
+                )
+
+            original = post("delivery-1")
+            assert original.status_code == 202
+
+            # Redelivery rejected by the delivery cache.
+            duplicate = post("delivery-1")
+            assert duplicate.status_code == 200
+            assert (
+                duplicate.headers["X-Hub-Delivery"]
+                == original.headers["X-Hub-Delivery"]
+            )
+            assert duplicate.headers["Link"] == original.headers["Link"]
+            assert len(receiver.calls) == 1
+
+            # Redelivery rejected by the unique constraint.
+            current_webhooks.delivery_cache.delete(
+                ("test-receiver-delivery", tester_id, "delivery-1")
+            )
+            duplicate = post("delivery-1")
+            assert duplicate.status_code == 200
+            assert (
+                duplicate.headers["X-Hub-Delivery"]
+                == original.headers["X-Hub-Delivery"]
+            )
+            assert len(receiver.calls) == 1
+
+            assert post("delivery-2").status_code == 202
+            assert len(receiver.calls) == 2
+            delivery = db.session.get(
+                EventDelivery, ("test-receiver-delivery", "delivery-1")
+            )
+            assert str(delivery.event_id) == original.headers["X-Hub-Delivery"]
+
+
+def test_webhook_post_redelivery_scope(app, tester_id, access_token, receiver):
+    """Redeliveries are only reported to signed requests of the same user."""
+
+    class TestReceiverDelivery(receiver):
+        delivery_header = "X-GitHub-Delivery"
+        signature = "X-Hub-Signature"
+
+    with app.app_context():
+        datastore = app.extensions["security"].datastore
+        other = datastore.create_user(
+            email="other@inveniosoftware.org", password=None, active=True
+        )
+        datastore.commit()
+        other_token = Token.create_personal(
+            "test-personal-other", other.id, scopes=["webhooks:event"]
+        ).access_token
+        db.session.commit()
+
+    body = json.dumps({"somekey": "somevalue"})
+    with app.test_request_context():
+        current_webhooks.register("test-receiver-delivery", TestReceiverDelivery)
+        receiver = current_webhooks.receivers["test-receiver-delivery"]
+        with app.test_client() as client:
+
+            def post(token, signature):
+                return client.post(
+                    url_for(
+                        "invenio_webhooks.event_list",
+                        receiver_id="test-receiver-delivery",
+                        access_token=token,
+                    ),
+                    data=body,
+                    headers=[
+                        ("Content-Type", "application/json"),
+                        ("X-GitHub-Delivery", "delivery-1"),
+                        ("X-Hub-Signature", signature),
+                    ],
+                )
+
+            signature = "sha1=" + get_hmac(body)
+            assert post(access_token, signature).status_code == 202
+            assert post(access_token, signature).status_code == 200
+
+            # Unsigned redeliveries do not learn about the original event.
+            response = post(access_token, "sha1=invalid")
+            assert response.status_code == 500
+            assert "X-Hub-Delivery" not in response.headers
+
+            # Nor do other users.
+            response = post(other_token, signature)
+            assert response.status_code == 409
+            assert "X-Hub-Delivery" not in response.headers
+            assert len(receiver.calls) == 1
+
+
+def test_webhook_post_redelivery_session(app, tester_id, receiver):
+    """Redeliveries of a user logged in with a session are recognized."""
+
+    class TestReceiverDelivery(receiver):
+        delivery_header = "X-GitHub-Delivery"
+
+    with app.app_context():
+        tester = app.extensions["security"].datastore.get_user(tester_id)
+        session_id = tester.get_id()
+
+    with app.test_request_context():
+        current_webhooks.register("test-receiver-delivery", TestReceiverDelivery)
+        url = url_for(
+            "invenio_webhooks.event_list", receiver_id="test-receiver-delivery"
+        )
+        with app.test_client() as client:
+            with client.session_transaction() as session:
+                session["_user_id"] = session_id
+                session["_fresh"] = True
+
+            def post():
+                return client.post(
+                    url,
+                    json={"somekey": "somevalue"},
+                    headers={"X-GitHub-Delivery": "delivery-1"},
+                )
+
+            response = post()
+            assert response.status_code == 202
+            event_id = response.headers["X-Hub-Delivery"]
+            response = post()
+            assert response.status_code == 200
+            assert response.headers["X-Hub-Delivery"] == event_id
+
+            # Redeliveries missing the delivery cache are read from the database.
+            del current_webhooks.delivery_cache
+            response = post()
+            assert response.status_code == 200
+            assert response.headers["X-Hub-Delivery"] == event_id
+
+
+def test_event_list(app, tester_id, access_token, receiver):
+    with app.app_context():
+        for i in range(5):
+            event = Event(
+                id=uuid.uuid4(),
+                receiver_id="test-receiver",
+                user_id=tester_id,
+                payload={"index": i},
+                created=datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(days=i),
+            )
+            db.session.add(event)
+        db.session.add(Event(id=uuid.uuid4(), receiver_id="test-receiver"))
+        db.session.commit()
+
+    with app.test_request_context(), app.test_client() as client:
+        make_request(
+            access_token,
+            client.get,
+            "invenio_webhooks.event_list",
+            urlargs={"receiver_id": "unknown-receiver"},
+            code=404,
+        )
+        make_request(
+            access_token,
+            client.get,
+            "invenio_webhooks.event_list",
+            urlargs={"receiver_id": "test-receiver", "after": "invalid"},
+            code=400,
+        )
+
+        created = []
+        urlargs = {"receiver_id": "test-receiver", "size": 2}
+        while True:
+            response = make_request(
+                access_token,
+                client.get,
+                "invenio_webhooks.event_list",
+                urlargs=urlargs,
+                code=200,
+            )
+            created += [hit["created"][:10] for hit in response.json["hits"]]
+            assert 'rel="self"' in response.headers["Link"]
+            if 'rel="next"' not in response.headers["Link"]:
+                break
+            next_url = response.headers["Link"].split(", ")[-1]
+            urlargs = dict(parse_qsl(urlsplit(next_url[1:].split(">")[0]).query))
+            urlargs["receiver_id"] = "test-receiver"
+        assert created == [f"2026-01-0{i}" for i in range(5, 0, -1)]
+
+        response = make_request(
+            access_token,
+            client.get,
+            "invenio_webhooks.event_list",
+            urlargs={"receiver_id": "test-receiver", "format": "ndjson"},
+            code=200,
+        )
+        assert response.mimetype == "application/x-ndjson"
+        lines = response.get_data(as_text=True).splitlines()
+        assert [json.loads(line)["created"][:10] for line in lines] == created
+
+
+def test_event_statuses(app, tester_id, access_token, monkeypatch):
+    class TestCeleryReceiver(CeleryReceiver):
+        def run(self, event):
+            pass
+
+    with app.test_request_context(), app.test_client() as client:
+        current_webhooks.register("test-celery-receiver", TestCeleryReceiver)
+        event_ids = [
+            make_request(
+                access_token,
+                client.post,
+                "invenio_webhooks.event_list",
+                urlargs={"receiver_id": "test-celery-receiver"},
+                data={"index": i},
+                code=202,
+            ).headers["X-Hub-Delivery"]
+            for i in range(3)
+        ]
+
+        backend = current_celery_app.backend
+        backend.store_result(event_ids[0], None, "SUCCESS")
+        mget_calls = []
+        mget = backend.mget
+        monkeypatch.setattr(
+            backend, "mget", lambda keys: mget_calls.append(keys) or mget(keys)
+        )
+        monkeypatch.setattr("invenio_webhooks.models.AsyncResult", None)
+
+        unknown_id = str(uuid.uuid4())
+        response = make_request(
+            access_token,
+            client.post,
+            "invenio_webhooks.event_statuses",
+            urlargs={"receiver_id": "test-celery-receiver"},
+            data={"ids": event_ids + [unknown_id]},
+            code=200,
+        )
+        assert [(hit["id"], hit["status"]) for hit in response.json["hits"]] == [
+            (event_ids[0], 201),
+            (event_ids[1], 202),
+            (event_ids[2], 202),
+            (unknown_id, 404),
+        ]
+        assert len(mget_calls) == 1
+
+        for data in [{"ids": ["invalid"]}, {"ids": "invalid"}, ["invalid"]]:
+            make_request(
+                access_token,
+                client.post,
+                "invenio_webhooks.event_statuses",
+                urlargs={"receiver_id": "test-celery-receiver"},
+                data=data,
+                code=400,
+            )
+
+
 def test_webhook_post_no_token(app, tester_id, receiver):
     ds = app.extensions["security"].datastore
 
@@ -177,10 +499,8 @@ def test_webhook_post_no_token(app, tester_id, receiver):
 def test_405_methods_no_scope(app, tester_id, access_token_no_scope):
     with app.test_request_context(), app.test_client() as client:
         methods = [
-            client.get,
             client.put,
             client.delete,
-            client.head,
             client.options,
             client.patch,
         ]
@@ -277,3 +597,105 @@ def test_event_api(app, tester_id, access_token, receiver):
                 data=payload,
                 code=410,
             )
+
+
+def test_event_conditional_get(app, tester_id, access_token, receiver):
+    with app.test_request_context(), app.test_client() as client:
+        response = make_request(
+            access_token,
+            client.post,
+            "invenio_webhooks.event_list",
+            urlargs={"receiver_id": "test-receiver"},
+            data={"somekey": "somevalue"},
+            code=202,
+        )
+        urlargs = {
+            "receiver_id": response.headers["X-Hub-Event"],
+            "event_id": response.headers["X-Hub-Delivery"],
+        }
+
+        url = url_for(
+            "invenio_webhooks.event_item", access_token=access_token, **urlargs
+        )
+
+        def get(headers=None, code=None):
+            response = client.get(url, headers=headers or [])
+            assert response.status_code == code
+            return response
+
+        response = get(code=202)
+        etag = response.headers["ETag"]
+        assert "Last-Modified" not in response.headers
+        assert get([("If-None-Match", etag)], code=304).data == b""
+        assert get([("If-None-Match", '"other"')], code=202).json
+        # Status changes do not always update the event.
+        get([("If-Modified-Since", "Fri, 01 Jan 2100 00:00:00 GMT")], code=202)
+
+        event = Event.query.get(urlargs["event_id"])
+        event.response_code = 201
+        event.response = {"status": 201, "message": "Done."}
+        db.session.commit()
+
+        response = get([("If-None-Match", etag)], code=201)
+        assert response.headers["ETag"] != etag
+        assert response.headers["X-Hub-Info"] == "Done."
+
+
+def test_event_status_wait_and_stream(app, tester_id, access_token):
+    class TestCeleryReceiver(CeleryReceiver):
+        task_state_tracking = True
+
+    app.config["WEBHOOKS_STATUS_BROKER"] = "local"
+
+    def finish(event_id):
+        with app.app_context():
+            event = Event.query.get(event_id)
+            event.set_task_state("SUCCESS")
+            db.session.commit()
+            event.publish_status("SUCCESS")
+
+    with app.test_request_context(), app.test_client() as client:
+        current_webhooks.register("test-celery-receiver", TestCeleryReceiver)
+        event_ids = []
+        for _ in range(2):
+            event = Event(
+                id=uuid.uuid4(),
+                receiver_id="test-celery-receiver",
+                user_id=tester_id,
+            )
+            db.session.add(event)
+            event_ids.append(str(event.id))
+        db.session.commit()
+
+        urlargs = {"receiver_id": "test-celery-receiver", "access_token": access_token}
+        url = url_for("invenio_webhooks.event_item", event_id=event_ids[0], **urlargs)
+        etag = client.get(url).headers["ETag"]
+
+        response = client.get(url + "&wait=0.1", headers=[("If-None-Match", etag)])
+        assert response.status_code == 304
+
+        def publish(event_id):
+            with app.app_context():
+                current_webhooks.status_broker.publish(
+                    status_channel(event_id), {"state": "STARTED"}
+                )
+
+        # Messages which do not change the status keep the request waiting.
+        threading.Timer(0.05, publish, [event_ids[0]]).start()
+        threading.Timer(0.2, finish, [event_ids[0]]).start()
+        response = client.get(url + "&wait=10", headers=[("If-None-Match", etag)])
+        assert response.status_code == 201
+        assert response.headers["ETag"] != etag
+
+        threading.Timer(0.1, finish, [event_ids[1]]).start()
+        response = client.get(
+            url_for("invenio_webhooks.event_stream", event_id=event_ids[1], **urlargs)
+        )
+        assert response.mimetype == "text/event-stream"
+        messages = [
+            json.loads(line[len("data: ") :])
+            for line in response.get_data(as_text=True).splitlines()
+            if line.startswith("data: ")
+        ]
+        assert [m["status"] for m in messages] == [202, 201]
+        assert messages[1]["state"] == "SUCCESS"
@@ -0,0 +1,79 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Event buffer tests."""
+
+import threading
+
+from invenio_db import db
+from sqlalchemy.exc import IntegrityError
+
+from invenio_webhooks.buffer import EventBuffer
+from invenio_webhooks.models import Event
+
+
+def test_event_buffer_flush_on_size(app, receiver):
+    """Events are inserted together once the batch is full."""
+    buffer = EventBuffer(max_size=3, max_wait=10)
+    event_ids = []
+
+    def add_event():
+        with app.test_request_context(method="POST", data={"foo": "bar"}):
+            event = Event.create(receiver_id="test-receiver")
+            buffer.add(event)
+            assert event.response_code == 202
+            event_ids.append(event.id)
+
+    threads = [threading.Thread(target=add_event) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(event_ids) == 3
+    with app.app_context():
+        events = Event.query.filter(Event.id.in_(event_ids)).all()
+        assert {e.payload["foo"] for e in events} == {"bar"}
+        assert all(e.created for e in events)
+
+
+def test_event_buffer_flush_on_timeout(app, receiver):
+    """A partial batch is flushed after the maximum wait."""
+    buffer = EventBuffer(max_size=100, max_wait=0.01)
+    with app.test_request_context(method="POST", data={"foo": "bar"}):
+        event = Event.create(receiver_id="test-receiver")
+        buffer.add(event)
+        event.response_code = 500
+        db.session.commit()
+        event_id = event.id
+
+    with app.app_context():
+        assert Event.query.get(event_id).response_code == 500
+
+
+def test_event_buffer_constraint_violation(app, receiver):
+    """Only events violating a constraint fail when a batch is flushed."""
+    receiver.delivery_header = "X-GitHub-Delivery"
+    buffer = EventBuffer(max_size=2, max_wait=10)
+    results = []
+
+    def add_event():
+        with app.test_request_context(
+            method="POST",
+            data={"foo": "bar"},
+            headers=[("X-GitHub-Delivery", "delivery-1")],
+        ):
+            event = Event.create(receiver_id="test-receiver")
+            try:
+                buffer.add(event)
+                results.append("ok")
+            except IntegrityError:
+                results.append("error")
+
+    threads = [threading.Thread(target=add_event) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert sorted(results) == ["error", "ok"]
@@ -0,0 +1,341 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""CLI and maintenance tests."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from celery import states
+from celery.result import AsyncResult, EagerResult
+from invenio_db import db
+
+from invenio_webhooks.api import get_events_query, purge_events, reprocess_events
+from invenio_webhooks.cli import webhooks
+from invenio_webhooks.loadtest import LoadTestResult
+from invenio_webhooks.models import CeleryReceiver, Event, EventDelivery, Receiver
+from invenio_webhooks.partitions import (
+    add_months,
+    create_partitions,
+    drop_partitions,
+    get_partition_cutoff,
+    is_partitioned,
+    month_start,
+    partition_name,
+)
+from invenio_webhooks.proxies import current_webhooks
+from invenio_webhooks.tasks import maintain_partitions, purge_expired_events
+
+
+def create_events(receiver_id, ages):
+    """Create events created the given number of days ago."""
+    now = datetime.now(tz=timezone.utc)
+    for days in ages:
+        db.session.add(
+            Event(
+                id=uuid.uuid4(),
+                receiver_id=receiver_id,
+                payload={"days": days},
+                created=now - timedelta(days=days),
+            )
+        )
+    db.session.commit()
+
+
+def test_purge_events(app, receiver):
+    """Test purging of events in batches."""
+    with app.app_context():
+        create_events("test-receiver", [0, 1, 10, 11, 12, 13, 14])
+        for event in Event.query:
+            event.delivery = EventDelivery(
+                receiver_id=event.receiver_id, delivery_id=str(event.payload["days"])
+            )
+        db.session.commit()
+        before = datetime.now(tz=timezone.utc) - timedelta(days=5)
+        assert list(purge_events(before, batch_size=2, sleep=0)) == [2, 2, 1]
+        assert sorted(e.payload["days"] for e in Event.query) == [0, 1]
+        assert sorted(d.delivery_id for d in EventDelivery.query) == ["0", "1"]
+
+
+def test_purge_expired_events(app, receiver):
+    """Test purging of events according to the retention configuration."""
+    app.config["WEBHOOKS_EVENTS_RETENTION"] = {"test-receiver": timedelta(days=5)}
+    with app.app_context():
+        create_events("test-receiver", [0, 10])
+        purge_expired_events.delay()
+        assert [e.payload["days"] for e in Event.query] == [0]
+
+
+def test_purge_cli(app, receiver):
+    """Test purge command."""
+    with app.app_context():
+        create_events("test-receiver", [0, 10, 20])
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(webhooks, ["purge"])
+    assert result.exit_code == 1
+    assert "No retention period is configured" in result.output
+
+    result = runner.invoke(
+        webhooks,
+        ["purge", "--receiver", "test-receiver", "--older-than", "15"],
+    )
+    assert result.exit_code == 0
+    assert "Deleted 1 events of test-receiver" in result.output
+    assert "rows/s" in result.output
+
+    app.config["WEBHOOKS_EVENTS_RETENTION_DEFAULT"] = timedelta(days=5)
+    result = runner.invoke(webhooks, ["purge", "--batch-size", "1", "--sleep", "0"])
+    assert result.exit_code == 0
+    with app.app_context():
+        assert [e.payload["days"] for e in Event.query] == [0]
+
+
+def test_partition_helpers(app):
+    """Test computation of monthly partitions."""
+    month = month_start(datetime(2026, 12, 17, 23, 30, tzinfo=timezone.utc))
+    assert month == datetime(2026, 12, 1)
+    assert add_months(month, 1) == datetime(2027, 1, 1)
+    assert add_months(month, -12) == datetime(2025, 12, 1)
+    assert partition_name(month) == "webhooks_events_p202612"
+
+    now = datetime(2026, 10, 17, tzinfo=timezone.utc)
+    with app.app_context():
+        assert get_partition_cutoff(now) is None
+        app.config["WEBHOOKS_EVENTS_RETENTION_DEFAULT"] = timedelta(days=30)
+        app.config["WEBHOOKS_EVENTS_RETENTION"] = {"test": timedelta(days=90)}
+        assert get_partition_cutoff(now) == now - timedelta(days=90)
+
+
+def test_partitions_cli_unpartitioned(app, receiver):
+    """Test that partition maintenance is a no-op on a single table."""
+    with app.app_context():
+        create_events("test-receiver", [0, 400])
+        assert not is_partitioned()
+        assert create_partitions() == []
+        assert drop_partitions(datetime.now(tz=timezone.utc)) == []
+        maintain_partitions.delay()
+
+    result = app.test_cli_runner().invoke(webhooks, ["partitions", "--older-than", "1"])
+    assert result.exit_code == 0
+    assert "not partitioned" in result.output
+    with app.app_context():
+        assert Event.query.count() == 2
+
+
+def test_loadtest(app, receiver, access_token, tmp_path):
+    """Test replaying payloads against a receiver."""
+    app.config["WEBHOOKS_SECRET_KEY"] = "secret"
+    receiver.signature = "X-Hub-Signature-256"
+    receiver.delivery_header = "X-GitHub-Delivery"
+    corpus = tmp_path / "corpus.ndjson"
+    corpus.write_text('{"index": 0}\n\n{"index": 1}\n')
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(
+        webhooks,
+        [
+            "loadtest",
+            "test-receiver",
+            "--corpus",
+            str(corpus),
+            "--requests",
+            "5",
+            "--concurrency",
+            "2",
+            "--token",
+            access_token,
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Sent 5 requests" in result.output
+    assert "202: 5" in result.output
+    assert "p99=" in result.output
+    with app.app_context():
+        assert Event.query.filter_by(receiver_id="test-receiver").count() == 5
+        assert len({event.delivery_id for event in Event.query}) == 5
+
+    # Replay of the stored events
+    result = runner.invoke(
+        webhooks, ["loadtest", "test-receiver", "--rate", "1000", "--token", "x"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "401: 5" in result.output
+
+    result = runner.invoke(webhooks, ["loadtest", "unknown", "--token", "x"])
+    assert result.exit_code == 2
+
+    for option in ("--requests", "--concurrency"):
+        result = runner.invoke(
+            webhooks, ["loadtest", "test-receiver", option, "0", "--token", "x"]
+        )
+        assert result.exit_code == 2
+
+
+def test_loadtest_result():
+    """Test latency percentiles and histogram."""
+    result = LoadTestResult()
+    for latency in [0.0005, 0.001, 0.003, 0.003, 0.02]:
+        result.add(202, latency)
+    assert result.percentile(50) == 0.003
+    assert result.percentile(99) == 0.02
+    assert result.histogram() == [
+        (0.001, 2),
+        (0.002, 0),
+        (0.004, 2),
+        (0.008, 0),
+        (0.016, 0),
+        (0.032, 1),
+    ]
+
+
+class FixingReceiver(Receiver):
+    """Receiver answering all events with 200."""
+
+    def run(self, event):
+        """Process an event."""
+        event.response_code = 200
+
+
+def create_failed_events(receiver_id, codes):
+    """Create events with the given response codes, one day apart."""
+    now = datetime.now(tz=timezone.utc)
+    for days, code in enumerate(codes):
+        db.session.add(
+            Event(
+                id=uuid.uuid4(),
+                receiver_id=receiver_id,
+                payload={"days": days},
+                response_code=code,
+                created=now - timedelta(days=days),
+            )
+        )
+    db.session.commit()
+
+
+def test_reprocess_events(app, monkeypatch):
+    """Test reprocessing of events through Celery."""
+    app.extensions["invenio-webhooks"].register("fixing-receiver", FixingReceiver)
+    app.config["WEBHOOKS_REPROCESS_POLL_INTERVAL"] = 0
+    ready = iter([False, True])
+    monkeypatch.setattr(EagerResult, "ready", lambda self: next(ready))
+    with app.app_context():
+        create_failed_events("fixing-receiver", [500, 500, 202, 500, 500])
+        query = get_events_query(
+            receiver_id="fixing-receiver",
+            since=datetime.now(tz=timezone.utc) - timedelta(days=3, hours=1),
+            response_codes=[500],
+        )
+        assert len(db.session.execute(query).all()) == 3
+
+        chunks = list(
+            reprocess_events(
+                query, receiver_id="fixing-receiver", chunk_size=2, concurrency=1
+            )
+        )
+        assert chunks == [(2, 0), (1, 0)]
+        assert next(ready, None) is None
+        codes = sorted(event.response_code for event in Event.query)
+        assert codes == [200, 200, 200, 202, 500]
+
+
+def test_reprocess_events_query(app, receiver):
+    """Test selection of events by task state and of deleted events."""
+    now = datetime.now(tz=timezone.utc)
+    rows = [
+        ("failed", 202, states.FAILURE),
+        ("succeeded", 202, states.SUCCESS),
+        ("pending", 202, None),
+        ("error", 500, None),
+        ("deleted", 410, None),
+        ("revoked", 410, states.REVOKED),
+    ]
+    with app.app_context():
+        ids = {}
+        for name, code, state in rows:
+            ids[name] = uuid.uuid4()
+            db.session.add(
+                Event(
+                    id=ids[name],
+                    receiver_id="test-receiver",
+                    response_code=code,
+                    task_state=state,
+                    created=now,
+                )
+            )
+        db.session.commit()
+
+        def select_names(**kwargs):
+            selected = set(db.session.execute(get_events_query(**kwargs)).scalars())
+            return {name for name, event_id in ids.items() if event_id in selected}
+
+        assert select_names(response_codes=[500]) == {"failed", "error"}
+        assert select_names(response_codes=[202]) == {"pending"}
+        assert select_names() == {"failed", "succeeded", "pending", "error"}
+        assert select_names(include_deleted=True) == set(ids)
+        assert select_names(response_codes=[500], include_deleted=True) == {
+            "failed",
+            "error",
+            "deleted",
+            "revoked",
+        }
+
+
+def test_reprocess_untracked_celery_events(app):
+    """Test that previous task results of untracked events are discarded."""
+
+    class TestCeleryReceiver(CeleryReceiver):
+        task_state_tracking = False
+
+        def run(self, event):
+            event.response["message"] = "processed"
+
+    app.config["WEBHOOKS_STATUS_CACHE"] = "memory"
+    app.extensions["invenio-webhooks"].register(
+        "test-celery-receiver", TestCeleryReceiver
+    )
+    with app.test_request_context(method="POST", json={"foo": "bar"}):
+        event = Event.create(receiver_id="test-celery-receiver")
+        db.session.add(event)
+        db.session.commit()
+        AsyncResult(str(event.id)).backend.mark_as_failure(
+            str(event.id), ValueError("failed")
+        )
+        assert event.status[0] == 500
+        assert current_webhooks.status_cache.get(f"webhooks:status:{event.id}")
+
+        chunks = list(reprocess_events(get_events_query(), concurrency=1))
+        assert chunks == [(1, 0)]
+        assert AsyncResult(str(event.id)).state == states.PENDING
+        assert current_webhooks.status_cache.get(f"webhooks:status:{event.id}") is None
+        event = Event.query.get(event.id)
+        assert event.status == (202, "processed")
+
+
+def test_reprocess_cli(app):
+    """Test reprocessing of events in a local process pool."""
+    app.extensions["invenio-webhooks"].register("fixing-receiver", FixingReceiver)
+    with app.app_context():
+        create_failed_events("fixing-receiver", [500, 500, 202])
+
+    result = app.test_cli_runner().invoke(
+        webhooks,
+        [
+            "reprocess",
+            "--receiver",
+            "fixing-receiver",
+            "--response-code",
+            "500",
+            "--chunk-size",
+            "1",
+            "--concurrency",
+            "2",
+            "--local",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Processed 2/2 events..." in result.output
+    assert "Processed 2 events in" in result.output
+    with app.app_context():
+        codes = sorted(event.response_code for event in Event.query)
+        assert codes == [200, 200, 202]
@@ -8,7 +8,11 @@ import pytest
 from flask import Flask, url_for
 from invenio_db import db
 
-from invenio_webhooks import InvenioWebhooks
+from invenio_webhooks import InvenioWebhooks, Receiver
+from invenio_webhooks.errors import (
+    ReceiverDoesNotExist,
+    SignatureValidatorDoesNotExist,
+)
 
 
 def test_version():
@@ -31,6 +35,72 @@ def test_init():
     assert "invenio-webhooks" in app.extensions
 
 
+def test_lazy_receivers(monkeypatch):
+    """Test that receivers are imported on first access."""
+    loaded = []
+
+    class SlowEntryPoint:
+        def __init__(self, name):
+            self.name = name
+
+        def load(self):
+            loaded.append(self.name)
+            return Receiver
+
+    def entry_points(group):
+        if group != "invenio_webhooks.receivers":
+            return []
+        return [SlowEntryPoint("first"), SlowEntryPoint("second")]
+
+    monkeypatch.setattr("invenio_webhooks.ext.entry_points", entry_points)
+
+    app = Flask("testapp")
+    app.config["WEBHOOKS_PRELOAD_RECEIVERS"] = []
+    InvenioWebhooks(app)
+    assert loaded == []
+
+    receivers = app.extensions["invenio-webhooks"].receivers
+    assert "first" in receivers
+    assert len(receivers) == 2
+    assert loaded == []
+    assert receivers["first"].receiver_id == "first"
+    assert receivers["first"] is receivers["first"]
+    assert loaded == ["first"]
+
+    del receivers["second"]
+    assert "second" not in receivers
+    assert loaded == ["first"]
+
+    app = Flask("testapp")
+    InvenioWebhooks(app)
+    assert loaded == ["first", "first", "second"]
+
+    app = Flask("testapp")
+    app.config["WEBHOOKS_PRELOAD_RECEIVERS"] = ["unknown"]
+    with pytest.raises(ReceiverDoesNotExist):
+        InvenioWebhooks(app)
+
+
+def test_unknown_signature_at_startup(monkeypatch):
+    """Test that unknown signature schemes fail when the app starts."""
+
+    class UnknownSignatureReceiver(Receiver):
+        signature = "X-Unknown-Signature"
+
+    class EntryPoint:
+        name = "unknown-signature"
+
+        def load(self):
+            return UnknownSignatureReceiver
+
+    def entry_points(group):
+        return [EntryPoint()] if group == "invenio_webhooks.receivers" else []
+
+    monkeypatch.setattr("invenio_webhooks.ext.entry_points", entry_points)
+    with pytest.raises(SignatureValidatorDoesNotExist):
+        InvenioWebhooks(Flask("testapp"))
+
+
 @pytest.mark.skip("caused by missing key")
 def test_alembic(app):
     """Test alembic recipes."""
@@ -58,7 +128,7 @@ def test_view(app, receiver):
 
     with app.test_client() as client:
         res = client.get(view_url)
-        assert res.status_code == 405
+        assert res.status_code == 401
 
         res = client.post(view_url)
         assert res.status_code == 401
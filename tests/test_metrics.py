@@ -0,0 +1,187 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Metrics tests."""
+
+import time
+
+import pytest
+from flask import url_for
+from invenio_db import db
+
+from invenio_webhooks.metrics import Metrics, PrometheusMetrics, TimingMetrics
+from invenio_webhooks.models import CeleryReceiver, Event, process_event
+from invenio_webhooks.proxies import current_webhooks
+
+
+class RecordingMetrics(TimingMetrics):
+    """Metrics hook keeping all measurements."""
+
+    def __init__(self):
+        """Initialize measurements."""
+        self.stages = []
+        self.responses = []
+
+    def observe(self, stage, receiver_id, seconds):
+        """Record the duration of a stage."""
+        assert seconds >= 0
+        self.stages.append((stage, receiver_id))
+
+    def count_response(self, receiver_id, status_code):
+        """Record the status code of a response."""
+        self.responses.append((receiver_id, status_code))
+
+
+def test_noop_metrics():
+    """Test that the default hook discards measurements."""
+    metrics = Metrics()
+    with metrics.timer("run", "receiver"):
+        pass
+    metrics.observe("run", "receiver", 1.0)
+    metrics.count_response("receiver", 500)
+
+
+def test_metrics(app, tester_id, access_token):
+    """Test stage timings and error counters."""
+
+    class TestCeleryReceiver(CeleryReceiver):
+        def run(self, event):
+            pass
+
+    metrics = RecordingMetrics()
+    app.config["WEBHOOKS_METRICS"] = metrics
+
+    with app.test_request_context(), app.test_client() as client:
+        assert current_webhooks.metrics is metrics
+        current_webhooks.register("test-celery-receiver", TestCeleryReceiver)
+        for receiver_id, code in [
+            ("test-celery-receiver", 202),
+            ("unknown-receiver", 404),
+        ]:
+            response = client.post(
+                url_for(
+                    "invenio_webhooks.event_list",
+                    receiver_id=receiver_id,
+                    access_token=access_token,
+                ),
+                json={"somekey": "somevalue"},
+            )
+            assert response.status_code == code
+
+    assert [stage for stage, _ in metrics.stages] == [
+        "signature",
+        "extract_payload",
+        "insert",
+        "queue_wait",
+        "run",
+        "dispatch",
+    ]
+    assert {receiver_id for _, receiver_id in metrics.stages} == {
+        "test-celery-receiver"
+    }
+    assert metrics.responses == [("unknown", 404)]
+
+
+def test_queue_wait(app):
+    """Test that the queue wait is measured from the first sending."""
+
+    class TestCeleryReceiver(CeleryReceiver):
+        def run(self, event):
+            pass
+
+    metrics = RecordingMetrics()
+    app.config["WEBHOOKS_METRICS"] = metrics
+    waits = []
+    metrics.observe = lambda stage, receiver_id, seconds: (
+        waits.append(seconds) if stage == "queue_wait" else None
+    )
+
+    with app.test_request_context(method="POST", json={"foo": "bar"}):
+        current_webhooks.register("test-celery-receiver", TestCeleryReceiver)
+        event = Event.create(receiver_id="test-celery-receiver")
+        db.session.add(event)
+        db.session.commit()
+        event_id = str(event.id)
+
+        # Reprocessed events are not sent with the sending time.
+        process_event.apply(args=[event_id])
+        assert waits == []
+        process_event.apply(args=[event_id], kwargs={"sent_at": time.time() - 5})
+        assert len(waits) == 1 and 5 <= waits[0] < 60
+        process_event.apply(
+            args=[event_id], kwargs={"sent_at": time.time() - 5}, retries=1
+        )
+        assert len(waits) == 1
+
+
+def test_server_timing(app, receiver, access_token):
+    """Test the Server-Timing header."""
+    with app.test_request_context(), app.test_client() as client:
+        url = url_for(
+            "invenio_webhooks.event_list",
+            receiver_id="test-receiver",
+            access_token=access_token,
+        )
+        response = client.post(url, json={"somekey": "somevalue"})
+        assert response.status_code == 202
+        assert "Server-Timing" not in response.headers
+
+        app.config["WEBHOOKS_SERVER_TIMING"] = True
+        del current_webhooks.metrics
+
+        response = client.post(url, json={"somekey": "somevalue"})
+        assert response.status_code == 202
+        stages = [
+            timing.split(";")[0]
+            for timing in response.headers["Server-Timing"].split(", ")
+        ]
+        assert stages == [
+            "auth",
+            "signature",
+            "extract_payload",
+            "insert",
+            "dispatch",
+        ]
+        assert all(
+            float(timing.split(";dur=")[1]) >= 0
+            for timing in response.headers["Server-Timing"].split(", ")
+        )
+
+        response = client.post(url, data="text", content_type="text/plain")
+        assert response.status_code == 415
+        assert response.headers["Server-Timing"].startswith("auth;dur=")
+
+
+def test_prometheus_metrics():
+    """Test the Prometheus exporter."""
+    prometheus_client = pytest.importorskip("prometheus_client")
+    registry = prometheus_client.CollectorRegistry()
+    metrics = PrometheusMetrics(registry=registry)
+
+    with metrics.timer("run", "test-receiver"):
+        pass
+    metrics.count_response("test-receiver", 503)
+
+    labels = {"stage": "run", "receiver_id": "test-receiver"}
+    assert (
+        registry.get_sample_value("webhooks_stage_duration_seconds_count", labels) == 1
+    )
+    assert (
+        registry.get_sample_value(
+            "webhooks_error_responses_total",
+            {"receiver_id": "test-receiver", "status": "5xx"},
+        )
+        == 1
+    )
+
+    # Metrics of another application share the collectors of the registry.
+    other = PrometheusMetrics(registry=registry)
+    assert other.durations is metrics.durations
+    other.count_response("test-receiver", 502)
+    assert (
+        registry.get_sample_value(
+            "webhooks_error_responses_total",
+            {"receiver_id": "test-receiver", "status": "5xx"},
+        )
+        == 2
+    )
@@ -0,0 +1,120 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Partitioning tests, which require PostgreSQL."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from invenio_db import db
+from sqlalchemy.exc import IntegrityError
+
+from invenio_webhooks.cli import webhooks
+from invenio_webhooks.models import Event, EventDelivery
+from invenio_webhooks.partitions import (
+    TABLE,
+    _get_constraints,
+    add_months,
+    create_partitions,
+    drop_partitions,
+    get_partitions,
+    is_partitioned,
+    month_start,
+    partition_name,
+)
+
+
+@pytest.fixture
+def pg_app(app):
+    """Application fixture skipping tests on other databases."""
+    with app.app_context():
+        if db.engine.name != "postgresql":
+            pytest.skip("Partitioning is only supported on PostgreSQL.")
+    return app
+
+
+def create_event(created, delivery_id):
+    """Create an event and its delivery at a given date."""
+    event_id = uuid.uuid4()
+    db.session.add(
+        Event(
+            id=event_id,
+            receiver_id="test-receiver",
+            payload={"delivery": delivery_id},
+            delivery_id=delivery_id,
+            created=created,
+        )
+    )
+    db.session.add(
+        EventDelivery(
+            receiver_id="test-receiver",
+            delivery_id=delivery_id,
+            event_id=event_id,
+            created=created,
+        )
+    )
+    db.session.commit()
+    return event_id
+
+
+def get_primary_key(connection):
+    """Return the primary key definition of the events table."""
+    return dict(_get_constraints(connection, TABLE, ["p"]))["pk_webhooks_events"]
+
+
+def test_partitioning(pg_app, receiver):
+    """Test conversion, maintenance and unpartitioning of the events table."""
+    app = pg_app
+    runner = app.test_cli_runner()
+    current = month_start(datetime.now(tz=timezone.utc))
+    months = [add_months(current, -2), add_months(current, -1), current]
+    with app.app_context():
+        for index, month in enumerate(months):
+            create_event(
+                (month + timedelta(days=1)).replace(tzinfo=timezone.utc),
+                f"delivery-{index}",
+            )
+
+    result = runner.invoke(webhooks, ["partitions"])
+    assert result.exit_code == 0
+    assert "not partitioned" in result.output
+
+    app.config["WEBHOOKS_EVENTS_PARTITIONING"] = True
+    result = runner.invoke(webhooks, ["partitions", "--months-ahead", "1"])
+    assert result.exit_code == 0, result.output
+    assert "Converted the events table" in result.output
+
+    with app.app_context():
+        connection = db.session.connection()
+        assert is_partitioned(connection)
+        assert get_primary_key(connection) == "PRIMARY KEY (id, created)"
+        assert sorted(get_partitions(connection)) == [
+            partition_name(month) for month in months + [add_months(current, 1)]
+        ]
+        assert Event.query.count() == 3
+
+        # Deliveries stay unique across partitions.
+        with pytest.raises(IntegrityError):
+            create_event(datetime.now(tz=timezone.utc), "delivery-0")
+        db.session.rollback()
+
+        assert create_partitions(months_ahead=2) == [
+            partition_name(add_months(current, 2))
+        ]
+        assert drop_partitions(add_months(current, -1)) == [partition_name(months[0])]
+        db.session.commit()
+        assert sorted(e.delivery_id for e in Event.query) == [
+            "delivery-1",
+            "delivery-2",
+        ]
+        assert EventDelivery.query.count() == 2
+        create_event(datetime.now(tz=timezone.utc), "delivery-0")
+
+    result = runner.invoke(webhooks, ["partitions", "--unpartition"])
+    assert result.exit_code == 0, result.output
+    with app.app_context():
+        connection = db.session.connection()
+        assert not is_partitioned(connection)
+        assert get_primary_key(connection) == "PRIMARY KEY (id)"
+        assert Event.query.count() == 3
@@ -0,0 +1,137 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Status broker tests."""
+
+import queue
+import sys
+import threading
+import types
+
+from invenio_db import db
+
+from invenio_webhooks.models import CeleryReceiver, Event
+from invenio_webhooks.proxies import current_webhooks
+from invenio_webhooks.pubsub import (
+    LocalBroker,
+    RedisBroker,
+    RedisSubscription,
+    status_channel,
+)
+
+
+def test_local_broker():
+    """Test in-process publish/subscribe."""
+    broker = LocalBroker()
+    broker.publish("channel", {"lost": True})
+
+    with broker.subscribe("channel") as first, broker.subscribe("channel") as second:
+        assert first.get(timeout=0) is None
+        broker.publish("other", {"other": True})
+        broker.publish("channel", {"index": 1})
+        assert first.get(timeout=0) == {"index": 1}
+        assert second.get(timeout=0) == {"index": 1}
+
+        threading.Timer(0.05, broker.publish, ["channel", {"index": 2}]).start()
+        assert first.get(timeout=5) == {"index": 2}
+
+    assert not broker._subscriptions
+
+
+class FakeRedis:
+    """Redis client delivering published messages in process."""
+
+    def __init__(self):
+        """Initialize client."""
+        self.pubsubs = []
+
+    @classmethod
+    def from_url(cls, url):
+        """Return a client."""
+        return cls()
+
+    def publish(self, channel, data):
+        """Send a message to all subscribed pubsubs."""
+        for pubsub in self.pubsubs:
+            if channel in pubsub.channels:
+                pubsub.messages.put({"type": "message", "data": data.encode()})
+
+    def pubsub(self):
+        """Return a new pubsub."""
+        pubsub = FakePubSub()
+        self.pubsubs.append(pubsub)
+        return pubsub
+
+
+class FakePubSub:
+    """Redis pubsub reading messages from a queue."""
+
+    def __init__(self):
+        """Initialize pubsub."""
+        self.channels = set()
+        self.messages = queue.SimpleQueue()
+        self.closed = False
+
+    def subscribe(self, channel):
+        """Subscribe to a channel."""
+        self.channels.add(channel)
+        self.messages.put({"type": "subscribe", "data": 1})
+
+    def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        """Return the next message, or ``None`` after ``timeout`` seconds."""
+        try:
+            message = self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if ignore_subscribe_messages and message["type"] == "subscribe":
+            return None
+        return message
+
+    def close(self):
+        """Close the pubsub."""
+        self.closed = True
+
+
+def test_redis_broker(monkeypatch):
+    """Test publish/subscribe through Redis."""
+    monkeypatch.setitem(sys.modules, "redis", types.SimpleNamespace(Redis=FakeRedis))
+    broker = RedisBroker("redis://localhost:6379/0")
+
+    with broker.subscribe("channel") as subscription:
+        assert isinstance(subscription, RedisSubscription)
+        # The subscribe confirmation is skipped until the timeout.
+        assert subscription.get(timeout=0.01) is None
+        broker.publish("other", {"other": True})
+        broker.publish("channel", {"index": 1})
+        assert subscription.get(timeout=1) == {"index": 1}
+
+        threading.Timer(0.05, broker.publish, ["channel", {"index": 2}]).start()
+        assert subscription.get(timeout=5) == {"index": 2}
+        assert subscription.get(timeout=0.01) is None
+    assert subscription._pubsub.closed
+
+
+def test_process_event_publishes_status(app):
+    """Test publishing of task state transitions by the processing task."""
+    app.config["WEBHOOKS_STATUS_BROKER"] = "local"
+
+    class TestCeleryReceiver(CeleryReceiver):
+        def run(self, event):
+            event.response = {"status": 201, "message": "Done."}
+
+    with app.test_request_context(method="POST", json={"foo": "bar"}):
+        current_webhooks.register("test-celery-receiver", TestCeleryReceiver)
+        event = Event.create(receiver_id="test-celery-receiver")
+        db.session.add(event)
+        db.session.commit()
+
+        with current_webhooks.status_broker.subscribe(
+            status_channel(event.id)
+        ) as subscription:
+            event.process()
+            messages = [subscription.get(timeout=0), subscription.get(timeout=0)]
+        assert [(m["state"], m["status"]) for m in messages] == [
+            ("STARTED", 202),
+            ("SUCCESS", 201),
+        ]
+        assert messages[1]["message"] == "Done."
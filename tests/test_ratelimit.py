@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Admission control tests."""
+
+import pytest
+from flask import url_for
+
+from invenio_webhooks.models import CeleryReceiver
+from invenio_webhooks.proxies import current_webhooks
+from invenio_webhooks.ratelimit import TokenBucketLimiter
+
+
+def test_token_bucket_limiter(monkeypatch):
+    """Test token bucket refill and retry delays."""
+    now = [100.0]
+    monkeypatch.setattr("invenio_webhooks.ratelimit.time.monotonic", lambda: now[0])
+    monkeypatch.setattr("invenio_webhooks.utils.time.monotonic", lambda: now[0])
+    limiter = TokenBucketLimiter()
+
+    assert [limiter.acquire("a", 2, 3) for _ in range(3)] == [0, 0, 0]
+    assert limiter.acquire("a", 2, 3) == pytest.approx(0.5)
+    assert limiter.acquire("b", 2, 3) == 0
+
+    now[0] += 0.5
+    assert limiter.acquire("a", 2, 3) == 0
+    assert limiter.acquire("a", 2, 3) == pytest.approx(0.5)
+
+    now[0] += 10
+    assert [limiter.acquire("a", 2, 3) for _ in range(4)][-1] > 0
+
+    limiter.release("a", 2, 3)
+    assert limiter.acquire("a", 2, 3) == 0
+    assert limiter.acquire("a", 2, 3) > 0
+
+    # Released tokens do not overflow the bucket.
+    limiter.release("c", 2, 3)
+    now[0] += 10
+    limiter.release("a", 2, 3)
+    assert [limiter.acquire("a", 2, 3) for _ in range(4)][-1] > 0
+
+    # Several tokens are taken and given back at once.
+    now[0] += 10
+    assert limiter.acquire("d", 2, 3, tokens=2) == 0
+    assert limiter.acquire("d", 2, 3, tokens=2) == pytest.approx(0.5)
+    limiter.release("d", 2, 3, tokens=2)
+    assert limiter.acquire("d", 2, 3, tokens=3) == 0
+
+
+def post(client, access_token, receiver_id):
+    """Post an event."""
+    return client.post(
+        url_for(
+            "invenio_webhooks.event_list",
+            receiver_id=receiver_id,
+            access_token=access_token,
+        ),
+        json={"somekey": "somevalue"},
+    )
+
+
+def test_rate_limits(app, tester_id, access_token, receiver):
+    """Test 429 responses of rate limited receivers and users."""
+    app.config["WEBHOOKS_RATE_LIMITS"] = {"test-receiver": (0.01, 2)}
+
+    with app.test_request_context(), app.test_client() as client:
+        assert post(client, access_token, "test-receiver").status_code == 202
+        assert post(client, access_token, "test-receiver").status_code == 202
+        response = post(client, access_token, "test-receiver")
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) > 1
+        assert post(client, access_token, "unknown-receiver").status_code == 404
+
+        # Requests rejected by the receiver do not take a token of the user.
+        app.config["WEBHOOKS_USER_RATE_LIMIT"] = (0.01, 1)
+        assert post(client, access_token, "test-receiver").status_code == 429
+
+        app.config["WEBHOOKS_RATE_LIMITS"] = {}
+        assert post(client, access_token, "test-receiver").status_code == 202
+        assert post(client, access_token, "test-receiver").status_code == 429
+
+
+def test_queue_depth(app, tester_id, access_token, receiver, monkeypatch):
+    """Test 503 responses while the Celery queue is backlogged."""
+
+    class TestCeleryReceiver(CeleryReceiver):
+        def run(self, event):
+            pass
+
+    depths = []
+    monkeypatch.setattr(
+        "invenio_webhooks.ratelimit.get_queue_depth",
+        lambda queue: depths.append(queue) or 100,
+    )
+    app.config.update(WEBHOOKS_MAX_QUEUE_DEPTH=50, WEBHOOKS_QUEUE_RETRY_AFTER=7)
+
+    with app.test_request_context(), app.test_client() as client:
+        current_webhooks.register("test-celery-receiver", TestCeleryReceiver)
+        for _ in range(2):
+            response = post(client, access_token, "test-celery-receiver")
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "7"
+        assert depths == ["celery"]
+
+        # Synchronous receivers do not depend on the queue.
+        assert post(client, access_token, "test-receiver").status_code == 202
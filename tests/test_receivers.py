@@ -2,21 +2,34 @@
 # SPDX-License-Identifier: MIT
 
 import json
+import zlib
 
 import pytest
+import sqlalchemy
 from flask import url_for
 from invenio_db import db
+from sqlalchemy import inspect, select, type_coerce
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.attributes import flag_modified
+from werkzeug.exceptions import BadRequest
 
+from invenio_webhooks.errors import SignatureValidatorDoesNotExist
 from invenio_webhooks.models import (
+    BatchingCeleryReceiver,
     CeleryReceiver,
     Event,
     InvalidPayload,
     InvalidSignature,
+    PayloadTooLarge,
     Receiver,
     ReceiverDoesNotExist,
+    process_event,
+    process_events,
 )
 from invenio_webhooks.proxies import current_webhooks
+from invenio_webhooks.routing import get_task_queues, route_task
 from invenio_webhooks.signatures import get_hmac
+from invenio_webhooks.utils import Batcher, TTLCache
 
 
 def test_run_must_be_implemeted():
@@ -160,6 +173,95 @@ def test_signature_checking(app, receiver):
         Event.create(receiver_id="test-receiver-sign")
 
 
+def test_signature_validator_registration(app, receiver):
+    """Signature validators are resolved when receivers are registered."""
+
+    class TestReceiverUnknown(receiver):
+        signature = "X-Unknown-Signature"
+
+    class TestReceiverToken(receiver):
+        signature = "X-Test-Token"
+
+    def check_x_test_token(signature, message):
+        return signature == "token"
+
+    with app.app_context():
+        with pytest.raises(SignatureValidatorDoesNotExist):
+            current_webhooks.register("test-receiver-unknown", TestReceiverUnknown)
+        assert "test-receiver-unknown" not in current_webhooks.receivers
+
+        current_webhooks.register_signature_validator(
+            "X-Test-Token", check_x_test_token
+        )
+        current_webhooks.register("test-receiver-token", TestReceiverToken)
+        assert (
+            current_webhooks.receivers["test-receiver-token"].signature_validator
+            is check_x_test_token
+        )
+
+    headers = [("Content-Type", "application/json"), ("X-Test-Token", "token")]
+    with app.test_request_context(headers=headers, data="{}"):
+        assert Event.create(receiver_id="test-receiver-token").payload == {}
+
+
+def test_streaming_ingestion(app, receiver):
+    """Check single-pass payload extraction from the request stream."""
+
+    class TestReceiverSign(receiver):
+        signature = "X-Hub-Signature"
+
+    app.config.update(
+        WEBHOOKS_STREAMING_INGESTION=True,
+        WEBHOOKS_STREAM_CHUNK_SIZE=4,
+    )
+    with app.app_context():
+        current_webhooks.register("test-receiver-sign", TestReceiverSign)
+
+    # JSON payload with a valid signature
+    payload = json.dumps({"somekey": "somevalue"})
+    with app.app_context():
+        headers = [
+            ("Content-Type", "application/json"),
+            ("X-Hub-Signature", "sha1=" + get_hmac(payload)),
+        ]
+    with app.test_request_context(headers=headers, data=payload):
+        event = Event.create(receiver_id="test-receiver-sign")
+        assert json.loads(payload) == event.payload
+
+    # Invalid signature
+    with app.app_context():
+        headers = [
+            ("Content-Type", "application/json"),
+            ("X-Hub-Signature", get_hmac("somevalue")),
+        ]
+    with (
+        app.test_request_context(headers=headers, data=payload),
+        pytest.raises(InvalidSignature),
+    ):
+        Event.create(receiver_id="test-receiver-sign")
+
+    # Form encoded values payload parsing
+    with app.test_request_context(method="POST", data={"somekey": "somevalue"}):
+        event = Event.create(receiver_id="test-receiver")
+        assert {"somekey": "somevalue"} == event.payload
+
+    # Malformed JSON
+    headers = [("Content-Type", "application/json")]
+    with (
+        app.test_request_context(headers=headers, data="{invalid"),
+        pytest.raises(BadRequest),
+    ):
+        Event.create(receiver_id="test-receiver")
+
+    # Size limit
+    app.config["WEBHOOKS_MAX_PAYLOAD_SIZE"] = 8
+    with (
+        app.test_request_context(headers=headers, data=payload),
+        pytest.raises(PayloadTooLarge),
+    ):
+        Event.create(receiver_id="test-receiver")
+
+
 def test_event_deletion(app, receiver):
     """Test event deletion."""
     with app.test_request_context(method="POST", data={"foo": "bar"}):
@@ -208,3 +310,419 @@ def test_event_status(app):
         event = Event.query.get(event_id)
         assert event.status == (201, 42)
         assert event.response["message"] == 42
+
+
+def test_payload_compression(app, receiver):
+    """Test compressed payload storage."""
+    app.config.update(WEBHOOKS_PAYLOAD_COMPRESSION_THRESHOLD=64)
+    payloads = {
+        False: {"somekey": "somevalue"},
+        True: {"somekey": "somevalue" * 20},
+    }
+    event_ids = {}
+    headers = [("Content-Type", "application/json")]
+    for compressed, payload in payloads.items():
+        with app.test_request_context(headers=headers, data=json.dumps(payload)):
+            event = Event.create(receiver_id="test-receiver")
+            assert event.payload == payload
+            db.session.add(event)
+            db.session.commit()
+            event_ids[compressed] = event.id
+
+    column = type_coerce(Event.__table__.c.payload, db.LargeBinary)
+    with app.app_context():
+        for compressed, payload in payloads.items():
+            event = Event.query.get(event_ids[compressed])
+            assert event.payload == payload
+            data = db.session.scalar(
+                select(column).where(Event.id == event_ids[compressed])
+            )
+            assert (data[:1] == b"x") is compressed
+            assert json.loads(zlib.decompress(data) if compressed else data) == payload
+
+        # The payload remains a mapped column
+        event = Event.query.options(load_only(Event.id, Event.payload)).first()
+        event.payload["other"] = "value"
+        flag_modified(event, "payload")
+        db.session.commit()
+        assert Event.query.filter(Event.payload.isnot(None)).count() == 2
+
+
+def test_deferred_payload(app, receiver):
+    """Test that payload columns are only loaded on access."""
+    with app.test_request_context(method="POST", json={"somekey": "somevalue"}):
+        event = Event.create(receiver_id="test-receiver")
+        db.session.add(event)
+        db.session.commit()
+        event_id = event.id
+
+    with app.app_context():
+        event = Event.query.get(event_id)
+        loaded = inspect(event).dict
+        assert "response" in loaded
+        assert not {"payload", "payload_headers", "response_headers"} & set(loaded)
+        assert event.payload == {"somekey": "somevalue"}
+        assert "payload_headers" in inspect(event).dict
+
+
+def test_event_status_cache(app, monkeypatch):
+    """Test caching of Celery task statuses."""
+    lookups = []
+
+    class TestAsyncResult:
+        def __init__(self, task_id):
+            lookups.append(task_id)
+            self.state = states[0]
+            self.info = None
+
+    class TestCeleryReceiver(CeleryReceiver):
+        def run(self, event):
+            pass
+
+    monkeypatch.setattr("invenio_webhooks.models.AsyncResult", TestAsyncResult)
+    app.config.update(
+        WEBHOOKS_STATUS_CACHE="memory",
+        WEBHOOKS_STATUS_CACHE_TTL=0,
+    )
+    app.extensions["invenio-webhooks"].register(
+        "test-celery-receiver", TestCeleryReceiver
+    )
+
+    states = ["PENDING"]
+    with app.test_request_context(method="POST", data={"foo": "bar"}):
+        event = Event.create(receiver_id="test-celery-receiver")
+        db.session.add(event)
+        db.session.commit()
+        assert event.status == (202, "Accepted.")
+        assert event.status == (202, "Accepted.")
+        assert len(lookups) == 2
+
+        states[0] = "SUCCESS"
+        assert event.status == (201, "Accepted.")
+        states[0] = "FAILURE"
+        assert event.status == (201, "Accepted.")
+        assert len(lookups) == 3
+
+
+def test_ttl_cache():
+    """Test that timeouts of the in-process cache match Flask-Caching."""
+    cache = TTLCache(maxsize=2)
+    cache.set("never", 1, timeout=0)
+    cache.set("expired", 2, timeout=-1)
+    assert cache.get_many("never", "expired") == [1, None]
+    cache.set("a", 3)
+    cache.set("b", 4)
+    assert cache.get("never") is None
+    assert cache.delete("b")
+    assert not cache.delete("b")
+
+
+def test_event_task_state_tracking(app, monkeypatch):
+    """Test task states written to the event row."""
+    app.config["WEBHOOKS_TASK_STATE_TRACKING"] = True
+    monkeypatch.setattr("invenio_webhooks.models.AsyncResult", None)
+    seen = []
+
+    class TestCeleryReceiver(CeleryReceiver):
+        def run(self, event):
+            seen.append((event.task_state, event.status))
+            if event.payload.get("fail"):
+                raise ValueError("failed")
+
+    app.extensions["invenio-webhooks"].register(
+        "test-celery-receiver", TestCeleryReceiver
+    )
+
+    headers = [("Content-Type", "application/json")]
+    with app.test_request_context(method="POST", headers=headers, data="{}"):
+        event = Event.create(receiver_id="test-celery-receiver")
+        db.session.add(event)
+        db.session.commit()
+        event_id = event.id
+        assert event.status == (202, "Accepted.")
+        event.process()
+        assert seen == [("STARTED", (202, "Accepted."))]
+
+    with app.app_context():
+        event = Event.query.get(event_id)
+        assert event.task_state == "SUCCESS"
+        assert event.task_started <= event.task_finished
+        assert event.status == (201, "Accepted.")
+
+    data = json.dumps({"fail": True})
+    with app.test_request_context(method="POST", headers=headers, data=data):
+        event = Event.create(receiver_id="test-celery-receiver")
+        db.session.add(event)
+        db.session.commit()
+        event_id = event.id
+        with pytest.raises(ValueError):
+            event.process()
+
+    with app.app_context():
+        event = Event.query.get(event_id)
+        assert event.task_state == "FAILURE"
+        assert event.status == (500, "Accepted.")
+
+
+def test_delete_tracked_event(app, monkeypatch):
+    """Test that deleting a tracked event marks its task as revoked."""
+    app.config["WEBHOOKS_TASK_STATE_TRACKING"] = True
+    revoked = []
+    runs = []
+
+    class TestAsyncResult:
+        def __init__(self, task_id):
+            self.task_id = task_id
+
+        def revoke(self, terminate=False):
+            revoked.append(self.task_id)
+
+    class TestCeleryReceiver(CeleryReceiver):
+        def run(self, event):
+            runs.append(event.id)
+
+    monkeypatch.setattr("invenio_webhooks.models.AsyncResult", TestAsyncResult)
+    app.extensions["invenio-webhooks"].register(
+        "test-celery-receiver", TestCeleryReceiver
+    )
+
+    headers = [("Content-Type", "application/json")]
+    with app.test_request_context(method="POST", headers=headers, data="{}"):
+        event = Event.create(receiver_id="test-celery-receiver")
+        db.session.add(event)
+        db.session.commit()
+        event.delete()
+        db.session.commit()
+        assert revoked == [event.id]
+        assert event.task_state == "REVOKED"
+        assert event.status == (410, "Gone.")
+
+        # A task which was not reached by the revocation does not run
+        process_event.apply(args=[str(event.id)])
+        assert runs == []
+        assert Event.query.get(event.id).task_state == "REVOKED"
+
+
+def test_batching_celery_receiver(app):
+    """Test micro-batched processing of events."""
+    batches = []
+
+    class TestBatchingReceiver(BatchingCeleryReceiver):
+        batch_size = 3
+        batch_window = 60
+
+        def run(self, event):
+            event.response["message"] = event.payload["n"] * 2
+
+        def run_batch(self, events):
+            batches.append([event.payload["n"] for event in events])
+            super().run_batch(events)
+
+    app.extensions["invenio-webhooks"].register(
+        "test-batching-receiver", TestBatchingReceiver
+    )
+
+    event_ids = []
+    headers = [("Content-Type", "application/json")]
+    for n in range(4):
+        data = json.dumps({"n": n})
+        with app.test_request_context(method="POST", headers=headers, data=data):
+            event = Event.create(receiver_id="test-batching-receiver")
+            db.session.add(event)
+            db.session.commit()
+            event_ids.append(event.id)
+            event.process()
+
+    assert [sorted(batch) for batch in batches] == [[0, 1, 2]]
+
+    with app.app_context():
+        receiver = current_webhooks.receivers["test-batching-receiver"]
+        receiver.batcher.flush()
+        assert [sorted(batch) for batch in batches] == [[0, 1, 2], [3]]
+
+        events = Event.query.filter(Event.id.in_(event_ids)).all()
+        assert len(events) == 4
+        for event in events:
+            assert event.status == (201, event.payload["n"] * 2)
+            assert event.task_state == "SUCCESS"
+
+
+def test_batching_celery_receiver_queries(app):
+    """Test that batches are loaded with a query per commit, not per event."""
+
+    class TestBatchingReceiver(BatchingCeleryReceiver):
+        batch_window = 60
+
+        def run(self, event):
+            event.response["message"] = event.payload["n"]
+
+    state = app.extensions["invenio-webhooks"]
+    state.register("test-batching-receiver", TestBatchingReceiver)
+    state.register("test-other-receiver", TestBatchingReceiver)
+
+    event_ids = []
+    for n in range(20):
+        receiver_id = "test-batching-receiver" if n % 2 else "test-other-receiver"
+        with app.test_request_context(method="POST", json={"n": n}):
+            event = Event.create(receiver_id=receiver_id)
+            db.session.add(event)
+            db.session.commit()
+            event_ids.append(str(event.id))
+
+    statements = []
+
+    def count_selects(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    with app.app_context():
+        sqlalchemy.event.listen(db.engine, "before_cursor_execute", count_selects)
+        try:
+            process_events.apply(args=[event_ids])
+        finally:
+            sqlalchemy.event.remove(db.engine, "before_cursor_execute", count_selects)
+        # Load, then reload after the STARTED commit and after each receiver.
+        assert len(statements) == 4
+        for event in Event.query.filter(Event.id.in_(event_ids)):
+            assert event.status == (201, event.payload["n"])
+
+
+def test_batching_celery_receiver_failures(app):
+    """Test that batches of one receiver fail independently of others."""
+
+    class TestBatchingReceiver(BatchingCeleryReceiver):
+        batch_window = 60
+
+        def run(self, event):
+            event.response["message"] = "processed"
+
+    class FailingBatchingReceiver(TestBatchingReceiver):
+        def run(self, event):
+            raise ValueError("failed")
+
+    state = app.extensions["invenio-webhooks"]
+    state.register("test-batching-receiver", TestBatchingReceiver)
+    state.register("test-failing-receiver", FailingBatchingReceiver)
+
+    event_ids = {}
+    with app.test_request_context(method="POST", data={"foo": "bar"}):
+        for receiver_id in ("test-batching-receiver", "test-failing-receiver"):
+            events = [Event.create(receiver_id=receiver_id) for _ in range(2)]
+            db.session.add_all(events)
+            db.session.commit()
+            event_ids[receiver_id] = [str(event.id) for event in events]
+        deleted = Event.query.get(event_ids["test-batching-receiver"][1])
+        deleted.delete()
+        db.session.commit()
+
+        with pytest.raises(ValueError):
+            process_events.apply(args=[sum(event_ids.values(), [])])
+
+    with app.app_context():
+        succeeded, revoked = [
+            Event.query.get(id_) for id_ in event_ids["test-batching-receiver"]
+        ]
+        assert succeeded.task_state == "SUCCESS"
+        assert succeeded.status == (201, "processed")
+        assert revoked.task_state == "REVOKED"
+        assert revoked.status == (410, "Gone.")
+        for id_ in event_ids["test-failing-receiver"]:
+            assert Event.query.get(id_).task_state == "FAILURE"
+
+
+def test_batcher_close(app):
+    """Test that the pending batch is sent when the batcher is closed."""
+    batches = []
+    batcher = Batcher(batches.append, max_size=10, window=60)
+    with app.app_context():
+        batcher.add(1)
+        batcher.add(2)
+    batcher.close()
+    assert batches == [[1, 2]]
+    batcher.close()
+    assert batches == [[1, 2]]
+
+
+def test_celery_task_routing(app, monkeypatch):
+    """Test queue, priority and rate limit of Celery receivers."""
+    sent = []
+
+    class TestCeleryReceiver(CeleryReceiver):
+        celery_queue = "webhooks-fast"
+        celery_priority = 9
+
+        def run(self, event):
+            pass
+
+    class TestLimitedReceiver(CeleryReceiver):
+        celery_rate_limit = "1/m"
+
+        def run(self, event):
+            pass
+
+    class RetryLater(Exception):
+        pass
+
+    def retry(countdown=None, max_retries=None):
+        return RetryLater(countdown)
+
+    app.config["WEBHOOKS_CELERY_TASK_OPTIONS"] = {
+        "test-slow-receiver": {"queue": "webhooks-slow"},
+        "test-unloaded-receiver": {"queue": "webhooks-unloaded", "priority": 1},
+    }
+    state = app.extensions["invenio-webhooks"]
+    state.register("test-celery-receiver", TestCeleryReceiver)
+    state.register("test-slow-receiver", TestCeleryReceiver)
+    state.register("test-limited-receiver", TestLimitedReceiver)
+
+    with app.test_request_context(method="POST", json={"foo": "bar"}):
+        monkeypatch.setattr(
+            process_event, "apply_async", lambda **kwargs: sent.append(kwargs)
+        )
+        for receiver_id in ["test-celery-receiver", "test-slow-receiver"]:
+            event = Event.create(receiver_id=receiver_id)
+            db.session.add(event)
+            db.session.commit()
+            event.process()
+        assert [(s["queue"], s["priority"]) for s in sent] == [
+            ("webhooks-fast", 9),
+            ("webhooks-slow", 9),
+        ]
+        assert sent[0]["kwargs"]["receiver_id"] == "test-celery-receiver"
+
+        assert route_task(
+            process_event.name, [], {"receiver_id": "test-slow-receiver"}, {}
+        ) == {"queue": "webhooks-slow", "priority": 9}
+        assert route_task(process_event.name, [], {}, {}) is None
+        assert route_task("other.task", [], sent[0]["kwargs"], {}) is None
+        queues = {queue.name: queue for queue in get_task_queues()}
+        assert set(queues) == {
+            "celery",
+            "webhooks-fast",
+            "webhooks-slow",
+            "webhooks-unloaded",
+        }
+        assert queues["webhooks-fast"].queue_arguments == {"x-max-priority": 10}
+        assert queues["celery"].queue_arguments is None
+        app.config["WEBHOOKS_CELERY_MAX_PRIORITY"] = 5
+        queues = {queue.name: queue for queue in get_task_queues()}
+        assert queues["webhooks-unloaded"].queue_arguments == {"x-max-priority": 5}
+
+        monkeypatch.undo()
+        monkeypatch.setattr(process_event, "retry", retry)
+        event = Event.create(receiver_id="test-limited-receiver")
+        db.session.add(event)
+        db.session.commit()
+        event.process()
+        with pytest.raises(RetryLater) as excinfo:
+            event.process()
+        assert 0 < excinfo.value.args[0] <= 60
+
+        # Batches take a token per event.
+        monkeypatch.setattr(process_events, "retry", retry)
+        events = [Event.create(receiver_id="test-limited-receiver") for _ in range(2)]
+        db.session.add_all(events)
+        db.session.commit()
+        with pytest.raises(RetryLater) as excinfo:
+            process_events.apply(args=[[str(event.id) for event in events]])
+        assert 60 < excinfo.value.args[0] <= 120
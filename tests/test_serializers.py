@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""JSON codec tests."""
+
+import json
+
+import pytest
+from invenio_db import db
+
+from invenio_webhooks.models import Event
+from invenio_webhooks.proxies import current_webhooks
+from invenio_webhooks.serializers import JSONCodec, default_codec, load_codec
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+def test_builtin_codecs(app, name):
+    """Built-in codecs round-trip or fall back to the stdlib codec."""
+    with app.app_context():
+        codec = load_codec(name)
+    assert codec.name in (name, "json")
+    obj = {"key": ["value", 1, 2.5, None, True]}
+    assert codec.loads(codec.dumps(obj)) == obj
+    assert codec.loads(codec.dumps(obj).encode("utf-8")) == obj
+    with pytest.raises(ValueError):
+        codec.loads(b"{invalid")
+
+
+def test_load_codec():
+    """Codecs can be given as instances, classes or import paths."""
+    assert load_codec(None) is default_codec
+    assert isinstance(load_codec(JSONCodec), JSONCodec)
+    assert isinstance(load_codec("invenio_webhooks.serializers:JSONCodec"), JSONCodec)
+
+
+def test_custom_codec(app, receiver):
+    """The configured codec is used for payloads, columns and responses."""
+    calls = []
+
+    class RecordingCodec(JSONCodec):
+        def dumps(self, obj):
+            calls.append("dumps")
+            return super().dumps(obj)
+
+        def loads(self, data):
+            calls.append("loads")
+            return super().loads(data)
+
+    app.config["WEBHOOKS_JSON_CODEC"] = RecordingCodec
+    headers = [("Content-Type", "application/json")]
+    with app.test_request_context(headers=headers, data=json.dumps({"a": 1})):
+        assert isinstance(current_webhooks.json_codec, RecordingCodec)
+        event = Event.create(receiver_id="test-receiver")
+        assert calls == ["loads"]
+        db.session.add(event)
+        db.session.commit()
+        assert "dumps" in calls
+        event_id = event.id
+
+    with app.app_context():
+        calls.clear()
+        assert Event.query.get(event_id).payload == {"a": 1}
+        assert "loads" in calls
+
+
+def test_response_key_order(app, receiver):
+    """Responses keep the key order of ``jsonify``."""
+    from flask import jsonify
+
+    from invenio_webhooks.views import make_response
+
+    headers = [("Content-Type", "application/json")]
+    with app.test_request_context(
+        "/hooks/receivers/test-receiver/events/",
+        headers=headers,
+        data=json.dumps({"a": 1}),
+    ):
+        event = Event.create(receiver_id="test-receiver")
+        event.response = {"status": 202, "message": "Accepted", "b": {"z": 1, "a": 2}}
+        db.session.add(event)
+        db.session.commit()
+        response, code = make_response(event)
+        assert response.get_data() == jsonify(**event.response).get_data()
@@ -0,0 +1,64 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Signature tests."""
+
+import json
+
+from invenio_webhooks.models import Event
+from invenio_webhooks.proxies import current_webhooks
+from invenio_webhooks.signatures import (
+    SignedMessage,
+    check_x_hub_signature,
+    check_x_hub_signature_256,
+    get_hmac,
+)
+
+
+def test_x_hub_signature(app):
+    """Check SHA-1 and SHA-256 signatures."""
+    with app.app_context():
+        message = b"message"
+        assert check_x_hub_signature(get_hmac(message), message)
+        assert check_x_hub_signature("sha1=" + get_hmac(message), message)
+        assert not check_x_hub_signature(get_hmac("other"), message)
+        assert not check_x_hub_signature("sha1=é", message)
+
+        signature = "sha256=" + get_hmac(message, digest="sha256")
+        assert check_x_hub_signature_256(signature, message)
+        assert not check_x_hub_signature_256(signature, b"other")
+        assert not check_x_hub_signature_256(get_hmac(message), message)
+        sha256_value = get_hmac(message, digest="sha256")
+        assert not check_x_hub_signature_256("sha1=" + sha256_value, message)
+        assert not check_x_hub_signature("sha256=" + get_hmac(message), message)
+
+        signed = SignedMessage("sha256")
+        signed.update(b"mess")
+        signed.update(b"age")
+        assert check_x_hub_signature_256(signature, signed)
+
+
+def test_key_rotation(app, receiver):
+    """Payloads signed with any active key are accepted."""
+
+    class TestReceiverSign(receiver):
+        signature = "X-Hub-Signature-256"
+
+    payload = json.dumps({"somekey": "somevalue"})
+    with app.app_context():
+        current_webhooks.register("test-receiver-sign", TestReceiverSign)
+        old_signature = get_hmac(payload, digest="sha256")
+        app.config["WEBHOOKS_SECRET_KEY"] = ["new_key", "secret_key"]
+        new_signature = get_hmac(payload, digest="sha256")
+        assert old_signature != new_signature
+
+    for streaming in (False, True):
+        app.config["WEBHOOKS_STREAMING_INGESTION"] = streaming
+        for signature in (old_signature, new_signature):
+            headers = [
+                ("Content-Type", "application/json"),
+                ("X-Hub-Signature-256", "sha256=" + signature),
+            ]
+            with app.test_request_context(headers=headers, data=payload):
+                event = Event.create(receiver_id="test-receiver-sign")
+                assert event.payload == json.loads(payload)